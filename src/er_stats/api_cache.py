@@ -0,0 +1,77 @@
+"""On-disk cache of game-result API payloads.
+
+Finished matches do not change, so a ``/v1/games/{gameId}`` response can be
+replayed on later runs instead of spending another rate-limited request.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+import sqlite3
+from typing import Any, Dict, Optional
+
+
+class GameResultCache:
+    """SQLite-backed ``game_id -> payload`` store for game-result responses."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS game_results (
+                game_id INTEGER PRIMARY KEY,
+                body TEXT NOT NULL,
+                fetched_at TEXT NOT NULL
+            )
+            """
+        )
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __contains__(self, game_id: object) -> bool:
+        if not isinstance(game_id, int):
+            return False
+        row = self.connection.execute(
+            "SELECT 1 FROM game_results WHERE game_id=?", (game_id,)
+        ).fetchone()
+        return row is not None
+
+    def get(self, game_id: int) -> Optional[Dict[str, Any]]:
+        """Return a fresh copy of the cached payload, or None on a miss."""
+
+        row = self.connection.execute(
+            "SELECT body FROM game_results WHERE game_id=?", (int(game_id),)
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def put(self, game_id: int, payload: Dict[str, Any]) -> None:
+        """Store a payload; only responses with participants are kept."""
+
+        if not payload.get("userGames"):
+            return
+        self.connection.execute(
+            """
+            INSERT INTO game_results (game_id, body, fetched_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT(game_id) DO UPDATE SET
+                body=excluded.body,
+                fetched_at=excluded.fetched_at
+            """,
+            (
+                int(game_id),
+                json.dumps(payload, ensure_ascii=False, separators=(",", ":")),
+                dt.datetime.now(dt.timezone.utc).isoformat(),
+            ),
+        )
+        self.connection.commit()
+
+
+__all__ = ["GameResultCache"]
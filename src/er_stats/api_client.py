@@ -8,9 +8,11 @@ from __future__ import annotations
 
 from typing import Any, Dict, Iterable, Optional
 
+import threading
 import time
 
 import requests
+from requests.adapters import HTTPAdapter
 
 
 class ApiResponseError(Exception):
@@ -91,11 +93,37 @@ class EternalReturnAPIClient:
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
-        self._session = session or requests.Session()
+        self._base_headers: Dict[str, str] = {}
+        if self.api_key:
+            self._base_headers["x-api-key"] = self.api_key
+        if session is None:
+            session = self._build_session(self._base_headers)
+            # Owned sessions carry the API key, so per-call headers stay small.
+            self._base_headers = {}
+        self._session = session
         self.timeout = timeout
         self.min_interval = float(min_interval)
         self.max_retries = int(max_retries)
         self._last_request_at: Optional[float] = None
+        self._slot_lock = threading.Lock()
+
+    @staticmethod
+    def _build_session(headers: Dict[str, str]) -> requests.Session:
+        """Create a keep-alive session with a pooled adapter for the API host."""
+
+        session = requests.Session()
+        # Retries are handled by _get_json_with_rate_limit, not urllib3.
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(headers)
+        return session
+
+    def __enter__(self) -> "EternalReturnAPIClient":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
 
     @property
     def session(self) -> requests.Session:
@@ -104,9 +132,7 @@ class EternalReturnAPIClient:
         return self._session
 
     def _headers(self, extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
-        headers: Dict[str, str] = {}
-        if self.api_key:
-            headers["x-api-key"] = self.api_key
+        headers = dict(self._base_headers)
         if extra:
             headers.update(extra)
         return headers
@@ -190,15 +216,17 @@ class EternalReturnAPIClient:
 
         if self.min_interval <= 0:
             return
-        now = time.monotonic()
-        if self._last_request_at is not None:
-            elapsed = now - self._last_request_at
-            remaining = self.min_interval - elapsed
-            if remaining > 0:
-                time.sleep(remaining)
-                now = time.monotonic()
-        # Reserve the slot at request start to avoid bursts across threads
-        self._last_request_at = now
+        # Serialize slot reservation so concurrent callers share one rate limit
+        with self._slot_lock:
+            now = time.monotonic()
+            if self._last_request_at is not None:
+                elapsed = now - self._last_request_at
+                remaining = self.min_interval - elapsed
+                if remaining > 0:
+                    time.sleep(remaining)
+                    now = time.monotonic()
+            # Reserve the slot at request start to avoid bursts across threads
+            self._last_request_at = now
 
     def _get_json_with_rate_limit(
         self, url: str, headers: Dict[str, str]
@@ -0,0 +1,163 @@
+"""Compact probabilistic membership filters for long-running crawls.
+
+A Bloom filter never reports a false negative; a positive answer means the
+key was *probably* added and callers must confirm it when a false positive
+would change behavior.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+from collections import deque
+from typing import Deque, Set, Union
+
+BloomKey = Union[int, str]
+
+
+def _key_bytes(key: BloomKey) -> bytes:
+    if isinstance(key, str):
+        return key.encode("utf-8")
+    return int(key).to_bytes(8, "little", signed=True)
+
+
+class BloomFilter:
+    """Fixed-capacity Bloom filter over int/str keys backed by a bytearray."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.capacity = int(capacity)
+        self.error_rate = float(error_rate)
+        num_bits = math.ceil(
+            -self.capacity * math.log(self.error_rate) / (math.log(2) ** 2)
+        )
+        self.num_bits = max(8, num_bits)
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+
+    def _positions(self, key: BloomKey) -> list[int]:
+        digest = hashlib.blake2b(_key_bytes(key), digest_size=16).digest()
+        # Kirsch-Mitzenmacher double hashing: k probes from two 64-bit hashes.
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        num_bits = self.num_bits
+        return [(h1 + i * h2) % num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: BloomKey) -> None:
+        bits = self._bits
+        for pos in self._positions(key):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self._count += 1
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, (int, str)):
+            return False
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def __len__(self) -> int:
+        """Return the number of ``add`` calls (duplicates included)."""
+
+        return self._count
+
+
+class ScalableBloomFilter:
+    """Bloom filter that grows by chaining progressively larger filters.
+
+    Each new stage doubles the capacity and halves the error rate, so the
+    compound false-positive rate stays below ``error_rate`` while memory
+    tracks the number of keys actually added.
+    """
+
+    def __init__(
+        self,
+        initial_capacity: int = 100_000,
+        error_rate: float = 1e-4,
+        *,
+        growth: int = 2,
+        tightening: float = 0.5,
+    ) -> None:
+        if growth < 2:
+            raise ValueError("growth must be at least 2")
+        if not 0 < tightening < 1:
+            raise ValueError("tightening must be between 0 and 1")
+        self.initial_capacity = int(initial_capacity)
+        self.error_rate = float(error_rate)
+        self.growth = int(growth)
+        self.tightening = float(tightening)
+        # The first stage gets (1 - r) of the budget; the geometric series of
+        # later stages sums to the rest.
+        self._filters = [
+            BloomFilter(self.initial_capacity, self.error_rate * (1 - self.tightening))
+        ]
+        self._stage_count = 0
+
+    def add(self, key: BloomKey) -> None:
+        current = self._filters[-1]
+        if self._stage_count >= current.capacity:
+            current = BloomFilter(
+                current.capacity * self.growth,
+                current.error_rate * self.tightening,
+            )
+            self._filters.append(current)
+            self._stage_count = 0
+        current.add(key)
+        self._stage_count += 1
+
+    def __contains__(self, key: object) -> bool:
+        # Newest stage first: recent keys are the most likely repeats.
+        return any(key in stage for stage in reversed(self._filters))
+
+    def __len__(self) -> int:
+        return sum(len(stage) for stage in self._filters)
+
+    @property
+    def num_bits(self) -> int:
+        return sum(stage.num_bits for stage in self._filters)
+
+
+class RecentKeyBloomFilter:
+    """Scalable Bloom filter fronted by an exact window of recent keys.
+
+    Membership is the Bloom filter's answer: a miss means the key is new, a
+    hit means it was *probably* added (false positives stay below
+    ``error_rate``). The ``recent_keys`` most recently added keys are also
+    kept in a set so the common case, a repeat arriving shortly after the
+    original, is answered exactly without hashing.
+    """
+
+    def __init__(
+        self,
+        initial_capacity: int = 100_000,
+        error_rate: float = 1e-4,
+        *,
+        recent_keys: int = 100_000,
+    ) -> None:
+        if recent_keys <= 0:
+            raise ValueError("recent_keys must be positive")
+        self.recent_keys = int(recent_keys)
+        self._bloom = ScalableBloomFilter(initial_capacity, error_rate=error_rate)
+        self._recent: Deque[BloomKey] = deque()
+        self._recent_set: Set[BloomKey] = set()
+
+    def add(self, key: BloomKey) -> None:
+        if key in self._recent_set:
+            return
+        self._bloom.add(key)
+        if len(self._recent) >= self.recent_keys:
+            self._recent_set.discard(self._recent.popleft())
+        self._recent.append(key)
+        self._recent_set.add(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._recent_set or key in self._bloom
+
+    def __len__(self) -> int:
+        return len(self._bloom)
+
+
+__all__ = ["BloomFilter", "RecentKeyBloomFilter", "ScalableBloomFilter"]
@@ -3,14 +3,17 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
 import datetime as dt
 import json
 import logging
+import logging.handlers
 import os
 import sys
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Optional, Tuple
+from typing import Iterable, Iterator, Optional, Tuple
 
 from .aggregations import (
     bot_usage_statistics,
@@ -20,6 +23,7 @@ from .aggregations import (
     mmr_tier_distribution,
     team_composition_statistics,
 )
+from .api_cache import GameResultCache
 from .api_client import EternalReturnAPIClient
 from .config import ConfigError, load_ingest_config
 from .db import SQLiteStore
@@ -29,6 +33,39 @@ from .ingest import IngestionManager
 LOGGER_NAME = "er_stats"
 LOG_FORMAT_DEFAULT = "%(message)s"
 LOG_FORMAT_INGEST = "%(asctime)s: %(message)s"
+INGEST_LOG_BUFFER_CAPACITY = 1000
+INGEST_LOG_FLUSH_INTERVAL = 1.0
+
+
+class BufferedLogHandler(logging.handlers.MemoryHandler):
+    """Memory handler that also flushes once ``flush_interval`` has elapsed.
+
+    Progress records are written to the target in batches instead of one
+    stream write per record, while still reaching the terminal promptly.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        *,
+        flush_interval: float,
+        flushLevel: int = logging.WARNING,
+        target: Optional[logging.Handler] = None,
+    ) -> None:
+        super().__init__(capacity, flushLevel=flushLevel, target=target)
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+
+    def shouldFlush(self, record: logging.LogRecord) -> bool:
+        return (
+            super().shouldFlush(record)
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        )
+
+    def flush(self) -> None:
+        super().flush()
+        self._last_flush = time.monotonic()
+
 
 logger = logging.getLogger(LOGGER_NAME)
 logger.setLevel(logging.INFO)
@@ -46,6 +83,12 @@ ingest_log_handler.setLevel(logging.INFO)
 default_log_handler.setFormatter(default_log_formatter)
 ingest_log_handler.setFormatter(ingest_log_formatter)
 
+ingest_log_buffer = BufferedLogHandler(
+    INGEST_LOG_BUFFER_CAPACITY,
+    flush_interval=INGEST_LOG_FLUSH_INTERVAL,
+    target=ingest_log_handler,
+)
+
 logger.addHandler(default_log_handler)
 ingest_logger.addHandler(ingest_log_handler)
 
@@ -165,6 +208,21 @@ def _build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Optional directory to write Parquet datasets (matches, participants)",
     )
+    ingest_parser.add_argument(
+        "--fetch-workers",
+        type=int,
+        default=None,
+        help=(
+            "Number of threads that prefetch game results and participant "
+            "nickname lookups (requests still honor --min-interval; default: 1)"
+        ),
+    )
+    ingest_parser.add_argument(
+        "--game-cache",
+        type=Path,
+        default=None,
+        help="Optional SQLite file caching game-result responses across runs",
+    )
     ingest_parser.add_argument(
         "--require-metadata-refresh",
         action="store_true",
@@ -201,6 +259,15 @@ def _build_parser() -> argparse.ArgumentParser:
         default=3,
         help="Max retries on HTTP 429 Too Many Requests",
     )
+    refetch_parser.add_argument(
+        "--fetch-workers",
+        type=int,
+        default=1,
+        help=(
+            "Number of threads that prefetch game results while earlier matches "
+            "are written (requests still honor --min-interval; default: 1)"
+        ),
+    )
     refetch_parser.add_argument(
         "--limit",
         type=int,
@@ -272,6 +339,12 @@ def _build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Optional directory to write Parquet datasets during refetch",
     )
+    refetch_parser.add_argument(
+        "--game-cache",
+        type=Path,
+        default=None,
+        help="Optional SQLite game-result cache to refresh with refetched responses",
+    )
 
     def add_context_args(subparser: argparse.ArgumentParser) -> None:
         subparser.add_argument(
@@ -694,6 +767,12 @@ def _run_ingest(
             parquet_exporter = ParquetExporter(parquet_dir_value)
         except Exception as e:
             ingest_logger.warning("Parquet export disabled: %s", e)
+    game_cache_value = args.game_cache
+    if game_cache_value is None and isinstance(ingest_table.get("game_cache"), str):
+        game_cache_value = Path(ingest_table["game_cache"])
+    game_cache = (
+        GameResultCache(str(game_cache_value)) if game_cache_value is not None else None
+    )
     nickname_sources = list(seeds_cfg.get("nicknames", []))
     if args.nicknames:
         nickname_sources.extend(args.nicknames)
@@ -714,6 +793,9 @@ def _run_ingest(
         only_newer_games = config_only_newer
     else:
         only_newer_games = args.only_newer_games
+    fetch_workers = args.fetch_workers
+    if fetch_workers is None:
+        fetch_workers = ingest_table.get("fetch_workers", 1)
     manager = IngestionManager(
         client,
         store,
@@ -721,6 +803,9 @@ def _run_ingest(
         only_newer_games=only_newer_games,
         parquet_exporter=parquet_exporter,
         progress_callback=report,
+        parquet_background=parquet_exporter is not None,
+        game_result_cache=game_cache,
+        fetch_workers=fetch_workers,
     )
     try:
         manager.ingest_from_seeds(nickname_sources, depth=depth)
@@ -728,11 +813,18 @@ def _run_ingest(
         ingest_logger.warning("Ingest interrupted by user.")
         return 130
     finally:
+        # Drain background Parquet writes before the exporter flushes.
+        try:
+            manager.close()
+        except Exception as exc:
+            ingest_logger.warning("Parquet export failed: %s", exc)
         if parquet_exporter is not None:
             try:
                 parquet_exporter.close()
             except Exception:
                 pass
+        if game_cache is not None:
+            game_cache.close()
         client.close()
     return 0
 
@@ -766,7 +858,11 @@ def _run_refetch_incomplete(
             parquet_exporter = ParquetExporter(args.parquet_dir)
         except Exception as exc:
             ingest_logger.warning("Parquet export disabled: %s", exc)
+    game_cache = (
+        GameResultCache(str(args.game_cache)) if args.game_cache is not None else None
+    )
 
+    manager: Optional[IngestionManager] = None
     try:
         try:
             start_dtm_from, start_dtm_to = parse_time_window(
@@ -850,6 +946,9 @@ def _run_refetch_incomplete(
             fetch_game_details=True,
             parquet_exporter=parquet_exporter,
             progress_callback=report,
+            fetch_workers=getattr(args, "fetch_workers", 1),
+            parquet_background=parquet_exporter is not None,
+            game_result_cache=game_cache,
         )
         stats = manager.refetch_incomplete_games(game_ids)
         ingest_logger.info(
@@ -865,11 +964,18 @@ def _run_refetch_incomplete(
         ingest_logger.warning("Refetch interrupted by user.")
         return 130
     finally:
+        if manager is not None:
+            try:
+                manager.close()
+            except Exception as exc:
+                ingest_logger.warning("Parquet export failed: %s", exc)
         if parquet_exporter is not None:
             try:
                 parquet_exporter.close()
             except Exception:
                 pass
+        if game_cache is not None:
+            game_cache.close()
         client.close()
 
 
@@ -1076,9 +1182,11 @@ def run(argv: Optional[Iterable[str]] = None) -> int:
     try:
         store.setup_schema()
         if args.command == "ingest":
-            return _run_ingest(args, store, ingest_config)
+            with _buffered_ingest_logging():
+                return _run_ingest(args, store, ingest_config)
         if args.command == "refetch-incomplete":
-            return _run_refetch_incomplete(args, store, ingest_config)
+            with _buffered_ingest_logging():
+                return _run_refetch_incomplete(args, store, ingest_config)
         if args.command == "stats":
             return _run_stats(args, store)
         raise ValueError(f"Unsupported command: {args.command}")
@@ -1086,6 +1194,20 @@ def run(argv: Optional[Iterable[str]] = None) -> int:
         store.close()
 
 
+@contextlib.contextmanager
+def _buffered_ingest_logging() -> Iterator[None]:
+    """Route ingest progress through ``ingest_log_buffer`` for the block."""
+
+    ingest_logger.removeHandler(ingest_log_handler)
+    ingest_logger.addHandler(ingest_log_buffer)
+    try:
+        yield
+    finally:
+        ingest_log_buffer.flush()
+        ingest_logger.removeHandler(ingest_log_buffer)
+        ingest_logger.addHandler(ingest_log_handler)
+
+
 def main() -> None:
     sys.exit(run())
 
@@ -4,12 +4,22 @@ from __future__ import annotations
 
 import datetime as dt
 import functools
+import itertools
 import sqlite3
 from contextlib import contextmanager
-from typing import Any, Dict, Iterable, Iterator, Optional, Set
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional, Set
 
 ISO_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
 
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = FULL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA wal_autocheckpoint = 1000",
+)
+
 
 def extract_uid(payload: Dict[str, Any]) -> Optional[str]:
     """Return the UID for a user payload. Return None when absent."""
@@ -20,6 +30,7 @@ def extract_uid(payload: Dict[str, Any]) -> Optional[str]:
     return None
 
 
+@functools.lru_cache(maxsize=8192)
 def parse_start_time(value: Optional[str]) -> Optional[str]:
     """Convert the API timestamp into ISO-8601 with colon separator."""
 
@@ -39,6 +50,56 @@ def parse_start_time(value: Optional[str]) -> Optional[str]:
         return value
 
 
+def _fast_start_time_epoch(value: str) -> Optional[float]:
+    """Slice-parse the API's fixed ``YYYY-MM-DDTHH:MM:SS.fff+HHMM`` shape.
+
+    Returns None for any other shape so the caller can use the general parser.
+    """
+
+    if (
+        len(value) != 28
+        or value[4] != "-"
+        or value[10] != "T"
+        or value[19] != "."
+        or value[23] not in "+-"
+    ):
+        return None
+    try:
+        moment = dt.datetime(
+            int(value[0:4]),
+            int(value[5:7]),
+            int(value[8:10]),
+            int(value[11:13]),
+            int(value[14:16]),
+            int(value[17:19]),
+            int(value[20:23]) * 1000,
+            tzinfo=dt.timezone.utc,
+        )
+        offset = int(value[24:26]) * 3600 + int(value[26:28]) * 60
+    except ValueError:
+        return None
+    if value[23] == "-":
+        offset = -offset
+    return moment.timestamp() - offset
+
+
+@functools.lru_cache(maxsize=4096)
+def start_time_epoch(value: Optional[str]) -> Optional[float]:
+    """Return the API timestamp as POSIX seconds, or None when unparseable."""
+
+    if value:
+        fast = _fast_start_time_epoch(value)
+        if fast is not None:
+            return fast
+    iso = parse_start_time(value)
+    if not iso:
+        return None
+    try:
+        return dt.datetime.fromisoformat(iso).timestamp()
+    except ValueError:
+        return None
+
+
 def _resolve_ml_bot(game: Dict[str, Any]) -> int:
     """Return 1 when either mlbot flag is truthy, 0 when explicitly false, else return 0."""
 
@@ -57,6 +118,264 @@ def _resolve_ml_bot(game: Dict[str, Any]) -> int:
     return int(bool(flag))
 
 
+def _character_catalog_row(entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return a characters table row for a catalog entry, or None when invalid."""
+
+    code = entry.get("characterCode")
+    name = entry.get("character")
+    if not isinstance(code, int) or not isinstance(name, str):
+        return None
+    return {"character_code": code, "name": name}
+
+
+def _item_catalog_row(entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return an items table row for a catalog entry, or None when invalid."""
+
+    code = entry.get("code")
+    name = entry.get("name")
+    if not isinstance(code, int) or not isinstance(name, str):
+        return None
+    mode_type = entry.get("modeType")
+    if not isinstance(mode_type, int):
+        mode_type = None
+    item_type = entry.get("itemType")
+    if not isinstance(item_type, str):
+        item_type = None
+    item_grade = entry.get("itemGrade")
+    if not isinstance(item_grade, str):
+        item_grade = None
+    is_completed_raw = entry.get("isCompletedItem")
+    is_completed_item = (
+        int(bool(is_completed_raw)) if is_completed_raw is not None else 0
+    )
+    return {
+        "item_code": code,
+        "name": name,
+        "mode_type": mode_type,
+        "item_type": item_type,
+        "item_grade": item_grade,
+        "is_completed_item": is_completed_item,
+    }
+
+
+_UPSERT_USER_SQL = """
+    INSERT INTO users (
+        uid, nickname, first_seen, last_seen, ingested_until, last_checked, last_mmr, ml_bot, last_language
+    ) VALUES (
+        :uid, :nickname, :first_seen, :last_seen, :ingested_until, :last_checked, :last_mmr, :ml_bot, :last_language
+    )
+    ON CONFLICT(uid) DO UPDATE SET
+        nickname=excluded.nickname,
+        last_seen=CASE
+            WHEN unixepoch(users.last_seen, 'auto') > unixepoch(excluded.last_seen, 'auto') THEN users.last_seen
+            ELSE excluded.last_seen
+        END,
+        ingested_until=CASE
+            WHEN excluded.ingested_until IS NULL THEN users.ingested_until
+            WHEN users.ingested_until IS NULL THEN excluded.ingested_until
+            WHEN unixepoch(excluded.ingested_until, 'auto') > unixepoch(users.ingested_until, 'auto') THEN excluded.ingested_until
+            ELSE users.ingested_until
+        END,
+        last_mmr=excluded.last_mmr,
+        ml_bot=excluded.ml_bot,
+        last_checked=COALESCE(users.last_checked, excluded.last_checked),
+        last_language=excluded.last_language
+    WHERE
+        unixepoch(excluded.last_seen, 'auto') > unixepoch(users.last_seen, 'auto')
+        OR (
+            excluded.ingested_until IS NOT NULL
+            AND (
+                users.ingested_until IS NULL
+                OR unixepoch(excluded.ingested_until, 'auto') > unixepoch(users.ingested_until, 'auto')
+            )
+        )
+"""
+
+_UPSERT_MATCH_SQL = """
+    INSERT INTO matches (
+        game_id,
+        season_id,
+        matching_mode,
+        matching_team_mode,
+        server_name,
+        incomplete,
+        version_season,
+        version_major,
+        version_minor,
+        start_dtm
+    ) VALUES (
+        :game_id, :season_id, :matching_mode, :matching_team_mode, :server_name,
+        :incomplete, :version_season, :version_major, :version_minor, :start_dtm
+    )
+    ON CONFLICT(game_id) DO UPDATE SET
+        season_id=excluded.season_id,
+        matching_mode=excluded.matching_mode,
+        matching_team_mode=excluded.matching_team_mode,
+        server_name=excluded.server_name,
+        incomplete=CASE
+            WHEN matches.incomplete = 1 THEN 1
+            ELSE excluded.incomplete
+        END,
+        version_season=excluded.version_season,
+        version_major=excluded.version_major,
+        version_minor=excluded.version_minor,
+        start_dtm=excluded.start_dtm
+"""
+
+_UPSERT_USER_MATCH_STATS_SQL = """
+    INSERT INTO user_match_stats (
+        game_id, uid, character_num, skin_code, game_rank,
+        player_kill, player_assistant, monster_kill, mmr_after,
+        mmr_gain, mmr_loss_entry_cost, victory, play_time, duration,
+        damage_to_player, character_level, best_weapon,
+        best_weapon_level, team_number, premade, language, ml_bot
+    ) VALUES (
+        :game_id, :uid, :character_num, :skin_code, :game_rank,
+        :player_kill, :player_assistant, :monster_kill, :mmr_after,
+        :mmr_gain, :mmr_loss_entry_cost, :victory, :play_time, :duration,
+        :damage_to_player, :character_level, :best_weapon,
+        :best_weapon_level, :team_number, :premade, :language, :ml_bot
+    )
+    ON CONFLICT(game_id, uid) DO UPDATE SET
+        character_num=excluded.character_num,
+        skin_code=excluded.skin_code,
+        game_rank=excluded.game_rank,
+        player_kill=excluded.player_kill,
+        player_assistant=excluded.player_assistant,
+        monster_kill=excluded.monster_kill,
+        mmr_after=excluded.mmr_after,
+        mmr_gain=excluded.mmr_gain,
+        mmr_loss_entry_cost=excluded.mmr_loss_entry_cost,
+        victory=excluded.victory,
+        play_time=excluded.play_time,
+        duration=excluded.duration,
+        damage_to_player=excluded.damage_to_player,
+        character_level=excluded.character_level,
+        best_weapon=excluded.best_weapon,
+        best_weapon_level=excluded.best_weapon_level,
+        team_number=excluded.team_number,
+        premade=excluded.premade,
+        language=excluded.language,
+        ml_bot=excluded.ml_bot
+"""
+
+_INSERT_EQUIPMENT_SQL = """
+    INSERT INTO equipment (game_id, uid, slot, item_id, grade)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+_INSERT_MASTERY_LEVEL_SQL = """
+    INSERT INTO mastery_levels (game_id, uid, mastery_id, level)
+    VALUES (?, ?, ?, ?)
+"""
+
+_INSERT_SKILL_LEVEL_SQL = """
+    INSERT INTO skill_levels (game_id, uid, skill_code, level)
+    VALUES (?, ?, ?, ?)
+"""
+
+_INSERT_SKILL_ORDER_SQL = """
+    INSERT INTO skill_orders (game_id, uid, sequence, skill_code)
+    VALUES (?, ?, ?, ?)
+"""
+
+
+def _user_row(game: Dict[str, Any], *, mark_ingested: bool) -> Dict[str, Any]:
+    """Return named parameters for ``_UPSERT_USER_SQL``."""
+
+    start_time = parse_start_time(game.get("startDtm"))
+    return {
+        "uid": extract_uid(game),
+        "nickname": game.get("nickname"),
+        "first_seen": start_time,
+        "last_seen": start_time,
+        "ingested_until": start_time if mark_ingested else None,
+        "last_checked": start_time,
+        "last_mmr": game.get("mmrAfter"),
+        "ml_bot": _resolve_ml_bot(game),
+        "last_language": game.get("language"),
+    }
+
+
+def _match_row(game: Dict[str, Any]) -> Dict[str, Any]:
+    """Return named parameters for ``_UPSERT_MATCH_SQL``."""
+
+    return {
+        "game_id": game.get("gameId"),
+        "season_id": game.get("seasonId"),
+        "matching_mode": game.get("matchingMode"),
+        "matching_team_mode": game.get("matchingTeamMode"),
+        "server_name": game.get("serverName"),
+        "incomplete": game.get("incomplete", 0),
+        "version_season": game.get("versionSeason"),
+        "version_major": game.get("versionMajor"),
+        "version_minor": game.get("versionMinor"),
+        "start_dtm": parse_start_time(game.get("startDtm")),
+    }
+
+
+def _user_match_stats_row(game: Dict[str, Any], uid: str) -> Dict[str, Any]:
+    """Return named parameters for ``_UPSERT_USER_MATCH_STATS_SQL``."""
+
+    return {
+        "game_id": game.get("gameId"),
+        "uid": uid,
+        "character_num": game.get("characterNum"),
+        "skin_code": game.get("skinCode"),
+        "game_rank": game.get("gameRank"),
+        "player_kill": game.get("playerKill"),
+        "player_assistant": game.get("playerAssistant"),
+        "monster_kill": game.get("monsterKill"),
+        "mmr_after": None,
+        "mmr_gain": game.get("mmrGain")
+        if game.get("mmrGain") is not None
+        else game.get("mmrGainInGame"),
+        "mmr_loss_entry_cost": game.get("mmrLossEntryCost"),
+        "victory": game.get("victory"),
+        "play_time": game.get("playTime"),
+        "duration": game.get("duration"),
+        "damage_to_player": game.get("damageToPlayer"),
+        "character_level": game.get("characterLevel"),
+        "best_weapon": game.get("bestWeapon"),
+        "best_weapon_level": game.get("bestWeaponLevel"),
+        "team_number": game.get("teamNumber"),
+        "premade": game.get("preMade"),
+        "language": game.get("language"),
+        "ml_bot": _resolve_ml_bot(game),
+    }
+
+
+def _equipment_rows(game: Dict[str, Any], uid: str) -> List[tuple]:
+    """Return ``equipment`` rows as (game_id, uid, slot, item_id, grade)."""
+
+    equipment = game.get("equipment") or {}
+    grades = game.get("equipmentGrade") or {}
+    slot_keys = list(equipment)
+    return list(
+        zip(
+            itertools.repeat(game.get("gameId")),
+            itertools.repeat(uid),
+            map(int, slot_keys),
+            equipment.values(),
+            map(grades.get, slot_keys),
+        )
+    )
+
+
+def _int_keyed_rows(game: Dict[str, Any], uid: str, field: str) -> List[tuple]:
+    """Return (game_id, uid, int(key), value) rows for an int-keyed payload map."""
+
+    values = game.get(field) or {}
+    return list(
+        zip(
+            itertools.repeat(game.get("gameId")),
+            itertools.repeat(uid),
+            map(int, values.keys()),
+            values.values(),
+        )
+    )
+
+
 class SQLiteStore:
     """SQLite-backed repository for match data."""
 
@@ -68,11 +387,25 @@ class SQLiteStore:
         )
         self.connection.row_factory = sqlite3.Row
         self.connection.execute("PRAGMA foreign_keys = ON")
+        # WAL keeps readers unblocked; commits stay fully durable until a
+        # bulk writer opts into synchronous=NORMAL via set_bulk_mode().
+        for pragma in _CONNECTION_PRAGMAS:
+            self.connection.execute(pragma)
         self._transaction_depth = 0
 
     def close(self) -> None:
         self.connection.close()
 
+    def set_bulk_mode(self, *, enabled: bool) -> None:
+        """Trade commit durability for write throughput during bulk ingest.
+
+        Enabled uses ``synchronous=NORMAL`` so WAL only fsyncs at checkpoints;
+        disabled restores the connection default, ``FULL``.
+        """
+
+        level = "NORMAL" if enabled else "FULL"
+        self.connection.execute(f"PRAGMA synchronous = {level}")
+
     @contextmanager
     def cursor(self) -> Iterator[sqlite3.Cursor]:
         cur = self.connection.cursor()
@@ -138,6 +471,11 @@ class SQLiteStore:
                     value TEXT
                 );
 
+                CREATE TABLE IF NOT EXISTS pending_users (
+                    nickname TEXT PRIMARY KEY,
+                    depth INTEGER NOT NULL
+                );
+
                 CREATE TABLE IF NOT EXISTS user_match_stats (
                     game_id INTEGER NOT NULL,
                     uid TEXT NOT NULL,
@@ -246,179 +584,21 @@ class SQLiteStore:
         self._commit_if_needed()
 
     def upsert_user(self, game: Dict[str, Any], *, mark_ingested: bool = True) -> None:
-        nickname = game.get("nickname")
-        start_time = parse_start_time(game.get("startDtm"))
-        mmr_after = game.get("mmrAfter")
-        ml_bot_flag = _resolve_ml_bot(game)
-        language = game.get("language")
-        uid = extract_uid(game)
-        ingested_until = start_time if mark_ingested else None
         with self.cursor() as cur:
-            cur.execute(
-                """
-                INSERT INTO users (
-                    uid, nickname, first_seen, last_seen, ingested_until, last_checked, last_mmr, ml_bot, last_language
-                ) VALUES (
-                    :uid, :nickname, :first_seen, :last_seen, :ingested_until, :last_checked, :last_mmr, :ml_bot, :last_language
-                )
-                ON CONFLICT(uid) DO UPDATE SET
-                    nickname=excluded.nickname,
-                    last_seen=CASE
-                        WHEN unixepoch(users.last_seen, 'auto') > unixepoch(excluded.last_seen, 'auto') THEN users.last_seen
-                        ELSE excluded.last_seen
-                    END,
-                    ingested_until=CASE
-                        WHEN excluded.ingested_until IS NULL THEN users.ingested_until
-                        WHEN users.ingested_until IS NULL THEN excluded.ingested_until
-                        WHEN unixepoch(excluded.ingested_until, 'auto') > unixepoch(users.ingested_until, 'auto') THEN excluded.ingested_until
-                        ELSE users.ingested_until
-                    END,
-                    last_mmr=excluded.last_mmr,
-                    ml_bot=excluded.ml_bot,
-                    last_checked=COALESCE(users.last_checked, excluded.last_checked),
-                    last_language=excluded.last_language
-                WHERE
-                    unixepoch(excluded.last_seen, 'auto') > unixepoch(users.last_seen, 'auto')
-                    OR (
-                        excluded.ingested_until IS NOT NULL
-                        AND (
-                            users.ingested_until IS NULL
-                            OR unixepoch(excluded.ingested_until, 'auto') > unixepoch(users.ingested_until, 'auto')
-                        )
-                    )
-                """,
-                {
-                    "uid": uid,
-                    "nickname": nickname,
-                    "first_seen": start_time,
-                    "last_seen": start_time,
-                    "ingested_until": ingested_until,
-                    "last_checked": start_time,
-                    "last_mmr": mmr_after,
-                    "ml_bot": ml_bot_flag,
-                    "last_language": language,
-                },
-            )
+            cur.execute(_UPSERT_USER_SQL, _user_row(game, mark_ingested=mark_ingested))
         self._commit_if_needed()
 
     def upsert_match(self, game: Dict[str, Any]) -> None:
         with self.cursor() as cur:
-            cur.execute(
-                """
-                INSERT INTO matches (
-                    game_id,
-                    season_id,
-                    matching_mode,
-                    matching_team_mode,
-                    server_name,
-                    incomplete,
-                    version_season,
-                    version_major,
-                    version_minor,
-                    start_dtm
-                ) VALUES (
-                    :game_id, :season_id, :matching_mode, :matching_team_mode, :server_name,
-                    :incomplete, :version_season, :version_major, :version_minor, :start_dtm
-                )
-                ON CONFLICT(game_id) DO UPDATE SET
-                    season_id=excluded.season_id,
-                    matching_mode=excluded.matching_mode,
-                    matching_team_mode=excluded.matching_team_mode,
-                    server_name=excluded.server_name,
-                    incomplete=CASE
-                        WHEN matches.incomplete = 1 THEN 1
-                        ELSE excluded.incomplete
-                    END,
-                    version_season=excluded.version_season,
-                    version_major=excluded.version_major,
-                    version_minor=excluded.version_minor,
-                    start_dtm=excluded.start_dtm
-                """,
-                {
-                    "game_id": game.get("gameId"),
-                    "season_id": game.get("seasonId"),
-                    "matching_mode": game.get("matchingMode"),
-                    "matching_team_mode": game.get("matchingTeamMode"),
-                    "server_name": game.get("serverName"),
-                    "incomplete": game.get("incomplete", 0),
-                    "version_season": game.get("versionSeason"),
-                    "version_major": game.get("versionMajor"),
-                    "version_minor": game.get("versionMinor"),
-                    "start_dtm": parse_start_time(game.get("startDtm")),
-                },
-            )
+            cur.execute(_UPSERT_MATCH_SQL, _match_row(game))
         self._commit_if_needed()
 
     def upsert_user_match_stats(self, game: Dict[str, Any]) -> None:
         uid = extract_uid(game)
         if uid is None:
             return
-        payload = {
-            "game_id": game.get("gameId"),
-            "uid": uid,
-            "character_num": game.get("characterNum"),
-            "skin_code": game.get("skinCode"),
-            "game_rank": game.get("gameRank"),
-            "player_kill": game.get("playerKill"),
-            "player_assistant": game.get("playerAssistant"),
-            "monster_kill": game.get("monsterKill"),
-            "mmr_after": None,
-            "mmr_gain": game.get("mmrGain")
-            if game.get("mmrGain") is not None
-            else game.get("mmrGainInGame"),
-            "mmr_loss_entry_cost": game.get("mmrLossEntryCost"),
-            "victory": game.get("victory"),
-            "play_time": game.get("playTime"),
-            "duration": game.get("duration"),
-            "damage_to_player": game.get("damageToPlayer"),
-            "character_level": game.get("characterLevel"),
-            "best_weapon": game.get("bestWeapon"),
-            "best_weapon_level": game.get("bestWeaponLevel"),
-            "team_number": game.get("teamNumber"),
-            "premade": game.get("preMade"),
-            "language": game.get("language"),
-            "ml_bot": _resolve_ml_bot(game),
-        }
         with self.cursor() as cur:
-            cur.execute(
-                """
-                INSERT INTO user_match_stats (
-                    game_id, uid, character_num, skin_code, game_rank,
-                    player_kill, player_assistant, monster_kill, mmr_after,
-                    mmr_gain, mmr_loss_entry_cost, victory, play_time, duration,
-                    damage_to_player, character_level, best_weapon,
-                    best_weapon_level, team_number, premade, language, ml_bot
-                ) VALUES (
-                    :game_id, :uid, :character_num, :skin_code, :game_rank,
-                    :player_kill, :player_assistant, :monster_kill, :mmr_after,
-                    :mmr_gain, :mmr_loss_entry_cost, :victory, :play_time, :duration,
-                    :damage_to_player, :character_level, :best_weapon,
-                    :best_weapon_level, :team_number, :premade, :language, :ml_bot
-                )
-                ON CONFLICT(game_id, uid) DO UPDATE SET
-                    character_num=excluded.character_num,
-                    skin_code=excluded.skin_code,
-                    game_rank=excluded.game_rank,
-                    player_kill=excluded.player_kill,
-                    player_assistant=excluded.player_assistant,
-                    monster_kill=excluded.monster_kill,
-                    mmr_after=excluded.mmr_after,
-                    mmr_gain=excluded.mmr_gain,
-                    mmr_loss_entry_cost=excluded.mmr_loss_entry_cost,
-                    victory=excluded.victory,
-                    play_time=excluded.play_time,
-                    duration=excluded.duration,
-                    damage_to_player=excluded.damage_to_player,
-                    character_level=excluded.character_level,
-                    best_weapon=excluded.best_weapon,
-                    best_weapon_level=excluded.best_weapon_level,
-                    team_number=excluded.team_number,
-                    premade=excluded.premade,
-                    language=excluded.language,
-                    ml_bot=excluded.ml_bot
-                """,
-                payload,
-            )
+            cur.execute(_UPSERT_USER_MATCH_STATS_SQL, _user_match_stats_row(game, uid))
         self._commit_if_needed()
 
     def replace_equipment(self, game: Dict[str, Any]) -> None:
@@ -426,27 +606,17 @@ class SQLiteStore:
         if uid is None:
             return
         game_id = game.get("gameId")
-        equipment = game.get("equipment") or {}
-        grades = game.get("equipmentGrade") or {}
+        rows = _equipment_rows(game, uid)
         with self.cursor() as cur:
             cur.execute(
                 "DELETE FROM equipment WHERE game_id=? AND uid=?", (game_id, uid)
             )
-            for slot_str, item_id in equipment.items():
-                slot = int(slot_str)
-                grade = grades.get(slot_str)
-                cur.execute(
-                    """
-                    INSERT INTO equipment (game_id, uid, slot, item_id, grade)
-                    VALUES (?, ?, ?, ?, ?)
-                    """,
-                    (game_id, uid, slot, item_id, grade),
-                )
+            if rows:
+                cur.executemany(_INSERT_EQUIPMENT_SQL, rows)
         self._commit_if_needed()
 
     def replace_mastery_levels(self, game: Dict[str, Any]) -> None:
-        mastery_levels = game.get("masteryLevel") or {}
-        if not mastery_levels:
+        if not game.get("masteryLevel"):
             return
         game_id = game.get("gameId")
         uid = extract_uid(game)
@@ -456,58 +626,44 @@ class SQLiteStore:
             cur.execute(
                 "DELETE FROM mastery_levels WHERE game_id=? AND uid=?", (game_id, uid)
             )
-            for mastery_id, level in mastery_levels.items():
-                cur.execute(
-                    """
-                    INSERT INTO mastery_levels (game_id, uid, mastery_id, level)
-                    VALUES (?, ?, ?, ?)
-                    """,
-                    (game_id, uid, int(mastery_id), level),
-                )
+            cur.executemany(
+                _INSERT_MASTERY_LEVEL_SQL,
+                _int_keyed_rows(game, uid, "masteryLevel"),
+            )
         self._commit_if_needed()
 
     def replace_skill_levels(self, game: Dict[str, Any]) -> None:
-        skill_levels = game.get("skillLevelInfo") or {}
         game_id = game.get("gameId")
         uid = extract_uid(game)
         if uid is None:
             return
-        if not skill_levels:
+        if not game.get("skillLevelInfo"):
             return
         with self.cursor() as cur:
             cur.execute(
                 "DELETE FROM skill_levels WHERE game_id=? AND uid=?", (game_id, uid)
             )
-            for code, level in skill_levels.items():
-                cur.execute(
-                    """
-                    INSERT INTO skill_levels (game_id, uid, skill_code, level)
-                    VALUES (?, ?, ?, ?)
-                    """,
-                    (game_id, uid, int(code), level),
-                )
+            cur.executemany(
+                _INSERT_SKILL_LEVEL_SQL,
+                _int_keyed_rows(game, uid, "skillLevelInfo"),
+            )
         self._commit_if_needed()
 
     def replace_skill_orders(self, game: Dict[str, Any]) -> None:
-        skill_orders = game.get("skillOrderInfo") or {}
         game_id = game.get("gameId")
         uid = extract_uid(game)
         if uid is None:
             return
-        if not skill_orders:
+        if not game.get("skillOrderInfo"):
             return
         with self.cursor() as cur:
             cur.execute(
                 "DELETE FROM skill_orders WHERE game_id=? AND uid=?", (game_id, uid)
             )
-            for sequence, skill_code in skill_orders.items():
-                cur.execute(
-                    """
-                    INSERT INTO skill_orders (game_id, uid, sequence, skill_code)
-                    VALUES (?, ?, ?, ?)
-                    """,
-                    (game_id, uid, int(sequence), skill_code),
-                )
+            cur.executemany(
+                _INSERT_SKILL_ORDER_SQL,
+                _int_keyed_rows(game, uid, "skillOrderInfo"),
+            )
         self._commit_if_needed()
 
     def upsert_from_game_payload(
@@ -531,97 +687,133 @@ class SQLiteStore:
         self.replace_skill_levels(game)
         self.replace_skill_orders(game)
 
+    def upsert_games_bulk(
+        self, games: Iterable[Dict[str, Any]], *, mark_ingested: bool = True
+    ) -> None:
+        """Upsert many game payloads with one ``executemany`` per table.
+
+        Equivalent to calling :meth:`upsert_from_game_payload` for each payload
+        in order, but runs inside a single transaction. Raises ValueError when a
+        payload has no resolvable uid, before anything is written.
+        """
+
+        batch: List[Dict[str, Any]] = []
+        for game in games:
+            uid = extract_uid(game)
+            uid = uid if uid else self.get_uid_from_nickname(game.get("nickname"))
+            if uid is None:
+                raise ValueError("No uid key in game data.")
+            game["uid"] = uid
+            batch.append(game)
+        if not batch:
+            return
+        # Child rows are replaced per (game_id, uid); the last payload wins, as
+        # it would with sequential upserts.
+        latest = list(
+            {(game.get("gameId"), game["uid"]): game for game in batch}.values()
+        )
+        with self.transaction(), self.cursor() as cur:
+            cur.executemany(
+                _UPSERT_USER_SQL,
+                [_user_row(game, mark_ingested=mark_ingested) for game in batch],
+            )
+            cur.executemany(_UPSERT_MATCH_SQL, [_match_row(game) for game in batch])
+            cur.executemany(
+                _UPSERT_USER_MATCH_STATS_SQL,
+                [_user_match_stats_row(game, game["uid"]) for game in batch],
+            )
+            cur.executemany(
+                "DELETE FROM equipment WHERE game_id=? AND uid=?",
+                [(game.get("gameId"), game["uid"]) for game in latest],
+            )
+            cur.executemany(
+                _INSERT_EQUIPMENT_SQL,
+                itertools.chain.from_iterable(
+                    _equipment_rows(game, game["uid"]) for game in latest
+                ),
+            )
+            for table, field, insert_sql in (
+                ("mastery_levels", "masteryLevel", _INSERT_MASTERY_LEVEL_SQL),
+                ("skill_levels", "skillLevelInfo", _INSERT_SKILL_LEVEL_SQL),
+                ("skill_orders", "skillOrderInfo", _INSERT_SKILL_ORDER_SQL),
+            ):
+                present = [game for game in latest if game.get(field)]
+                if not present:
+                    continue
+                cur.executemany(
+                    f"DELETE FROM {table} WHERE game_id=? AND uid=?",
+                    [(game.get("gameId"), game["uid"]) for game in present],
+                )
+                cur.executemany(
+                    insert_sql,
+                    itertools.chain.from_iterable(
+                        _int_keyed_rows(game, game["uid"], field) for game in present
+                    ),
+                )
+
     def refresh_characters(self, characters: Iterable[Dict[str, Any]]) -> int:
         """Replace the character catalog with the provided API payload."""
 
-        rows = []
-        for entry in characters:
-            code = entry.get("characterCode")
-            name = entry.get("character")
-            if not isinstance(code, int) or not isinstance(name, str):
-                continue
-            rows.append(
-                {
-                    "character_code": code,
-                    "name": name,
-                }
-            )
+        inserted = 0
 
-        with self.cursor() as cur:
+        def rows() -> Iterator[Dict[str, Any]]:
+            nonlocal inserted
+            for row in map(_character_catalog_row, characters):
+                if row is not None:
+                    inserted += 1
+                    yield row
+
+        # Delete and reinsert atomically so readers never observe an empty catalog.
+        # Rows are streamed into executemany instead of materialized as a list.
+        with self.transaction(), self.cursor() as cur:
             cur.execute("DELETE FROM characters")
-            if rows:
-                cur.executemany(
-                    """
-                    INSERT INTO characters (character_code, name)
-                    VALUES (:character_code, :name)
-                    ON CONFLICT DO NOTHING
-                    """,
-                    rows,
-                )
-        self._commit_if_needed()
-        return len(rows)
+            cur.executemany(
+                """
+                INSERT INTO characters (character_code, name)
+                VALUES (:character_code, :name)
+                ON CONFLICT DO NOTHING
+                """,
+                rows(),
+            )
+        return inserted
 
     def refresh_items(self, items: Iterable[Dict[str, Any]]) -> int:
         """Replace the item catalog with the provided API payload."""
 
-        rows = []
-        for entry in items:
-            code = entry.get("code")
-            name = entry.get("name")
-            if not isinstance(code, int) or not isinstance(name, str):
-                continue
-            mode_type = entry.get("modeType")
-            if not isinstance(mode_type, int):
-                mode_type = None
-            item_type = entry.get("itemType")
-            if not isinstance(item_type, str):
-                item_type = None
-            item_grade = entry.get("itemGrade")
-            if not isinstance(item_grade, str):
-                item_grade = None
-            is_completed_raw = entry.get("isCompletedItem")
-            is_completed_item = (
-                int(bool(is_completed_raw)) if is_completed_raw is not None else 0
-            )
-
-            rows.append(
-                {
-                    "item_code": code,
-                    "name": name,
-                    "mode_type": mode_type,
-                    "item_type": item_type,
-                    "item_grade": item_grade,
-                    "is_completed_item": is_completed_item,
-                }
-            )
+        inserted = 0
 
-        with self.cursor() as cur:
+        def rows() -> Iterator[Dict[str, Any]]:
+            nonlocal inserted
+            for row in map(_item_catalog_row, items):
+                if row is not None:
+                    inserted += 1
+                    yield row
+
+        with self.transaction(), self.cursor() as cur:
             cur.execute("DELETE FROM items")
-            if rows:
-                cur.executemany(
-                    """
-                    INSERT INTO items (
-                        item_code,
-                        name,
-                        mode_type,
-                        item_type,
-                        item_grade,
-                        is_completed_item
-                    )
-                    VALUES (
-                        :item_code,
-                        :name,
-                        :mode_type,
-                        :item_type,
-                        :item_grade,
-                        :is_completed_item
-                    )
-                    ON CONFLICT DO NOTHING
-                    """,
-                    rows,
+            cur.executemany(
+                """
+                INSERT INTO items (
+                    item_code,
+                    name,
+                    mode_type,
+                    item_type,
+                    item_grade,
+                    is_completed_item
                 )
-        self._commit_if_needed()
-        return len(rows)
+                VALUES (
+                    :item_code,
+                    :name,
+                    :mode_type,
+                    :item_type,
+                    :item_grade,
+                    :is_completed_item
+                )
+                ON CONFLICT DO NOTHING
+                """,
+                rows(),
+            )
+        return inserted
 
     def has_game(self, game_id: int) -> bool:
         with self.cursor() as cur:
@@ -670,6 +862,36 @@ class SQLiteStore:
             cur.execute(query, ids)
             return {int(row["game_id"]) for row in cur.fetchall()}
 
+    def classify_game_ids(
+        self, game_ids: Iterable[int]
+    ) -> Dict[int, Literal["known", "deleted", "new"]]:
+        """Classify game ids as deleted, already stored, or new in one query.
+
+        A deleted marker takes precedence over an existing match row.
+        """
+
+        ids = [int(value) for value in game_ids if value is not None]
+        if not ids:
+            return {}
+        classification: Dict[int, Literal["known", "deleted", "new"]] = dict.fromkeys(
+            ids, "new"
+        )
+        placeholders = ", ".join(["?"] * len(ids))
+        query = f"""
+            SELECT game_id, 'known' AS status FROM matches
+            WHERE game_id IN ({placeholders})
+            UNION ALL
+            SELECT game_id, 'deleted' AS status FROM deleted_matches
+            WHERE game_id IN ({placeholders})
+        """
+        with self.cursor() as cur:
+            cur.execute(query, ids + ids)
+            for row in cur.fetchall():
+                game_id = int(row["game_id"])
+                if row["status"] == "deleted" or classification[game_id] == "new":
+                    classification[game_id] = row["status"]
+        return classification
+
     def is_game_deleted(self, game_id: int) -> bool:
         if game_id is None:
             return False
@@ -753,6 +975,83 @@ class SQLiteStore:
             )
         self._commit_if_needed()
 
+    def update_users_last_checked(self, items: Iterable[tuple[str, str]]) -> None:
+        """Set ``last_checked`` for many ``(uid, checked_at)`` pairs at once."""
+
+        with self.cursor() as cur:
+            cur.executemany(
+                "UPDATE users SET last_checked=? WHERE uid=? AND deleted = 0",
+                ((checked_at, uid) for uid, checked_at in items),
+            )
+        self._commit_if_needed()
+
+    def push_pending_users(self, items: Iterable[tuple[str, int]]) -> None:
+        """Append ``(nickname, depth)`` pairs to the crawl overflow queue."""
+
+        with self.cursor() as cur:
+            cur.executemany(
+                "INSERT OR IGNORE INTO pending_users (nickname, depth) VALUES (?, ?)",
+                items,
+            )
+        self._commit_if_needed()
+
+    def pop_pending_users(self, limit: int) -> List[tuple[str, int]]:
+        """Remove and return up to ``limit`` overflow entries in insertion order."""
+
+        with self.cursor() as cur:
+            cur.execute(
+                "SELECT rowid, nickname, depth FROM pending_users ORDER BY rowid LIMIT ?",
+                (limit,),
+            )
+            rows = cur.fetchall()
+            cur.executemany(
+                "DELETE FROM pending_users WHERE rowid=?",
+                ((row["rowid"],) for row in rows),
+            )
+        self._commit_if_needed()
+        return [(row["nickname"], int(row["depth"])) for row in rows]
+
+    def clear_pending_users(self) -> None:
+        with self.cursor() as cur:
+            cur.execute("DELETE FROM pending_users")
+        self._commit_if_needed()
+
+    def get_game_participant_count(self, game_id: int) -> int:
+        """Return the number of stored participants for a match."""
+
+        with self.cursor() as cur:
+            # Answered from the (game_id, uid) primary key without row reads.
+            cur.execute(
+                "SELECT COUNT(*) FROM user_match_stats WHERE game_id=?", (game_id,)
+            )
+            return int(cur.fetchone()[0])
+
+    def get_game_participant_counts(self, game_ids: Iterable[int]) -> Dict[int, int]:
+        """Return stored participant counts for many matches at once.
+
+        Matches without stored participants map to 0.
+        """
+
+        ids = list({int(value) for value in game_ids if value is not None})
+        counts: Dict[int, int] = dict.fromkeys(ids, 0)
+        with self.cursor() as cur:
+            # Stay below SQLite's default host-parameter limit.
+            for start in range(0, len(ids), 900):
+                chunk = ids[start : start + 900]
+                placeholders = ", ".join(["?"] * len(chunk))
+                cur.execute(
+                    f"""
+                    SELECT game_id, COUNT(*) AS total
+                    FROM user_match_stats
+                    WHERE game_id IN ({placeholders})
+                    GROUP BY game_id
+                    """,
+                    chunk,
+                )
+                for row in cur.fetchall():
+                    counts[int(row["game_id"])] = int(row["total"])
+        return counts
+
     def get_participants_for_game(self, game_id: int) -> Set[str]:
         with self.cursor() as cur:
             cur.execute("SELECT uid FROM user_match_stats WHERE game_id=?", (game_id,))
@@ -775,6 +1074,31 @@ class SQLiteStore:
             row = cur.fetchone()
             return row["nickname"] if row else None
 
+    def get_latest_nicknames_for_uids(self, uids: Iterable[str]) -> Dict[str, str]:
+        """Return ``uid -> nickname`` for the given uids in a single query.
+
+        Uids without a stored nickname are omitted.
+        """
+
+        uid_list = list({uid for uid in uids if isinstance(uid, str)})
+        if not uid_list:
+            return {}
+        placeholders = ", ".join(["?"] * len(uid_list))
+        with self.cursor() as cur:
+            cur.execute(
+                f"""
+                SELECT uid, nickname
+                FROM users
+                WHERE uid IN ({placeholders})
+                """,
+                uid_list,
+            )
+            return {
+                row["uid"]: row["nickname"]
+                for row in cur.fetchall()
+                if isinstance(row["nickname"], str) and row["nickname"]
+            }
+
     @contextmanager
     def transaction(self) -> Iterator[None]:
         self._transaction_depth += 1
@@ -982,4 +1306,4 @@ class SQLiteStore:
         return [int(row["game_id"]) for row in rows]
 
 
-__all__ = ["SQLiteStore", "parse_start_time"]
+__all__ = ["SQLiteStore", "parse_start_time", "start_time_epoch"]
@@ -3,13 +3,30 @@
 from __future__ import annotations
 
 import datetime as dt
+import functools
 import logging
+import queue
+import random
+import sqlite3
+import threading
 import time
-from collections import deque
-from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    DefaultDict,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+)
 
 import requests
 
+from .api_cache import GameResultCache
 from .api_client import (
     ApiResponseError,
     EternalReturnAPIClient,
@@ -18,7 +35,8 @@ from .api_client import (
     is_user_games_no_games_error,
     is_user_games_uid_missing_error,
 )
-from .db import SQLiteStore, parse_start_time
+from .bloom import ScalableBloomFilter
+from .db import SQLiteStore, extract_uid, start_time_epoch
 
 try:
     # Optional Parquet export; available when pyarrow is installed
@@ -30,6 +48,26 @@ except ImportError:  # pragma: no cover - optional dependency
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
+# Nickname->uid entries unused for this long are dropped from the in-process cache.
+NICKNAME_CACHE_IDLE_SECONDS = 30 * 60
+# Upper bound on the in-process nickname cache; least recently used entries go first.
+NICKNAME_CACHE_MAX_ENTRIES = 10_000
+# First-stage size of the per-run seen-games filter; it grows with the crawl.
+SEEN_GAMES_INITIAL_CAPACITY = 100_000
+RECENT_SEEN_GAMES = 10_000
+# Upper bound on payloads the Parquet writer thread coalesces per exporter call.
+PARQUET_DRAIN_PAYLOADS = 500
+
+
+@functools.lru_cache(maxsize=8192)
+def _parse_iso(value: str) -> Optional[dt.datetime]:
+    """Parse an ISO-8601 string, returning None when it is malformed."""
+
+    try:
+        return dt.datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
 
 def _is_game_result_payload_not_found_error(exc: Exception) -> bool:
     """Return True when game-result endpoint reports a missing game payload."""
@@ -63,14 +101,31 @@ class IngestionManager:
         max_failed_uids_per_seed: int | None = None,
         participant_retry_attempts: int = 2,
         participant_retry_delay: float = 1.0,
+        max_txn_batch: int = 500,
+        fetch_workers: int = 1,
+        parquet_background: bool = False,
+        game_result_cache: GameResultCache | None = None,
+        report_every: int = 25,
+        max_queue_size: int = 100_000,
+        retry_backoff_base: float = 0.25,
+        retry_backoff_cap: float = 5.0,
+        retry_backoff_jitter: float = 0.25,
     ) -> None:
         self.client = client
         self.store = store
         self.max_games_per_user = max_games_per_user
         self.fetch_game_details = fetch_game_details
-        self._seen_games: Set[int] = set()
+        # Bloom filter keeps memory flat on deep crawls; the exact window of
+        # recent ids covers short-term repeats without false positives.
+        self._seen_games = ScalableBloomFilter(
+            SEEN_GAMES_INITIAL_CAPACITY, error_rate=1e-4
+        )
+        self._recent_games: Dict[int, None] = {}
         self._progress_callback = progress_callback
+        # Per-game progress is reported for the first game and every Nth one.
+        self.report_every = max(1, int(report_every))
         self._parquet = parquet_exporter
+        self._game_result_cache = game_result_cache
         self.only_newer_games = only_newer_games
         self.prefer_nickname_fetch = prefer_nickname_fetch
         self.nickname_recheck_interval = nickname_recheck_interval
@@ -84,16 +139,134 @@ class IngestionManager:
         self.max_seed_uid_resolve_attempts = int(max_seed_uid_resolve_attempts)
         self.participant_retry_attempts = int(participant_retry_attempts)
         self.participant_retry_delay = float(participant_retry_delay)
+        self.retry_backoff_base = float(retry_backoff_base)
+        self.retry_backoff_cap = float(retry_backoff_cap)
+        self.retry_backoff_jitter = float(retry_backoff_jitter)
+        self.max_txn_batch = max(1, int(max_txn_batch))
+        # Crawl frontier entries beyond this spill to the pending_users table.
+        self.max_queue_size = max(1, int(max_queue_size))
+        self.fetch_workers = max(1, int(fetch_workers))
+        # API calls only; SQLite access stays on the calling thread.
+        self._fetch_pool: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(
+                max_workers=self.fetch_workers, thread_name_prefix="er-fetch"
+            )
+            if self.fetch_workers > 1
+            else None
+        )
+        # Parquet writes drain on one worker thread so the exporter is never
+        # touched concurrently; close() flushes the queue. Each queue item is a
+        # committed batch of payloads.
+        self._parquet_queue: Optional[queue.Queue[Optional[List[Dict[str, Any]]]]] = (
+            None
+        )
+        self._parquet_thread: Optional[threading.Thread] = None
+        self._parquet_error: Optional[Exception] = None
+        if self._parquet is not None and parquet_background:
+            self._parquet_queue = queue.Queue(maxsize=1024)
+            self._parquet_thread = threading.Thread(
+                target=self._parquet_worker,
+                args=(self._parquet_queue,),
+                name="er-parquet",
+                daemon=True,
+            )
+            self._parquet_thread.start()
+        # Bulk mode lasts until close(), covering every ingest entry point.
+        self.store.set_bulk_mode(enabled=True)
         self.ingest_started_at = dt.datetime.now(dt.timezone.utc)
-        self._not_found_nicknames: Set[str] = set()
-        self._uid_missing_uids_by_seed: Dict[str, Set[str]] = {}
-        self._seed_uid_resolve_attempts: Dict[str, int] = {}
+        # nickname -> (uid, resolved at, last access) in LRU order; monotonic
+        # clock. Entries expire when idle and, regardless of use, once
+        # nickname_recheck_interval has passed since they were resolved.
+        self._nickname_uid_cache: Dict[str, tuple[str, float, float]] = {}
+        # Fetch-pool threads may remember resolutions concurrently.
+        self._nickname_cache_lock = threading.Lock()
+        # nickname -> time the API reported it missing; expires after
+        # nickname_recheck_interval so long runs can retry the lookup
+        self._not_found_nicknames: Dict[str, float] = {}
+        # Read with .get() so lookups never insert empty entries. The inner
+        # dicts act as ordered sets, keeping uids in failure order.
+        self._uid_missing_uids_by_seed: DefaultDict[str, Dict[str, None]] = defaultdict(
+            dict
+        )
+        self._seed_uid_resolve_attempts: DefaultDict[str, int] = defaultdict(int)
+        # uid -> last_checked timestamp awaiting a batched UPDATE
+        self._pending_last_checked: Dict[str, str] = {}
 
-    def _report(self, message: str) -> None:
-        if self._progress_callback:
-            self._progress_callback(message)
+    @property
+    def ingest_started_at(self) -> dt.datetime:
+        """Timestamp used as ``startDtm`` for participants that lack one."""
+
+        return self._ingest_started_at
+
+    @ingest_started_at.setter
+    def ingest_started_at(self, value: dt.datetime) -> None:
+        self._ingest_started_at = value
+        # Stringified once; the participant loop reuses it.
+        self._ingest_started_iso = value.isoformat()
+
+    def close(self) -> None:
+        """Release worker threads owned by the manager.
+
+        Pending background Parquet writes are drained first; an error raised
+        by the writer thread is re-raised here. The store leaves bulk mode
+        and is fully durable again afterwards.
+        """
+
+        if self._fetch_pool is not None:
+            self._fetch_pool.shutdown(wait=True, cancel_futures=True)
+            self._fetch_pool = None
+        self.store.set_bulk_mode(enabled=False)
+        if self._parquet_thread is not None and self._parquet_queue is not None:
+            self._parquet_queue.put(None)
+            self._parquet_thread.join()
+            self._parquet_thread = None
+            self._parquet_queue = None
+        if self._parquet_error is not None:
+            error, self._parquet_error = self._parquet_error, None
+            raise error
+
+    def _parquet_worker(
+        self, batches: queue.Queue[Optional[List[Dict[str, Any]]]]
+    ) -> None:
+        stopping = False
+        while not stopping:
+            batch = batches.get()
+            if batch is None:
+                return
+            # Coalesce batches that are already waiting into one exporter call.
+            payloads = list(batch)
+            while len(payloads) < PARQUET_DRAIN_PAYLOADS:
+                try:
+                    more = batches.get_nowait()
+                except queue.Empty:
+                    break
+                if more is None:
+                    stopping = True
+                    break
+                payloads.extend(more)
+            if self._parquet_error is not None or self._parquet is None:
+                # Keep draining so producers never block on a dead writer.
+                continue
+            try:
+                self._parquet.write_from_game_payloads(payloads)
+            except Exception as exc:  # surfaced by close()
+                self._parquet_error = exc
+
+    def _write_parquet_payloads(self, payloads: List[Dict[str, Any]]) -> None:
+        if self._parquet is None or not payloads:
+            return
+        if self._parquet_queue is not None:
+            self._parquet_queue.put(payloads)
         else:
-            logger.info(message)
+            self._parquet.write_from_game_payloads(payloads)
+
+    def _report(self, message: str, *args: object) -> None:
+        """Emit a progress message, %-formatting ``args`` only when delivered."""
+
+        if self._progress_callback:
+            self._progress_callback(message % args if args else message)
+        elif logger.isEnabledFor(logging.INFO):
+            logger.info(message, *args)
 
     def _queue_parquet_payload(
         self,
@@ -103,12 +276,86 @@ class IngestionManager:
         if self._parquet is None:
             return
         if parquet_buffer is not None:
-            parquet_buffer.append(dict(payload))
+            # Callers finish mutating the payload (uid, startDtm) before
+            # queueing it, so the buffer can hold the reference as-is.
+            parquet_buffer.append(payload)
         else:
-            self._parquet.write_from_game_payload(payload)
+            self._write_parquet_payloads([payload])
+
+    def _remember_nickname_uid(self, nickname: str, uid: str) -> None:
+        now = time.monotonic()
+        cache = self._nickname_uid_cache
+        with self._nickname_cache_lock:
+            cache.pop(nickname, None)
+            cache[nickname] = (uid, now, now)
+            while len(cache) > NICKNAME_CACHE_MAX_ENTRIES:
+                del cache[next(iter(cache))]
+
+    def _is_nickname_entry_expired(
+        self, resolved_at: float, last_access: float, now: float
+    ) -> bool:
+        return (
+            now - last_access > NICKNAME_CACHE_IDLE_SECONDS
+            or now - resolved_at > self.nickname_recheck_interval.total_seconds()
+        )
+
+    def _cached_nickname_uid(self, nickname: str) -> Optional[str]:
+        cache = self._nickname_uid_cache
+        with self._nickname_cache_lock:
+            entry = cache.pop(nickname, None)
+            if entry is None:
+                return None
+            uid, resolved_at, last_access = entry
+            now = time.monotonic()
+            if self._is_nickname_entry_expired(resolved_at, last_access, now):
+                return None
+            # Re-insert at the end to mark it most recently used.
+            cache[nickname] = (uid, resolved_at, now)
+            return uid
+
+    def _is_nickname_known_missing(self, nickname: str) -> bool:
+        recorded_at = self._not_found_nicknames.get(nickname)
+        if recorded_at is None:
+            return False
+        ttl = self.nickname_recheck_interval.total_seconds()
+        if time.monotonic() - recorded_at > ttl:
+            del self._not_found_nicknames[nickname]
+            return False
+        return True
+
+    def _sweep_nickname_caches(self) -> None:
+        """Evict stale nickname->uid entries and expired missing-nickname marks."""
+
+        now = time.monotonic()
+        with self._nickname_cache_lock:
+            stale = [
+                nickname
+                for nickname, (_, resolved_at, last_access) in (
+                    self._nickname_uid_cache.items()
+                )
+                if self._is_nickname_entry_expired(resolved_at, last_access, now)
+            ]
+            for nickname in stale:
+                del self._nickname_uid_cache[nickname]
+        ttl = self.nickname_recheck_interval.total_seconds()
+        expired = [
+            nickname
+            for nickname, recorded_at in self._not_found_nicknames.items()
+            if now - recorded_at > ttl
+        ]
+        for nickname in expired:
+            del self._not_found_nicknames[nickname]
+
+    def _backoff_delay(self, attempt: int, base: float) -> float:
+        """Return the capped exponential delay, plus jitter, after ``attempt``."""
+
+        if base <= 0:
+            return 0.0
+        delay = min(self.retry_backoff_cap, base * 2 ** (attempt - 1))
+        return delay + random.uniform(0, self.retry_backoff_jitter)
 
     def _fetch_uid_with_retries(self, nickname: str) -> Optional[str]:
-        if nickname in self._not_found_nicknames:
+        if self._is_nickname_known_missing(nickname):
             return None
         last_exc: Optional[Exception] = None
         for attempt in range(1, self.max_nickname_attempts + 1):
@@ -117,12 +364,13 @@ class IngestionManager:
                 user = payload.get("user") or {}
                 uid_value = user.get("userId") or user.get("uid")
                 if isinstance(uid_value, str) and uid_value:
+                    self._remember_nickname_uid(nickname, uid_value)
                     return uid_value
                 raise ValueError(f"Nickname '{nickname}' did not resolve to a uid.")
             except ApiResponseError as exc:
                 last_exc = exc
                 if is_nickname_not_found_error(exc):
-                    self._not_found_nicknames.add(nickname)
+                    self._not_found_nicknames[nickname] = time.monotonic()
                     break
                 if attempt >= self.max_nickname_attempts:
                     break
@@ -130,24 +378,36 @@ class IngestionManager:
                 last_exc = exc
                 if attempt >= self.max_nickname_attempts:
                     break
+            # Rate limiting (429) is already handled with Retry-After by the client.
+            time.sleep(self._backoff_delay(attempt, self.retry_backoff_base))
         if last_exc is not None:
             self._report(
                 f"Failed to resolve nickname '{nickname}' after {self.max_nickname_attempts} attempts: {last_exc}"
             )
         return None
 
-    def _resolve_uid(self, nickname: str, start_dtm: Optional[str]) -> Optional[str]:
-        """Resolve a nickname to UID using cached mapping first, then API."""
+    def _resolve_uid(self, nickname: str) -> Optional[str]:
+        """Resolve a nickname to UID using cached mappings first, then API.
 
-        if not isinstance(nickname, str) or not nickname:
+        The in-process cache is consulted before the DB; it only holds uids
+        resolved during this run.
+        """
+
+        if type(nickname) is not str or not nickname:
             return None
-        cached_uid = None
-        if not self.prefer_nickname_fetch:
-            cached = self.store.get_uid_info_for_nickname(nickname)
-            if cached:
-                cached_uid = cached[0]
+        return self._resolve_uid_fast(nickname)
+
+    def _resolve_uid_fast(self, nickname: str) -> Optional[str]:
+        """Resolve an already validated, non-empty nickname."""
+
+        cached_uid = self._cached_nickname_uid(nickname)
         if cached_uid:
             return cached_uid
+        if not self.prefer_nickname_fetch:
+            cached = self.store.get_uid_info_for_nickname(nickname)
+            if cached and cached[0]:
+                self._remember_nickname_uid(nickname, cached[0])
+                return cached[0]
         return self._fetch_uid_with_retries(nickname)
 
     def _record_seed_uid_missing_uid(self, seed_nickname: str, uid: str) -> None:
@@ -155,8 +415,7 @@ class IngestionManager:
             return
         if not isinstance(uid, str) or not uid:
             return
-        uid_set = self._uid_missing_uids_by_seed.setdefault(seed_nickname, set())
-        uid_set.add(uid)
+        self._uid_missing_uids_by_seed[seed_nickname][uid] = None
 
     def _is_seed_uid_missing_uid(self, seed_nickname: str, uid: str) -> bool:
         if not seed_nickname:
@@ -169,22 +428,20 @@ class IngestionManager:
     def _next_seed_uid_resolve_attempt(self, seed_nickname: str) -> int:
         if not seed_nickname:
             return 0
-        previous = self._seed_uid_resolve_attempts.get(seed_nickname, 0)
-        current = previous + 1
-        self._seed_uid_resolve_attempts[seed_nickname] = current
-        return current
+        self._seed_uid_resolve_attempts[seed_nickname] += 1
+        return self._seed_uid_resolve_attempts[seed_nickname]
 
     def _prepare_seed_recovery_after_uid_missing(
         self, seed_nickname: str, uid: str
     ) -> tuple[Optional[int], Optional[str]]:
         self._record_seed_uid_missing_uid(seed_nickname, uid)
-        uid_missing_uids = self._uid_missing_uids_by_seed.get(seed_nickname, set())
+        uid_missing_uids = self._uid_missing_uids_by_seed.get(seed_nickname, {})
         uid_missing_count = len(uid_missing_uids)
         if uid_missing_count >= self.max_failed_uids_per_seed:
-            sorted_uids = ", ".join(sorted(uid_missing_uids))
+            failed_uids = ", ".join(uid_missing_uids)
             reason = (
                 f"Stopping ingest for seed '{seed_nickname}' because failed uid variants reached "
-                f"{uid_missing_count} (limit {self.max_failed_uids_per_seed}; uids={sorted_uids})."
+                f"{uid_missing_count} (limit {self.max_failed_uids_per_seed}; uids={failed_uids})."
             )
             return None, reason
         resolve_attempt = self._next_seed_uid_resolve_attempt(seed_nickname)
@@ -241,20 +498,28 @@ class IngestionManager:
         return resolved_uid
 
     def _needs_uid_recheck(self, uid: str) -> bool:
+        if uid in self._pending_last_checked:
+            return False
         last_checked = self.store.get_user_last_checked(uid)
         if last_checked is None:
             return False
-        try:
-            checked_dt = dt.datetime.fromisoformat(last_checked)
-        except ValueError:
+        checked_dt = _parse_iso(last_checked)
+        if checked_dt is None:
             return True
         now = dt.datetime.now(dt.timezone.utc)
         return now - checked_dt > self.uid_recheck_interval
 
     def _mark_uid_checked(self, uid: str) -> None:
-        now_iso = dt.datetime.now(dt.timezone.utc).isoformat()
+        # Written in one batch by _flush_last_checked at page/batch end.
+        self._pending_last_checked[uid] = dt.datetime.now(dt.timezone.utc).isoformat()
+
+    def _flush_last_checked(self) -> None:
+        if not self._pending_last_checked:
+            return
+        pending = self._pending_last_checked
+        self._pending_last_checked = {}
         try:
-            self.store.update_user_last_checked(uid, now_iso)
+            self.store.update_users_last_checked(pending.items())
         except Exception:
             pass
 
@@ -305,10 +570,18 @@ class IngestionManager:
                 return uid
             raise
 
-    def ingest_user(self, uid: str, *, seed_nickname: Optional[str] = None) -> Set[str]:
+    def ingest_user(
+        self,
+        uid: str,
+        *,
+        seed_nickname: Optional[str] = None,
+        collect_nicknames: bool = True,
+    ) -> Set[str]:
         """Ingest matches for a single user.
 
         Returns a set of newly discovered nicknames from the processed games.
+        With ``collect_nicknames=False`` participants of already-known games
+        are not looked up, as the caller will not recurse into them.
         """
 
         uid = str(uid)
@@ -347,29 +620,42 @@ class IngestionManager:
 
         self._report(f"Fetching games for uid {uid}")
 
-        cutoff: Optional[dt.datetime] = None
+        # Cutoffs are compared as POSIX timestamps to keep datetime
+        # arithmetic out of the per-game loop.
+        cutoff_ts: Optional[float] = None
         if self.only_newer_games:
             ingested_until = self.store.get_user_ingested_until(uid)
             if ingested_until:
-                try:
-                    cutoff = dt.datetime.fromisoformat(ingested_until)
-                except ValueError:
-                    cutoff = None
-        prune_cutoff: Optional[dt.datetime] = None
+                cutoff_dt = _parse_iso(ingested_until)
+                cutoff_ts = cutoff_dt.timestamp() if cutoff_dt is not None else None
+        prune_ts: Optional[float] = None
         prune_before = self.store.get_prune_before()
         if prune_before:
-            try:
-                prune_cutoff = dt.datetime.fromisoformat(prune_before)
-            except ValueError:
+            prune_dt = _parse_iso(prune_before)
+            if prune_dt is not None:
+                prune_ts = prune_dt.timestamp()
+            else:
                 self._report(
                     f"Ignoring invalid prune cutoff stored in DB: {prune_before}"
                 )
 
         stop_due_to_cutoff = False
         stop_due_to_prune = False
+        # Bound once: these are looked up for every game of every page.
+        report = self._report
+        epoch_of = start_time_epoch
+        max_games = self.max_games_per_user
+        # Without either cutoff the start time is never needed per game.
+        check_times = prune_ts is not None or cutoff_ts is not None
+        # Next page requested on the fetch pool while this page is written.
+        next_page: Optional[Future[Dict[str, Any]]] = None
         while True:
             try:
-                payload = self.client.fetch_user_games(uid, next_token)
+                if next_page is not None:
+                    payload = next_page.result()
+                    next_page = None
+                else:
+                    payload = self.client.fetch_user_games(uid, next_token)
             except (requests.HTTPError, ApiResponseError) as exc:
                 if is_user_games_uid_missing_error(exc):
                     resolved_uid = self._try_recover_seed_uid(
@@ -409,169 +695,400 @@ class IngestionManager:
                 break
             else:
                 self._mark_uid_checked(uid)
+            self._sweep_nickname_caches()
             games = payload.get("userGames", [])
-            deleted_ids = self.store.list_deleted_games(
-                [
-                    game_id
-                    for game_id in (game.get("gameId") for game in games)
-                    if game_id is not None
-                ]
+            # One query tells which page games are deleted or already stored.
+            classification = self.store.classify_game_ids(
+                game.get("gameId") for game in games
             )
+            selected: List[Dict[str, Any]] = []
+            select = selected.append
+            status_of = classification.get
             for game in games:
-                start_iso = parse_start_time(game.get("startDtm"))
-                start_dt = None
-                if start_iso:
-                    try:
-                        start_dt = dt.datetime.fromisoformat(start_iso)
-                    except ValueError:
-                        start_dt = None
-                if prune_cutoff and start_dt and start_dt <= prune_cutoff:
+                start_ts = epoch_of(game.get("startDtm")) if check_times else None
+                if (
+                    prune_ts is not None
+                    and start_ts is not None
+                    and start_ts <= prune_ts
+                ):
                     stop_due_to_prune = True
-                    self._report(
+                    report(
                         "Encountered game older than prune cutoff "
                         f"{prune_before} for uid {uid}; stopping early"
                     )
                     break
-                if cutoff and start_dt and start_dt <= cutoff:
+                if (
+                    cutoff_ts is not None
+                    and start_ts is not None
+                    and start_ts <= cutoff_ts
+                ):
                     stop_due_to_cutoff = True
-                    self._report(
+                    report(
                         "Encountered previously ingested game "
                         f"{game.get('gameId')} for uid {uid}; stopping early"
                     )
                     break
                 game_id = game.get("gameId")
-                if game_id in deleted_ids:
-                    self._report(f"Skipping deleted game {game_id} for uid {uid}")
+                if status_of(game_id) == "deleted":
+                    report("Skipping deleted game %s for uid %s", game_id, uid)
                     continue
-                game_already_known = bool(game_id and self.store.has_game(game_id))
-                game["uid"] = uid
-                parquet_payloads: Optional[List[Dict[str, Any]]] = (
-                    [] if self._parquet is not None else None
-                )
-                with self.store.transaction():
-                    self.store.upsert_from_game_payload(game, mark_ingested=True)
-                    if self.fetch_game_details:
-                        discovered.update(
-                            self._ingest_game_participants(
-                                game_id,
-                                already_known=game_already_known,
-                                parquet_buffer=parquet_payloads,
-                            )
-                        )
-                if self._parquet is not None:
-                    self._parquet.write_from_game_payload(game)
-                    if parquet_payloads:
-                        for participant in parquet_payloads:
-                            self._parquet.write_from_game_payload(participant)
-                processed += 1
-                self._report(f"Processed game {processed}({game_id}) for uid {uid}")
-                if self.max_games_per_user and processed >= self.max_games_per_user:
+                select(game)
+                if max_games and processed + len(selected) >= max_games:
                     break
+            if (
+                self._fetch_pool is not None
+                and payload.get("next")
+                and not (stop_due_to_prune or stop_due_to_cutoff)
+                and not (max_games and processed + len(selected) >= max_games)
+            ):
+                # The selection pass above already decided paging continues,
+                # so this request is one the serial loop would make anyway.
+                next_page = self._fetch_pool.submit(
+                    self.client.fetch_user_games, uid, payload.get("next")
+                )
+            for offset in range(0, len(selected), self.max_txn_batch):
+                processed = self._ingest_games_batch(
+                    uid,
+                    selected[offset : offset + self.max_txn_batch],
+                    classification=classification,
+                    processed=processed,
+                    discovered=discovered,
+                    collect_nicknames=collect_nicknames,
+                )
+            self._flush_last_checked()
             if stop_due_to_prune or stop_due_to_cutoff:
                 break
-            if self.max_games_per_user and processed >= self.max_games_per_user:
+            if max_games and processed >= max_games:
                 break
             next_token = payload.get("next")
             if not next_token:
                 break
+        self._flush_last_checked()
         return discovered
 
+    def _ingest_games_batch(
+        self,
+        uid: str,
+        games: List[Dict[str, Any]],
+        *,
+        classification: Dict[int, str],
+        processed: int,
+        discovered: Set[str],
+        collect_nicknames: bool = True,
+    ) -> int:
+        """Ingest a batch of seed games in one transaction.
+
+        Returns the updated processed-game counter.
+        """
+
+        parquet_payloads: Optional[List[Dict[str, Any]]] = (
+            [] if self._parquet is not None else None
+        )
+        already_known = [
+            classification.get(game.get("gameId")) == "known" for game in games
+        ]
+        fetchers = self._iter_game_result_fetchers(
+            self._game_ids_to_prefetch(games, already_known)
+        )
+        next_fetch = next(fetchers, None)
+        try:
+            with self.store.transaction():
+                for game in games:
+                    game["uid"] = uid
+                self.store.upsert_games_bulk(games, mark_ingested=True)
+                # One grouped query instead of a count per known game.
+                known_counts = (
+                    self.store.get_game_participant_counts(
+                        game.get("gameId")
+                        for game, known in zip(games, already_known)
+                        if known
+                    )
+                    if self.fetch_game_details and any(already_known)
+                    else {}
+                )
+                fetch_details = self.fetch_game_details
+                ingest_participants = self._ingest_game_participants
+                report = self._report
+                report_every = self.report_every
+                for game, game_already_known in zip(games, already_known):
+                    game_id = game.get("gameId")
+                    if parquet_payloads is not None:
+                        parquet_payloads.append(game)
+                    if fetch_details:
+                        fetch_result = None
+                        if next_fetch is not None and next_fetch[0] == game_id:
+                            fetch_result = next_fetch[1]
+                            next_fetch = next(fetchers, None)
+                        ingest_participants(
+                            game_id,
+                            discovered,
+                            already_known=game_already_known,
+                            parquet_buffer=parquet_payloads,
+                            collect_nicknames=collect_nicknames,
+                            fetch_result=fetch_result,
+                            cached_count=known_counts.get(game_id),
+                        )
+                    processed += 1
+                    if processed == 1 or processed % report_every == 0:
+                        report(
+                            "Processed game %d(%s) for uid %s", processed, game_id, uid
+                        )
+                self._flush_last_checked()
+        finally:
+            fetchers.close()
+        # Parquet output is written only after the batch has been committed.
+        if parquet_payloads:
+            self._write_parquet_payloads(parquet_payloads)
+        return processed
+
+    def _game_ids_to_prefetch(
+        self, games: List[Dict[str, Any]], already_known: List[bool]
+    ) -> List[int]:
+        """Return ids, in page order, whose game result will be requested.
+
+        Only used with a fetch pool; known, seen and cached games are skipped
+        so prefetching never spends a request the serial path would not.
+        """
+
+        if self._fetch_pool is None or not self.fetch_game_details:
+            return []
+        cache = self._game_result_cache
+        game_ids: Dict[int, None] = {}
+        for game, game_already_known in zip(games, already_known):
+            game_id = game.get("gameId")
+            if (
+                not game_id
+                or game_already_known
+                or game_id in game_ids
+                or self._is_game_seen(game_id)
+                or (cache is not None and game_id in cache)
+            ):
+                continue
+            game_ids[game_id] = None
+        return list(game_ids)
+
+    def _prefetch_nickname_uids(self, nicknames: List[str]) -> Dict[str, Optional[str]]:
+        """Resolve uncached nicknames concurrently on the fetch pool.
+
+        DB lookups stay on the calling thread; only API lookups are fanned
+        out. Nicknames answered by the in-process cache or the DB are omitted
+        from the result and resolve as usual.
+        """
+
+        if self._fetch_pool is None:
+            return {}
+        to_fetch: List[str] = []
+        for nickname in dict.fromkeys(nicknames):
+            if self._cached_nickname_uid(nickname) or self._is_nickname_known_missing(
+                nickname
+            ):
+                continue
+            if not self.prefer_nickname_fetch:
+                cached = self.store.get_uid_info_for_nickname(nickname)
+                if cached and cached[0]:
+                    self._remember_nickname_uid(nickname, cached[0])
+                    continue
+            to_fetch.append(nickname)
+        if len(to_fetch) < 2:
+            return {}
+        return dict(
+            zip(to_fetch, self._fetch_pool.map(self._fetch_uid_with_retries, to_fetch))
+        )
+
     def ingest_from_seeds(self, seeds: Iterable[str], *, depth: int = 1) -> None:
         """Recursively ingest matches starting from the provided seed nicknames."""
 
-        queue = deque((seed, 0) for seed in seeds)
-        seen_nicknames: Set[str] = set()
-        while queue:
-            self._report(f"Ingest queue left: {len(queue)} users")
-            nickname, current_depth = queue.popleft()
-            if nickname in seen_nicknames:
-                continue
-            seen_nicknames.add(nickname)
-            uid = self._resolve_uid(nickname, None)
-            if uid is None:
+        # Deduplicate on enqueue so a nickname occupies at most one queue slot
+        # and the frontier, not the crawl history, bounds the queue size.
+        ordered_seeds = dict.fromkeys(seeds)
+        enqueued: Set[str] = set(ordered_seeds)
+        frontier: deque[tuple[str, int]] = deque((seed, 0) for seed in ordered_seeds)
+        # Entries parked in the store once the in-memory frontier is full.
+        # While any are parked, new entries go there too to keep BFS order.
+        spilled = 0
+        self.store.clear_pending_users()
+        try:
+            while frontier or spilled:
+                if not frontier:
+                    refill = self.store.pop_pending_users(self.max_queue_size)
+                    spilled = spilled - len(refill) if refill else 0
+                    frontier.extend(refill)
+                    continue
+                self._report("Ingest queue left: %d users", len(frontier))
+                if spilled:
+                    self._report("Spilled users waiting in store: %d", spilled)
+                nickname, current_depth = frontier.popleft()
+                uid = self._resolve_uid(nickname)
+                if uid is None:
+                    self._report(
+                        f"Skipping nickname '{nickname}'; could not resolve to uid"
+                    )
+                    continue
                 self._report(
-                    f"Skipping nickname '{nickname}'; could not resolve to uid"
+                    f"Ingesting nickname '{nickname}' (uid {uid}) at depth {current_depth}"
                 )
-                continue
-            self._report(
-                f"Ingesting nickname '{nickname}' (uid {uid}) at depth {current_depth}"
-            )
-            new_users = self.ingest_user(uid, seed_nickname=nickname)
-            self._report(
-                f"Discovered {len(new_users)} new users from nickname '{nickname}'"
-            )
-            if current_depth + 1 > depth:
-                continue
-            for next_user in new_users:
-                if next_user not in seen_nicknames:
-                    queue.append((next_user, current_depth + 1))
+                new_users = self.ingest_user(
+                    uid,
+                    seed_nickname=nickname,
+                    collect_nicknames=current_depth < depth,
+                )
+                self._report(
+                    f"Discovered {len(new_users)} new users from nickname '{nickname}'"
+                )
+                if current_depth + 1 > depth:
+                    continue
+                fresh = new_users - enqueued
+                enqueued |= fresh
+                next_depth = current_depth + 1
+                entries = [(next_user, next_depth) for next_user in fresh]
+                room = 0 if spilled else max(0, self.max_queue_size - len(frontier))
+                frontier.extend(entries[:room])
+                if len(entries) > room:
+                    self.store.push_pending_users(entries[room:])
+                    spilled += len(entries) - room
+        finally:
+            self._flush_last_checked()
 
     def _ingest_game_participants(
         self,
         game_id: Optional[int],
+        discovered: Set[str],
         *,
         already_known: bool = False,
         parquet_buffer: Optional[List[Dict[str, Any]]] = None,
-    ) -> Set[str]:
-        discovered, _, _ = self._ingest_game_participants_core(
+        collect_nicknames: bool = True,
+        fetch_result: Optional[Callable[[], Dict[str, Any]]] = None,
+        cached_count: Optional[int] = None,
+    ) -> None:
+        """Ingest a match's participants, adding their nicknames to ``discovered``."""
+
+        self._ingest_game_participants_core(
             game_id,
+            discovered,
             already_known=already_known,
             force_fetch=False,
             parquet_buffer=parquet_buffer,
+            fetch_result=fetch_result,
+            collect_nicknames=collect_nicknames,
+            cached_count=cached_count,
         )
-        return discovered
+
+    def _is_game_seen(self, game_id: int) -> bool:
+        if game_id in self._recent_games:
+            return True
+        if game_id not in self._seen_games:
+            return False
+        # Possible Bloom false positive: only trust it when the store already
+        # holds the participant list, otherwise process the game again.
+        return self.store.get_game_participant_count(game_id) > 1
+
+    def _mark_game_seen(self, game_id: int) -> None:
+        self._seen_games.add(game_id)
+        recent = self._recent_games
+        recent[game_id] = None
+        if len(recent) > RECENT_SEEN_GAMES:
+            del recent[next(iter(recent))]
 
     def _ingest_game_participants_core(
         self,
         game_id: Optional[int],
+        discovered: Set[str],
         *,
         already_known: bool,
         force_fetch: bool,
         parquet_buffer: Optional[List[Dict[str, Any]]] = None,
-    ) -> tuple[Set[str], bool, int]:
-        if not game_id or game_id in self._seen_games:
-            return set(), False, 0
+        fetch_result: Optional[Callable[[], Dict[str, Any]]] = None,
+        collect_nicknames: bool = True,
+        cached_count: Optional[int] = None,
+    ) -> tuple[bool, int]:
+        """Ingest one match's participants into the store.
+
+        Nicknames of stored participants are added to the caller's
+        ``discovered`` set. Returns ``(incomplete, participant_count)``.
+        """
+
+        if not game_id or self._is_game_seen(game_id):
+            return False, 0
         if self.store.is_game_deleted(game_id):
-            self._report(f"Skipping deleted game {game_id} participant fetch")
-            return set(), False, 0
-        self._seen_games.add(game_id)
+            self._report("Skipping deleted game %s participant fetch", game_id)
+            return False, 0
+        self._mark_game_seen(game_id)
         if already_known and not force_fetch:
-            cached_participants = self.store.get_participants_for_game(game_id)
-            if cached_participants and len(cached_participants) > 1:
+            if cached_count is None:
+                cached_count = self.store.get_game_participant_count(game_id)
+            if cached_count > 1:
                 self._report(
-                    f"Skipping API fetch for known game {game_id}; "
-                    f"loaded {len(cached_participants)} participants from cache"
+                    "Skipping API fetch for known game %s; "
+                    "%d participants already stored",
+                    game_id,
+                    cached_count,
                 )
-                cached_nicknames = {
-                    n
-                    for n in (
-                        self.store.get_latest_nickname_for_uid(uid)
-                        for uid in cached_participants
+                if collect_nicknames:
+                    nick_map = self.store.get_latest_nicknames_for_uids(
+                        self.store.get_participants_for_game(game_id)
                     )
-                    if isinstance(n, str) and n
-                }
-                return cached_nicknames, False, len(cached_participants)
-        payload = self.client.fetch_game_result(game_id)
+                    discovered.update(nick_map.values())
+                return False, cached_count
+        payload: Optional[Dict[str, Any]] = None
+        cache = self._game_result_cache
+        if cache is not None and not force_fetch:
+            payload = cache.get(game_id)
+        if payload is None:
+            if fetch_result is not None:
+                payload = fetch_result()
+            else:
+                payload = self.client.fetch_game_result(game_id)
+            if cache is not None:
+                cache.put(game_id, payload)
         participants = payload.get("userGames", [])
-        discovered: Set[str] = set()
         incomplete = False
+        prefetched = self._prefetch_nickname_uids(
+            [
+                nickname
+                for nickname, direct_uid in (
+                    (p.get("nickname"), extract_uid(p)) for p in participants
+                )
+                if type(nickname) is str and nickname and direct_uid is None
+            ]
+        )
+        resolved: List[Dict[str, Any]] = []
+        resolve_uid = self._resolve_uid_fast
+        needs_recheck = self._needs_uid_recheck
+        retry_attempts = self.participant_retry_attempts
+        started_iso = self._ingest_started_iso
         for participant in participants:
+            nickname = participant.get("nickname")
+            if type(nickname) is not str or not nickname:
+                # Retrying cannot resolve a participant without a nickname.
+                incomplete = True
+                continue
+            if not participant.get("startDtm"):
+                participant["startDtm"] = started_iso
+            direct_uid = extract_uid(participant)
+            if direct_uid is not None:
+                # The match payload already names the uid, so nickname
+                # resolution (and its API call) can be skipped entirely.
+                self._remember_nickname_uid(nickname, direct_uid)
+                participant["uid"] = direct_uid
+                resolved.append(participant)
+                continue
             success = False
-            for attempt in range(1, self.participant_retry_attempts + 1):
-                if not participant.get("startDtm"):
-                    participant["startDtm"] = self.ingest_started_at.isoformat()
-                uid = self._resolve_uid(
-                    participant.get("nickname", ""), participant.get("startDtm")
-                )
+            for attempt in range(1, retry_attempts + 1):
+                if attempt == 1 and nickname in prefetched:
+                    uid = prefetched.pop(nickname)
+                else:
+                    uid = resolve_uid(nickname)
                 if uid is None:
-                    if attempt < self.participant_retry_attempts:
-                        time.sleep(self.participant_retry_delay)
+                    if attempt < retry_attempts:
+                        time.sleep(
+                            self._backoff_delay(attempt, self.participant_retry_delay)
+                        )
                     continue
-                if self._needs_uid_recheck(uid):
+                if needs_recheck(uid):
                     try:
                         validated_uid = self._validate_uid(
                             uid,
-                            participant.get("nickname"),
+                            nickname,
                             allow_seed_recovery=False,
                         )
                     except Exception as exc:
@@ -583,28 +1100,52 @@ class IngestionManager:
                         break
                     uid = validated_uid
                 participant["uid"] = uid
-                try:
-                    self.store.upsert_from_game_payload(
-                        participant, mark_ingested=False
-                    )
-                    success = True
-                    self._queue_parquet_payload(participant, parquet_buffer)
-                    participant_nickname = participant.get("nickname")
-                    if isinstance(participant_nickname, str) and participant_nickname:
-                        discovered.add(participant_nickname)
-                    break
-                except ValueError as exc:
-                    self._report(
-                        f"Skipping participant attempt {attempt} for game {game_id} due to error: {exc}"
-                    )
-                    if attempt < self.participant_retry_attempts:
-                        time.sleep(self.participant_retry_delay)
+                resolved.append(participant)
+                success = True
+                break
             if not success:
                 incomplete = True
-        if incomplete and game_id is not None:
-            self.store.mark_game_incomplete(int(game_id))
-        self._report(f"Fetched {len(participants)} participants for game {game_id}")
-        return discovered, incomplete, len(participants)
+        written = self._write_participants(game_id, resolved)
+        if len(written) < len(resolved):
+            incomplete = True
+        for participant in written:
+            self._queue_parquet_payload(participant, parquet_buffer)
+            discovered.add(participant["nickname"])
+        if incomplete:
+            self.store.mark_game_incomplete(game_id)
+        self._report("Fetched %d participants for game %s", len(participants), game_id)
+        return incomplete, len(participants)
+
+    def _write_participants(
+        self, game_id: Optional[int], participants: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Upsert resolved participants, returning those that were stored.
+
+        The whole match goes through one bulk upsert; if that is rejected,
+        rows are retried one by one so a single bad payload only drops itself.
+        """
+
+        if not participants:
+            return []
+        try:
+            self.store.upsert_games_bulk(participants, mark_ingested=False)
+            return participants
+        except (ValueError, sqlite3.IntegrityError) as exc:
+            self._report(
+                f"Bulk participant upsert for game {game_id} failed ({exc}); "
+                "retrying per participant"
+            )
+        written: List[Dict[str, Any]] = []
+        for participant in participants:
+            try:
+                self.store.upsert_from_game_payload(participant, mark_ingested=False)
+            except (ValueError, sqlite3.IntegrityError) as exc:
+                self._report(
+                    f"Skipping participant {participant.get('nickname')} for game {game_id} due to error: {exc}"
+                )
+                continue
+            written.append(participant)
+        return written
 
     def _refetch_delay(self, attempts: int) -> dt.timedelta:
         base_days = 1
@@ -632,6 +1173,40 @@ class IngestionManager:
             last_error=error,
         )
 
+    def _iter_game_result_fetchers(
+        self, game_ids: Iterable[int]
+    ) -> Iterator[tuple[int, Callable[[], Dict[str, Any]]]]:
+        """Yield (game_id, fetch) pairs in input order.
+
+        With a fetch pool, results for the next few games are requested ahead
+        so network latency overlaps with the DB work done by the caller.
+        Errors surface when ``fetch`` is called, as with a direct request.
+        """
+
+        if self._fetch_pool is None:
+            for game_id in game_ids:
+                yield game_id, functools.partial(self.client.fetch_game_result, game_id)
+            return
+        lookahead = self.fetch_workers * 2
+        pending: deque[tuple[int, Future[Dict[str, Any]]]] = deque()
+        try:
+            for game_id in game_ids:
+                pending.append(
+                    (
+                        game_id,
+                        self._fetch_pool.submit(self.client.fetch_game_result, game_id),
+                    )
+                )
+                if len(pending) >= lookahead:
+                    ready_id, future = pending.popleft()
+                    yield ready_id, future.result
+            while pending:
+                ready_id, future = pending.popleft()
+                yield ready_id, future.result
+        finally:
+            for _, future in pending:
+                future.cancel()
+
     def refetch_incomplete_games(self, game_ids: Iterable[int]) -> dict[str, int]:
         """Refetch participant data for matches flagged as incomplete."""
 
@@ -642,38 +1217,41 @@ class IngestionManager:
             "empty": 0,
             "still_incomplete": 0,
         }
-        for game_id in game_ids:
+        for game_id, fetch_result in self._iter_game_result_fetchers(
+            int(value) for value in game_ids
+        ):
             stats["total"] += 1
             parquet_payloads: Optional[List[Dict[str, Any]]] = (
                 [] if self._parquet is not None else None
             )
             try:
                 with self.store.transaction():
-                    _, incomplete, participant_count = (
-                        self._ingest_game_participants_core(
-                            int(game_id),
-                            already_known=True,
-                            force_fetch=True,
-                            parquet_buffer=parquet_payloads,
-                        )
+                    incomplete, participant_count = self._ingest_game_participants_core(
+                        game_id,
+                        set(),
+                        already_known=True,
+                        force_fetch=True,
+                        parquet_buffer=parquet_payloads,
+                        fetch_result=fetch_result,
                     )
+                    self._flush_last_checked()
                     if participant_count == 0:
                         self._report(
                             f"Game {game_id} returned 0 participants; keeping incomplete flag"
                         )
                         self._record_refetch_failure(
-                            int(game_id),
+                            game_id,
                             status="error",
                             error="empty_participants",
                         )
                         stats["empty"] += 1
                     elif not incomplete:
-                        self.store.clear_game_incomplete(int(game_id))
-                        self.store.clear_refetch_status(int(game_id))
+                        self.store.clear_game_incomplete(game_id)
+                        self.store.clear_refetch_status(game_id)
                         stats["cleared"] += 1
                     else:
                         self._record_refetch_failure(
-                            int(game_id),
+                            game_id,
                             status="error",
                             error="incomplete_participants",
                         )
@@ -684,7 +1262,7 @@ class IngestionManager:
                         f"Game {game_id} returned 404; keeping incomplete flag"
                     )
                     self._record_refetch_failure(
-                        int(game_id),
+                        game_id,
                         status="missing",
                         error="http_404",
                     )
@@ -695,9 +1273,8 @@ class IngestionManager:
                         f"Game {game_id} failed due to unrecoverable HTTP 404: {exc}"
                     )
                 raise
-            if self._parquet is not None and parquet_payloads:
-                for participant in parquet_payloads:
-                    self._parquet.write_from_game_payload(participant)
+            if parquet_payloads:
+                self._write_parquet_payloads(parquet_payloads)
         return stats
 
 
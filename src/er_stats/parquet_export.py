@@ -10,13 +10,19 @@ efficient queries with engines like DuckDB.
 
 from __future__ import annotations
 
+import os
+import sys
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Optional, Set, Tuple, List, DefaultDict
-from collections import defaultdict
+from typing import Any, Dict, Iterable, Optional, Tuple, List, DefaultDict, Union
+from collections import OrderedDict, defaultdict
 
 import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
 
+from .bloom import RecentKeyBloomFilter
 from .db import extract_uid, parse_start_time
 
 # Fixed schemas to ensure consistent types across files
@@ -268,8 +274,18 @@ PARTICIPANT_SCHEMA = pa.schema(
     ]
 )
 
+# Parquet writer defaults. Zstd level 1 compresses about as fast as Snappy
+# with a better ratio. Dictionary encoding applies to every column (the
+# Arrow types stay plain, so readers see the same schema as before).
+DEFAULT_COMPRESSION = "zstd"
+DEFAULT_COMPRESSION_LEVEL = 1
+DEFAULT_DATA_PAGE_SIZE = 1 << 20
+
 
 def _safe_int(value: Any) -> Optional[int]:
+    # Decoded JSON numbers are already ints; only other inputs need coercion.
+    if type(value) is int:
+        return value
     try:
         if value is None:
             return None
@@ -279,6 +295,15 @@ def _safe_int(value: Any) -> Optional[int]:
 
 
 def _date_part(start_dtm: Optional[str]) -> Optional[str]:
+    # parse_start_time keeps the original offset, so a value that already
+    # starts with YYYY-MM-DD yields that same date without being parsed.
+    if (
+        type(start_dtm) is str
+        and len(start_dtm) >= 10
+        and start_dtm[4] == "-"
+        and start_dtm[7] == "-"
+    ):
+        return start_dtm[:10]
     iso = parse_start_time(start_dtm)
     if not iso:
         return None
@@ -286,6 +311,8 @@ def _date_part(start_dtm: Optional[str]) -> Optional[str]:
 
 
 def _safe_float(value: Any) -> Optional[float]:
+    if type(value) is float:
+        return value
     try:
         if value is None:
             return None
@@ -334,6 +361,411 @@ def _safe_map_list_int(value: Any) -> Optional[Dict[str, List[Optional[int]]]]:
         return None
 
 
+# Converter kinds used by ``_PARTICIPANT_FIELDS``.
+_INT = 0
+_FLOAT = 1
+_TEXT = 2  # str, with missing/empty values stored as ""
+_MAP = 3  # mapping, with empty values stored as null
+_LIST_INT = 4  # converted by _IntListColumn
+_STR = 5
+_BOOL = 6
+_TIMESTAMP = 7
+_MAP_LIST_INT = 8
+_RAW = 9  # stored unchanged
+
+# (column name, payload key, converter kind) for every participant column
+# that is derived from a single payload value, in schema order.
+_PARTICIPANT_FIELDS: Tuple[Tuple[str, str, int], ...] = (
+    ("nickname", "nickname", _STR),
+    ("character_num", "characterNum", _INT),
+    ("skin_code", "skinCode", _INT),
+    ("game_rank", "gameRank", _INT),
+    ("player_kill", "playerKill", _INT),
+    ("player_assistant", "playerAssistant", _INT),
+    ("monster_kill", "monsterKill", _INT),
+    ("mmr_loss_entry_cost", "mmrLossEntryCost", _INT),
+    ("victory", "victory", _INT),
+    ("play_time", "playTime", _INT),
+    ("duration", "duration", _INT),
+    ("damage_to_player", "damageToPlayer", _INT),
+    ("damage_from_player", "damageFromPlayer", _INT),
+    ("damage_from_monster", "damageFromMonster", _INT),
+    ("damage_to_monster", "damageToMonster", _INT),
+    ("damage_to_player_shield", "damageToPlayer_Shield", _INT),
+    ("character_level", "characterLevel", _INT),
+    ("best_weapon", "bestWeapon", _INT),
+    ("best_weapon_level", "bestWeaponLevel", _INT),
+    ("team_number", "teamNumber", _INT),
+    ("premade", "preMade", _INT),
+    ("pre_made", "preMade", _INT),
+    ("premade_matching_type", "premadeMatchingType", _INT),
+    ("language", "language", _TEXT),
+    ("is_ml_bot", "isMLBot", _INT),
+    ("mlbot", "mlbot", _INT),
+    ("bot_level", "botLevel", _INT),
+    ("season_id", "seasonId", _INT),
+    ("matching_mode", "matchingMode", _INT),
+    ("matching_team_mode", "matchingTeamMode", _INT),
+    ("server_name", "serverName", _TEXT),
+    ("watch_time", "watchTime", _INT),
+    ("total_time", "totalTime", _INT),
+    ("survivable_time", "survivableTime", _INT),
+    ("bot_added", "botAdded", _INT),
+    ("bot_remain", "botRemain", _INT),
+    ("restricted_area_accelerated", "restrictedAreaAccelerated", _INT),
+    ("safe_areas", "safeAreas", _INT),
+    ("team_kill", "teamKill", _INT),
+    ("total_field_kill", "totalFieldKill", _INT),
+    ("account_level", "accountLevel", _INT),
+    ("rank_point", "rankPoint", _INT),
+    ("mmr_avg", "mmrAvg", _INT),
+    ("match_size", "matchSize", _INT),
+    ("gained_normal_mmr_k_factor", "gainedNormalMmrKFactor", _FLOAT),
+    ("max_hp", "maxHp", _INT),
+    ("max_sp", "maxSp", _INT),
+    ("hp_regen", "hpRegen", _FLOAT),
+    ("sp_regen", "spRegen", _FLOAT),
+    ("attack_power", "attackPower", _INT),
+    ("defense", "defense", _INT),
+    ("attack_speed", "attackSpeed", _FLOAT),
+    ("move_speed", "moveSpeed", _FLOAT),
+    ("out_of_combat_move_speed", "outOfCombatMoveSpeed", _FLOAT),
+    ("sight_range", "sightRange", _FLOAT),
+    ("attack_range", "attackRange", _FLOAT),
+    ("critical_strike_chance", "criticalStrikeChance", _FLOAT),
+    ("critical_strike_damage", "criticalStrikeDamage", _FLOAT),
+    ("cool_down_reduction", "coolDownReduction", _FLOAT),
+    ("life_steal", "lifeSteal", _FLOAT),
+    ("normal_life_steal", "normalLifeSteal", _FLOAT),
+    ("skill_life_steal", "skillLifeSteal", _FLOAT),
+    ("amplifier_to_monster", "amplifierToMonster", _FLOAT),
+    ("trap_damage", "trapDamage", _FLOAT),
+    ("adaptive_force", "adaptiveForce", _INT),
+    ("adaptive_force_attack", "adaptiveForceAttack", _INT),
+    ("adaptive_force_amplify", "adaptiveForceAmplify", _INT),
+    ("skill_amp", "skillAmp", _INT),
+    ("heal_amount", "healAmount", _INT),
+    ("team_recover", "teamRecover", _INT),
+    ("bonus_coin", "bonusCoin", _INT),
+    ("gain_exp", "gainExp", _INT),
+    ("base_exp", "baseExp", _INT),
+    ("bonus_exp", "bonusExp", _INT),
+    ("killer_user_num", "killerUserNum", _INT),
+    ("killer", "killer", _TEXT),
+    ("kill_detail", "killDetail", _TEXT),
+    ("cause_of_death", "causeOfDeath", _TEXT),
+    ("place_of_death", "placeOfDeath", _TEXT),
+    ("killer_character", "killerCharacter", _TEXT),
+    ("killer_weapon", "killerWeapon", _TEXT),
+    ("killer_user_num2", "killerUserNum2", _INT),
+    ("killer_user_num3", "killerUserNum3", _INT),
+    ("fishing_count", "fishingCount", _INT),
+    ("use_emoticon_count", "useEmoticonCount", _INT),
+    ("expire_dtm", "expireDtm", _TIMESTAMP),
+    ("route_id_of_start", "routeIdOfStart", _INT),
+    ("route_slot_id", "routeSlotId", _INT),
+    ("place_of_start", "placeOfStart", _TEXT),
+    ("give_up", "giveUp", _INT),
+    ("team_spectator", "teamSpectator", _INT),
+    ("add_surveillance_camera", "addSurveillanceCamera", _INT),
+    ("add_telephoto_camera", "addTelephotoCamera", _INT),
+    ("remove_surveillance_camera", "removeSurveillanceCamera", _INT),
+    ("remove_telephoto_camera", "removeTelephotoCamera", _INT),
+    ("use_hyper_loop", "useHyperLoop", _INT),
+    ("use_security_console", "useSecurityConsole", _INT),
+    ("tactical_skill_group", "tacticalSkillGroup", _INT),
+    ("tactical_skill_level", "tacticalSkillLevel", _INT),
+    ("tactical_skill_use_count", "tacticalSkillUseCount", _INT),
+    ("trait_first_core", "traitFirstCore", _INT),
+    ("trait_first_sub", "traitFirstSub", _LIST_INT),
+    ("trait_second_sub", "traitSecondSub", _LIST_INT),
+    ("food_craft_count", "foodCraftCount", _LIST_INT),
+    ("total_vf_credits", "totalVFCredits", _LIST_INT),
+    ("actively_gained_credits", "activelyGainedCredits", _INT),
+    ("used_vf_credits", "usedVFCredits", _LIST_INT),
+    ("sum_used_vf_credits", "sumUsedVFCredits", _INT),
+    ("total_use_vf_credit", "totalUseVFCredit", _INT),
+    ("credit_revival_count", "creditRevivalCount", _INT),
+    ("credit_revived_others_count", "creditRevivedOthersCount", _INT),
+    ("total_gain_vf_credit", "totalGainVFCredit", _INT),
+    ("craft_mythic", "craftMythic", _INT),
+    ("player_deaths", "playerDeaths", _INT),
+    ("kill_gamma", "killGamma", _BOOL),
+    ("scored_point", "scoredPoint", _LIST_INT),
+    ("kill_details", "killDetails", _TEXT),
+    ("death_details", "deathDetails", _TEXT),
+    ("kills_phase_one", "killsPhaseOne", _INT),
+    ("kills_phase_two", "killsPhaseTwo", _INT),
+    ("kills_phase_three", "killsPhaseThree", _INT),
+    ("deaths_phase_one", "deathsPhaseOne", _INT),
+    ("deaths_phase_two", "deathsPhaseTwo", _INT),
+    ("deaths_phase_three", "deathsPhaseThree", _INT),
+    ("used_pair_loop", "usedPairLoop", _INT),
+    ("cc_time_to_player", "ccTimeToPlayer", _FLOAT),
+    ("used_normal_heal_pack", "usedNormalHealPack", _INT),
+    ("used_reinforced_heal_pack", "usedReinforcedHealPack", _INT),
+    ("used_normal_shield_pack", "usedNormalShieldPack", _INT),
+    ("used_reinforce_shield_pack", "usedReinforceShieldPack", _INT),
+    ("item_transferred_console", "itemTransferredConsole", _LIST_INT),
+    ("item_transferred_drone", "itemTransferredDrone", _LIST_INT),
+    ("collect_item_for_log", "collectItemForLog", _LIST_INT),
+    ("bought_infusion", "boughtInfusion", _STR),
+    ("kiosk_exchange_credit", "kioskExchangeCredit", _INT),
+    ("tree_of_life_spawn", "treeOfLifeSpawn", _INT),
+    ("use_gadget", "useGadget", _MAP),
+    ("use_guide_robot", "useGuideRobot", _INT),
+    ("guide_robot_radial", "guideRobotRadial", _INT),
+    ("guide_robot_flag_ship", "guideRobotFlagShip", _INT),
+    ("guide_robot_signature", "guideRobotSignature", _INT),
+    ("use_recon_drone", "useReconDrone", _INT),
+    ("use_emp_drone", "useEmpDrone", _INT),
+    ("active_installation", "activeInstallation", _MAP),
+    ("get_bori_reward", "getBoriReward", _MAP),
+    ("except_pre_made_team", "exceptPreMadeTeam", _RAW),
+    ("squad_rumble_rank", "squadRumbleRank", _INT),
+    ("view_contribution", "viewContribution", _INT),
+    ("break_count", "breakCount", _INT),
+    ("escape_state", "escapeState", _INT),
+    ("mastery_level", "masteryLevel", _MAP),
+    ("equipment_map", "equipment", _MAP),
+    ("equipment_grade_map", "equipmentGrade", _MAP),
+    ("skill_level_info", "skillLevelInfo", _MAP),
+    ("skill_order_info", "skillOrderInfo", _MAP),
+    ("kill_monsters", "killMonsters", _MAP),
+    ("credit_source", "creditSource", _MAP),
+    ("event_mission_result", "eventMissionResult", _MAP),
+    ("equip_first_item_for_log", "equipFirstItemForLog", _MAP_LIST_INT),
+    ("cr_use_remote_drone", "crUseRemoteDrone", _INT),
+    ("cr_use_upgrade_tactical_skill", "crUseUpgradeTacticalSkill", _INT),
+    ("cr_use_tree_of_life", "crUseTreeOfLife", _INT),
+    ("cr_use_meteorite", "crUseMeteorite", _INT),
+    ("cr_use_mythril", "crUseMythril", _INT),
+    ("cr_use_force_core", "crUseForceCore", _INT),
+    ("cr_use_vf_blood_sample", "crUseVFBloodSample", _INT),
+    ("cr_use_activation_module", "crUseActivationModule", _INT),
+    ("cr_use_rootkit", "crUseRootkit", _INT),
+    ("cr_get_animal", "crGetAnimal", _INT),
+    ("cr_get_mutant", "crGetMutant", _INT),
+    ("cr_get_phase_start", "crGetPhaseStart", _INT),
+    ("cr_get_kill", "crGetKill", _INT),
+    ("cr_get_assist", "crGetAssist", _INT),
+    ("cr_get_time_elapsed", "crGetTimeElapsed", _INT),
+    ("cr_get_credit_bonus", "crGetCreditBonus", _INT),
+    ("cr_get_by_guide_robot", "crGetByGuideRobot", _INT),
+    ("team_elimination", "teamElimination", _INT),
+    ("team_down", "teamDown", _INT),
+    ("team_battle_zone_down", "teamBattleZoneDown", _INT),
+    ("team_repeat_down", "teamRepeatDown", _INT),
+    ("team_down_can_not_eliminate", "teamDownCanNotEliminate", _INT),
+    ("team_down_can_eliminate", "teamDownCanEliminate", _INT),
+    ("team_repeat_down_can_not_eliminate", "teamRepeatDownCanNotEliminate", _INT),
+    ("team_repeat_down_can_eliminate", "teamRepeatDownCanEliminate", _INT),
+    ("terminate_count", "terminateCount", _INT),
+    ("terminate_count_can_not_eliminate", "terminateCountCanNotEliminate", _INT),
+    ("clutch_count", "clutchCount", _INT),
+    ("total_tk_per_min", "totalTKPerMin", _LIST_INT),
+    ("enter_dimension_rift", "enterDimensionRift", _INT),
+    ("enter_dimension_empowered_rift", "enterDimensionEmpoweredRift", _INT),
+    ("enter_turbulent_rift", "enterTurbulentRift", _INT),
+    ("win_from_dimension_rift", "winFromDimensionRift", _INT),
+    ("win_from_dimension_empowered_rift", "winFromDimensionEmpoweredRift", _INT),
+    ("item_shredder_gain_vf_credit", "itemShredderGainVFCredit", _INT),
+    ("remote_drone_use_vf_credit_my_self", "remoteDroneUseVFCreditMySelf", _INT),
+    ("remote_drone_use_vf_credit_ally", "remoteDroneUseVFCreditAlly", _INT),
+    ("kiosk_from_material_use_vf_credit", "kioskFromMaterialUseVFCredit", _INT),
+    ("kiosk_from_escape_key_use_vf_credit", "kioskFromEscapeKeyUseVFCredit", _INT),
+    ("kiosk_from_revival_use_vf_credit", "kioskFromRevivalUseVFCredit", _INT),
+    ("tactical_skill_upgrade_use_vf_credit", "tacticalSkillUpgradeUseVFCredit", _INT),
+    ("infusion_re_roll_use_vf_credit", "infusionReRollUseVFCredit", _INT),
+    ("infusion_trait_use_vf_credit", "infusionTraitUseVFCredit", _INT),
+    ("infusion_relic_use_vf_credit", "infusionRelicUseVFCredit", _INT),
+    ("infusion_store_use_vf_credit", "infusionStoreUseVFCredit", _INT),
+    ("get_buff_cube_red", "getBuffCubeRed", _INT),
+    ("get_buff_cube_purple", "getBuffCubePurple", _INT),
+    ("get_buff_cube_green", "getBuffCubeGreen", _INT),
+    ("get_buff_cube_gold", "getBuffCubeGold", _INT),
+    ("get_buff_cube_sky_blue", "getBuffCubeSkyBlue", _INT),
+    ("sum_get_buff_cube", "sumGetBuffCube", _INT),
+    ("using_default_game_option", "usingDefaultGameOption", _BOOL),
+    ("reunited_count", "reunitedCount", _INT),
+    ("time_spent_in_briefing_room", "timeSpentInBriefingRoom", _INT),
+    ("main_weather", "mainWeather", _INT),
+    ("sub_weather", "subWeather", _INT),
+    ("total_turbine_take_over", "totalTurbineTakeOver", _INT),
+    ("equipment_raw", "equipment", _MAP),
+)
+
+
+# Sizing of the Bloom filters that de-duplicate exported matches/participants.
+SEEN_ROWS_INITIAL_CAPACITY = 100_000
+SEEN_ROWS_ERROR_RATE = 1e-6
+# Recent keys answered exactly, ahead of the Bloom filter.
+SEEN_ROWS_RECENT_KEYS = 200_000
+# Parquet writers kept open at once; the least recently used is closed.
+DEFAULT_MAX_OPEN_WRITERS = 64
+
+PartitionKey = Tuple[Optional[int], str, Optional[int], Optional[str]]
+
+
+class _Int64Column:
+    """Int64 column packed into a machine array with a byte-per-row validity mask.
+
+    Values are stored unboxed while buffered and handed to Arrow without a
+    per-element conversion pass when the column is flushed.
+    """
+
+    __slots__ = ("values", "valid")
+
+    def __init__(self) -> None:
+        self.values = array("q")
+        self.valid = bytearray()
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def append(self, value: Optional[int]) -> None:
+        if value is not None:
+            try:
+                self.values.append(value)
+            except (OverflowError, TypeError):
+                pass
+            else:
+                self.valid.append(1)
+                return
+        self.values.append(0)
+        self.valid.append(0)
+
+    def to_arrow(self, type_: pa.DataType) -> pa.Array:
+        validity = None
+        if 0 in self.valid:
+            validity = pc.not_equal(_flag_array(self.valid), 0).buffers()[1]
+        return pa.Array.from_buffers(
+            type_, len(self.values), [validity, pa.py_buffer(self.values)]
+        )
+
+
+class _MapColumn:
+    """Scalar-valued map column kept as flat keys/items plus int32 offsets.
+
+    The MapArray is assembled from the flat lists at flush, so Arrow never
+    walks a dict per row.
+    """
+
+    __slots__ = ("offsets", "keys", "items", "valid")
+
+    def __init__(self) -> None:
+        self.offsets = array("i", [0])
+        self.keys: List[Any] = []
+        self.items: List[Any] = []
+        self.valid = bytearray()
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    def append(self, value: Optional[Dict[str, Any]]) -> None:
+        if isinstance(value, dict) and value:
+            self.keys.extend(value)
+            self.items.extend(value.values())
+            self.valid.append(1)
+        else:
+            self.valid.append(0)
+        self.offsets.append(len(self.keys))
+
+    def to_arrow(self, type_: pa.DataType) -> pa.Array:
+        mask = None
+        if 0 in self.valid:
+            mask = pc.equal(_flag_array(self.valid), 0)
+        return pa.MapArray.from_arrays(
+            pa.Array.from_buffers(
+                pa.int32(), len(self.offsets), [None, pa.py_buffer(self.offsets)]
+            ),
+            pa.array(self.keys, type=type_.key_type),
+            pa.array(self.items, type=type_.item_type),
+            type=type_,
+            mask=mask,
+        )
+
+
+class _IntListColumn:
+    """list<int64> column kept as one flat value list plus int32 offsets.
+
+    Elements are converted by a single ``pa.array`` call over the whole
+    batch; only when that fails does the batch fall back to ``_safe_int``
+    per element, matching ``_safe_list_int``.
+    """
+
+    __slots__ = ("offsets", "flat", "valid")
+
+    def __init__(self) -> None:
+        self.offsets = array("i", [0])
+        self.flat: List[Any] = []
+        self.valid = bytearray()
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    def append(self, value: Any) -> None:
+        if type(value) is not list and value is not None:
+            value = _safe_list_int(value)
+        if value is None:
+            self.valid.append(0)
+        else:
+            self.flat.extend(value)
+            self.valid.append(1)
+        self.offsets.append(len(self.flat))
+
+    def to_arrow(self, type_: pa.DataType) -> pa.Array:
+        try:
+            values = pa.array(self.flat, type=type_.value_type)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError):
+            values = pa.array([_safe_int(v) for v in self.flat], type=type_.value_type)
+        mask = None
+        if 0 in self.valid:
+            mask = pc.equal(_flag_array(self.valid), 0)
+        return pa.ListArray.from_arrays(
+            pa.Array.from_buffers(
+                pa.int32(), len(self.offsets), [None, pa.py_buffer(self.offsets)]
+            ),
+            values,
+            type=type_,
+            mask=mask,
+        )
+
+
+def _flag_array(flags: bytearray) -> pa.Array:
+    """View a byte-per-row 0/1 buffer as an int8 Arrow array without copying."""
+
+    return pa.Array.from_buffers(pa.int8(), len(flags), [None, pa.py_buffer(flags)])
+
+
+Column = Union[List[Any], _Int64Column, _MapColumn, _IntListColumn]
+ColumnBuffer = Dict[str, Column]
+
+
+def _new_column(type_: pa.DataType) -> Column:
+    if type_ == pa.int64():
+        return _Int64Column()
+    if type_ == pa.list_(pa.int64()):
+        return _IntListColumn()
+    if pa.types.is_map(type_) and not pa.types.is_list(type_.item_type):
+        return _MapColumn()
+    return []
+
+
+def _new_column_buffer(schema: pa.Schema) -> ColumnBuffer:
+    # Columns grow on demand rather than being preallocated to flush_rows:
+    # most partitions are flushed by the buffered-row cap or close() long
+    # before they fill, and a preallocated slot per column per open
+    # partition would cost far more memory than amortized growth costs time.
+    return {field.name: _new_column(field.type) for field in schema}
+
+
+def _column_to_arrow(values: Column, type_: pa.DataType) -> pa.Array:
+    if isinstance(values, list):
+        return pa.array(values, type=type_)
+    return values.to_arrow(type_)
+
+
 class ParquetExporter:
     """Export match and participant rows to Parquet datasets."""
 
@@ -342,29 +774,71 @@ class ParquetExporter:
         base_dir: Path,
         *,
         flush_rows: int = 10000,
-        compression: Optional[str] = None,
+        compression: Optional[str] = DEFAULT_COMPRESSION,
+        compression_level: Optional[int] = DEFAULT_COMPRESSION_LEVEL,
+        use_dictionary: Union[bool, List[str]] = True,
+        data_page_size: int = DEFAULT_DATA_PAGE_SIZE,
+        max_buffered_rows: int = 200000,
+        flush_workers: Optional[int] = None,
+        max_open_writers: int = DEFAULT_MAX_OPEN_WRITERS,
     ) -> None:
         self.base_dir = Path(base_dir)
         self.matches_root = self.base_dir / "matches"
         self.participants_root = self.base_dir / "participants"
         self.matches_root.mkdir(parents=True, exist_ok=True)
         self.participants_root.mkdir(parents=True, exist_ok=True)
-        self._seen_matches: Set[int] = set()
-        self._seen_participants: Set[Tuple[int, str]] = set()
+        # Bloom filters keep dedup memory small over long crawls. A false
+        # positive (rate below SEEN_ROWS_ERROR_RATE) leaves that row out of
+        # the Parquet export only; SQLite still stores it.
+        self._seen_matches = RecentKeyBloomFilter(
+            SEEN_ROWS_INITIAL_CAPACITY,
+            error_rate=SEEN_ROWS_ERROR_RATE,
+            recent_keys=SEEN_ROWS_RECENT_KEYS,
+        )
+        self._seen_participants = RecentKeyBloomFilter(
+            SEEN_ROWS_INITIAL_CAPACITY,
+            error_rate=SEEN_ROWS_ERROR_RATE,
+            recent_keys=SEEN_ROWS_RECENT_KEYS,
+        )
         self._flush_rows = int(flush_rows)
         self._compression = compression
-        # Buffers keyed by (season_id, server_name, matching_mode, date)
-        self._buf_matches: DefaultDict[
-            Tuple[Optional[int], str, Optional[int], Optional[str]],
-            List[Dict[str, Any]],
-        ] = defaultdict(list)
-        self._buf_participants: DefaultDict[
-            Tuple[Optional[int], str, Optional[int], Optional[str]],
-            List[Dict[str, Any]],
-        ] = defaultdict(list)
-        self._file_counters: DefaultDict[
-            Tuple[Optional[int], str, Optional[int], Optional[str]], int
-        ] = defaultdict(int)
+        # Levels only apply to codecs that have them (not snappy/none).
+        self._compression_level = (
+            compression_level
+            if compression and pa.Codec.supports_compression_level(compression)
+            else None
+        )
+        self._use_dictionary = use_dictionary
+        self._data_page_size = int(data_page_size)
+        # Cap on participant rows buffered across all partitions; beyond it
+        # the largest partition is flushed early.
+        self._max_buffered_rows = int(max_buffered_rows)
+        self._buffered_participants = 0
+        # Column-oriented buffers keyed by (season_id, server_name,
+        # matching_mode, date); each maps a schema field name to its values.
+        self._buf_matches: Dict[PartitionKey, ColumnBuffer] = {}
+        self._buf_participants: Dict[PartitionKey, ColumnBuffer] = {}
+        self._file_counters: DefaultDict[PartitionKey, int] = defaultdict(int)
+        # One open writer per (dataset prefix, partition); each flush becomes
+        # a row group. At most ``max_open_writers`` stay open: the least
+        # recently used is closed (footer written, file readable) and its
+        # partition's next flush starts a new part file.
+        self._max_open_writers = max(1, int(max_open_writers))
+        self._writers: OrderedDict[Tuple[str, PartitionKey], pq.ParquetWriter] = (
+            OrderedDict()
+        )
+        # Row-group writes run on a thread pool (Arrow encodes and compresses
+        # without the GIL); at most one write per writer is in flight.
+        if flush_workers is None:
+            flush_workers = os.cpu_count() or 1
+        self._flush_workers = max(1, int(flush_workers))
+        self._flush_pool: Optional[ThreadPoolExecutor] = None
+        if self._flush_workers > 1:
+            self._flush_pool = ThreadPoolExecutor(
+                max_workers=self._flush_workers,
+                thread_name_prefix="er-stats-parquet-flush",
+            )
+        self._pending_writes: Dict[Tuple[str, PartitionKey], Future[None]] = {}
 
     def _partition_dir(self, root: Path, row: Dict[str, Any]) -> Path:
         def as_str(v: Any) -> str:
@@ -382,19 +856,18 @@ class ParquetExporter:
         d.mkdir(parents=True, exist_ok=True)
         return d
 
-    def _partition_key(
-        self, game: Dict[str, Any]
-    ) -> Tuple[Optional[int], str, Optional[int], Optional[str]]:
+    def _partition_key(self, game: Dict[str, Any]) -> PartitionKey:
+        # Interned components keep one shared string object (and its cached
+        # hash) per server/date across all buffered keys.
+        date = _date_part(game.get("startDtm"))
         return (
             _safe_int(game.get("seasonId")),
-            str(game.get("serverName") or ""),
+            sys.intern(str(game.get("serverName") or "")),
             _safe_int(game.get("matchingMode")),
-            _date_part(game.get("startDtm")),
+            sys.intern(date) if date is not None else None,
         )
 
-    def _dir_from_key(
-        self, root: Path, key: Tuple[Optional[int], str, Optional[int], Optional[str]]
-    ) -> Path:
+    def _dir_from_key(self, root: Path, key: PartitionKey) -> Path:
         season_id, server_name, matching_mode, date = key
         parts = {
             "season_id": season_id,
@@ -407,7 +880,7 @@ class ParquetExporter:
     def write_from_game_payload(self, game: Dict[str, Any]) -> None:
         """Write both match and participant row(s) from a single userGame payload.
 
-        De-duplicates using in-memory sets to avoid writing the same match or
+        De-duplicates using in-memory Bloom filters to avoid writing the same match or
         participant twice across pages and seed/participants flows.
         """
 
@@ -419,425 +892,263 @@ class ParquetExporter:
         key = self._partition_key(game)
 
         # Participant buffer
-        self._enqueue_participant(game)
+        self._enqueue_participant(game, key, game_id, uid)
 
         # Then the match one-liner (only once per game_id)
         if game_id not in self._seen_matches:
             self._seen_matches.add(game_id)
-            self._enqueue_match(game, key)
+            self._enqueue_match(game, key, game_id)
+
+    def write_from_game_payloads(self, games: Iterable[Dict[str, Any]]) -> None:
+        """Write a batch of userGame payloads; see ``write_from_game_payload``."""
+
+        write = self.write_from_game_payload
+        for game in games:
+            write(game)
 
     def _enqueue_match(
         self,
         game: Dict[str, Any],
-        key: Tuple[Optional[int], str, Optional[int], Optional[str]],
+        key: PartitionKey,
+        game_id: int,
     ) -> None:
-        row = {
-            "game_id": _safe_int(game.get("gameId")),
-            "season_id": _safe_int(game.get("seasonId")),
-            "matching_mode": _safe_int(game.get("matchingMode")),
-            "matching_team_mode": _safe_int(game.get("matchingTeamMode")),
-            "version_season": _safe_int(game.get("versionSeason")),
-            "version_major": _safe_int(game.get("versionMajor")),
-            "version_minor": _safe_int(game.get("versionMinor")),
-            "start_dtm": parse_start_time(game.get("startDtm")),
-            "server_name": str(game.get("serverName") or ""),
-        }
-        self._buf_matches[key].append(row)
-        if len(self._buf_matches[key]) >= self._flush_rows:
-            self._flush_partition(
-                self.matches_root,
-                key,
-                self._buf_matches[key],
-                MATCH_SCHEMA,
-                prefix="matches",
-            )
-            self._buf_matches[key].clear()
+        # One append per MATCH_SCHEMA column; no intermediate row dict.
+        # Season, mode and server were already normalized into the key.
+        season_id, server_name, matching_mode, _ = key
+        columns = self._columns_for(self._buf_matches, key, MATCH_SCHEMA)
+        get = game.get
+        columns["game_id"].append(game_id)
+        columns["season_id"].append(season_id)
+        columns["matching_mode"].append(matching_mode)
+        columns["matching_team_mode"].append(_safe_int(get("matchingTeamMode")))
+        columns["version_season"].append(_safe_int(get("versionSeason")))
+        columns["version_major"].append(_safe_int(get("versionMajor")))
+        columns["version_minor"].append(_safe_int(get("versionMinor")))
+        columns["start_dtm"].append(parse_start_time(get("startDtm")))
+        columns["server_name"].append(server_name)
+        self._flush_if_full(
+            self._buf_matches, key, self.matches_root, MATCH_SCHEMA, "matches"
+        )
 
-    def _enqueue_participant(self, game: Dict[str, Any]) -> None:
-        game_id = _safe_int(game.get("gameId"))
-        uid = extract_uid(game)
-        if game_id is None or uid is None:
-            return
-        dup_key = (game_id, uid)
+    def _enqueue_participant(
+        self,
+        game: Dict[str, Any],
+        key: PartitionKey,
+        game_id: int,
+        uid: str,
+    ) -> None:
+        dup_key = f"{game_id}:{uid}"
         if dup_key in self._seen_participants:
             return
         self._seen_participants.add(dup_key)
 
-        row = {
-            # Identifiers
-            "game_id": game_id,
-            "uid": _safe_str(uid),
-            "nickname": _safe_str(game.get("nickname")),
-            # Core stats mirrored from the SQLite schema along with key combat totals
-            "character_num": _safe_int(game.get("characterNum")),
-            "skin_code": _safe_int(game.get("skinCode")),
-            "game_rank": _safe_int(game.get("gameRank")),
-            "player_kill": _safe_int(game.get("playerKill")),
-            "player_assistant": _safe_int(game.get("playerAssistant")),
-            "monster_kill": _safe_int(game.get("monsterKill")),
-            "mmr_gain": _safe_int(
-                game.get("mmrGain")
-                if game.get("mmrGain") is not None
-                else game.get("mmrGainInGame")
-            ),
-            "mmr_loss_entry_cost": _safe_int(game.get("mmrLossEntryCost")),
-            "victory": _safe_int(game.get("victory")),
-            "play_time": _safe_int(game.get("playTime")),
-            "duration": _safe_int(game.get("duration")),
-            "damage_to_player": _safe_int(game.get("damageToPlayer")),
-            "damage_from_player": _safe_int(game.get("damageFromPlayer")),
-            "damage_from_monster": _safe_int(game.get("damageFromMonster")),
-            "damage_to_monster": _safe_int(game.get("damageToMonster")),
-            "damage_to_player_shield": _safe_int(game.get("damageToPlayer_Shield")),
-            "heal_amount": _safe_int(game.get("healAmount")),
-            "team_recover": _safe_int(game.get("teamRecover")),
-            "character_level": _safe_int(game.get("characterLevel")),
-            "best_weapon": _safe_int(game.get("bestWeapon")),
-            "best_weapon_level": _safe_int(game.get("bestWeaponLevel")),
-            "team_number": _safe_int(game.get("teamNumber")),
-            "premade": _safe_int(game.get("preMade")),
-            "pre_made": _safe_int(game.get("preMade")),
-            "premade_matching_type": _safe_int(game.get("premadeMatchingType")),
-            "language": str(game.get("language") or ""),
-            "season_id": _safe_int(game.get("seasonId")),
-            "matching_mode": _safe_int(game.get("matchingMode")),
-            "matching_team_mode": _safe_int(game.get("matchingTeamMode")),
-            "server_name": str(game.get("serverName") or ""),
-        }
+        columns = self._columns_for(self._buf_participants, key, PARTICIPANT_SCHEMA)
+        get = game.get
+        # Module-level names are bound locally once so the per-field loop
+        # below pays LOAD_FAST instead of LOAD_GLOBAL for each of them.
+        safe_int = _safe_int
+        safe_float = _safe_float
+        safe_str = _safe_str
+        int_kind, float_kind, text_kind, map_kind = _INT, _FLOAT, _TEXT, _MAP
+        str_kind, bool_kind, timestamp_kind = _STR, _BOOL, _TIMESTAMP
+        # Values stream straight into the column buffers; ones that already
+        # have the target type skip the exception-guarded converters.
+        for name, source, kind in _PARTICIPANT_FIELDS:
+            value = get(source)
+            if kind == int_kind:
+                if value is not None and type(value) is not int:
+                    value = safe_int(value)
+            elif kind == float_kind:
+                if value is not None and type(value) is not float:
+                    value = safe_float(value)
+            elif kind == text_kind:
+                if type(value) is not str:
+                    value = str(value or "")
+            elif kind == map_kind:
+                if not value:
+                    value = None
+            elif kind == str_kind:
+                if value is not None and type(value) is not str:
+                    value = safe_str(value)
+            elif kind == bool_kind:
+                if value is not None:
+                    value = bool(value)
+            elif kind == timestamp_kind:
+                value = parse_start_time(value)
+            elif kind == _MAP_LIST_INT:
+                value = _safe_map_list_int(value)
+            columns[name].append(value)
+
+        columns["game_id"].append(game_id)
+        columns["uid"].append(uid)
+        mmr_gain = get("mmrGain")
+        if mmr_gain is None:
+            mmr_gain = get("mmrGainInGame")
+        columns["mmr_gain"].append(safe_int(mmr_gain))
         # ML bot flag may be present under different keys; standardize to int 0/1
-        ml_bot_flag = game.get("mlbot")
+        ml_bot_flag = get("mlbot")
         if ml_bot_flag is None:
-            ml_bot_flag = game.get("isMLBot")
-        row["ml_bot"] = int(bool(ml_bot_flag)) if ml_bot_flag is not None else 0
-        row["is_ml_bot"] = _safe_int(game.get("isMLBot"))
-        row["mlbot"] = _safe_int(game.get("mlbot"))
-        row["bot_level"] = _safe_int(game.get("botLevel"))
+            ml_bot_flag = get("isMLBot")
+        columns["ml_bot"].append(
+            int(bool(ml_bot_flag)) if ml_bot_flag is not None else 0
+        )
         # Leaving flag may appear with different casing; prioritize any True
         leave_flags = [
-            game.get("isLeavingBeforeCreditRevivalTerminate"),
-            game.get("IsLeavingBeforeCreditRevivalTerminate"),
+            get("isLeavingBeforeCreditRevivalTerminate"),
+            get("IsLeavingBeforeCreditRevivalTerminate"),
         ]
         leave_value = None
         if any(flag is True for flag in leave_flags):
             leave_value = True
         elif any(flag is False for flag in leave_flags):
             leave_value = False
-        row["is_leaving_before_credit_revival_terminate"] = leave_value
-
-        # Extended scalar stats
-        row.update(
-            {
-                "watch_time": _safe_int(game.get("watchTime")),
-                "total_time": _safe_int(game.get("totalTime")),
-                "survivable_time": _safe_int(game.get("survivableTime")),
-                "bot_added": _safe_int(game.get("botAdded")),
-                "bot_remain": _safe_int(game.get("botRemain")),
-                "restricted_area_accelerated": _safe_int(
-                    game.get("restrictedAreaAccelerated")
-                ),
-                "safe_areas": _safe_int(game.get("safeAreas")),
-                "team_kill": _safe_int(game.get("teamKill")),
-                "total_field_kill": _safe_int(game.get("totalFieldKill")),
-                "account_level": _safe_int(game.get("accountLevel")),
-                "rank_point": _safe_int(game.get("rankPoint")),
-                "mmr_avg": _safe_int(game.get("mmrAvg")),
-                "match_size": _safe_int(game.get("matchSize")),
-                "gained_normal_mmr_k_factor": _safe_float(
-                    game.get("gainedNormalMmrKFactor")
-                ),
-                # Combat
-                "max_hp": _safe_int(game.get("maxHp")),
-                "max_sp": _safe_int(game.get("maxSp")),
-                "hp_regen": _safe_float(game.get("hpRegen")),
-                "sp_regen": _safe_float(game.get("spRegen")),
-                "attack_power": _safe_int(game.get("attackPower")),
-                "defense": _safe_int(game.get("defense")),
-                "attack_speed": _safe_float(game.get("attackSpeed")),
-                "move_speed": _safe_float(game.get("moveSpeed")),
-                "out_of_combat_move_speed": _safe_float(
-                    game.get("outOfCombatMoveSpeed")
-                ),
-                "sight_range": _safe_float(game.get("sightRange")),
-                "attack_range": _safe_float(game.get("attackRange")),
-                "critical_strike_chance": _safe_float(game.get("criticalStrikeChance")),
-                "critical_strike_damage": _safe_float(game.get("criticalStrikeDamage")),
-                "cool_down_reduction": _safe_float(game.get("coolDownReduction")),
-                "life_steal": _safe_float(game.get("lifeSteal")),
-                "normal_life_steal": _safe_float(game.get("normalLifeSteal")),
-                "skill_life_steal": _safe_float(game.get("skillLifeSteal")),
-                "amplifier_to_monster": _safe_float(game.get("amplifierToMonster")),
-                "trap_damage": _safe_float(game.get("trapDamage")),
-                "adaptive_force": _safe_int(game.get("adaptiveForce")),
-                "adaptive_force_attack": _safe_int(game.get("adaptiveForceAttack")),
-                "adaptive_force_amplify": _safe_int(game.get("adaptiveForceAmplify")),
-                "skill_amp": _safe_int(game.get("skillAmp")),
-                # Event
-                "bonus_coin": _safe_int(game.get("bonusCoin")),
-                "gain_exp": _safe_int(game.get("gainExp")),
-                "base_exp": _safe_int(game.get("baseExp")),
-                "bonus_exp": _safe_int(game.get("bonusExp")),
-                "killer_user_num": _safe_int(game.get("killerUserNum")),
-                "killer": str(game.get("killer") or ""),
-                "kill_detail": str(game.get("killDetail") or ""),
-                "cause_of_death": str(game.get("causeOfDeath") or ""),
-                "place_of_death": str(game.get("placeOfDeath") or ""),
-                "killer_character": str(game.get("killerCharacter") or ""),
-                "killer_weapon": str(game.get("killerWeapon") or ""),
-                "killer_user_num2": _safe_int(game.get("killerUserNum2")),
-                "killer_user_num3": _safe_int(game.get("killerUserNum3")),
-                "fishing_count": _safe_int(game.get("fishingCount")),
-                "use_emoticon_count": _safe_int(game.get("useEmoticonCount")),
-                "expire_dtm": parse_start_time(game.get("expireDtm")),
-                "route_id_of_start": _safe_int(game.get("routeIdOfStart")),
-                "route_slot_id": _safe_int(game.get("routeSlotId")),
-                "place_of_start": str(game.get("placeOfStart") or ""),
-                "give_up": _safe_int(game.get("giveUp")),
-                "team_spectator": _safe_int(game.get("teamSpectator")),
-                "add_surveillance_camera": _safe_int(game.get("addSurveillanceCamera")),
-                "add_telephoto_camera": _safe_int(game.get("addTelephotoCamera")),
-                "remove_surveillance_camera": _safe_int(
-                    game.get("removeSurveillanceCamera")
-                ),
-                "remove_telephoto_camera": _safe_int(game.get("removeTelephotoCamera")),
-                "use_hyper_loop": _safe_int(game.get("useHyperLoop")),
-                "use_security_console": _safe_int(game.get("useSecurityConsole")),
-                "tactical_skill_group": _safe_int(game.get("tacticalSkillGroup")),
-                "tactical_skill_level": _safe_int(game.get("tacticalSkillLevel")),
-                "tactical_skill_use_count": _safe_int(
-                    game.get("tacticalSkillUseCount")
-                ),
-                "trait_first_core": _safe_int(game.get("traitFirstCore")),
-                "trait_first_sub": _safe_list_int(game.get("traitFirstSub")),
-                "trait_second_sub": _safe_list_int(game.get("traitSecondSub")),
-                "food_craft_count": _safe_list_int(game.get("foodCraftCount")),
-                "total_vf_credits": _safe_list_int(game.get("totalVFCredits")),
-                "actively_gained_credits": _safe_int(game.get("activelyGainedCredits")),
-                "used_vf_credits": _safe_list_int(game.get("usedVFCredits")),
-                "sum_used_vf_credits": _safe_int(game.get("sumUsedVFCredits")),
-                "total_use_vf_credit": _safe_int(game.get("totalUseVFCredit")),
-                # Scalar rollups corresponding to the VF credit histories above
-                "credit_revival_count": _safe_int(game.get("creditRevivalCount")),
-                "credit_revived_others_count": _safe_int(
-                    game.get("creditRevivedOthersCount")
-                ),
-                "total_gain_vf_credit": _safe_int(game.get("totalGainVFCredit")),
-                "craft_mythic": _safe_int(game.get("craftMythic")),
-                "player_deaths": _safe_int(game.get("playerDeaths")),
-                "kill_gamma": bool(game.get("killGamma"))
-                if game.get("killGamma") is not None
-                else None,
-                "scored_point": _safe_list_int(game.get("scoredPoint")),
-                "kill_details": str(game.get("killDetails") or ""),
-                "death_details": str(game.get("deathDetails") or ""),
-                "kills_phase_one": _safe_int(game.get("killsPhaseOne")),
-                "kills_phase_two": _safe_int(game.get("killsPhaseTwo")),
-                "kills_phase_three": _safe_int(game.get("killsPhaseThree")),
-                "deaths_phase_one": _safe_int(game.get("deathsPhaseOne")),
-                "deaths_phase_two": _safe_int(game.get("deathsPhaseTwo")),
-                "deaths_phase_three": _safe_int(game.get("deathsPhaseThree")),
-                "used_pair_loop": _safe_int(game.get("usedPairLoop")),
-                "cc_time_to_player": _safe_float(game.get("ccTimeToPlayer")),
-                "used_normal_heal_pack": _safe_int(game.get("usedNormalHealPack")),
-                "used_reinforced_heal_pack": _safe_int(
-                    game.get("usedReinforcedHealPack")
-                ),
-                "used_normal_shield_pack": _safe_int(game.get("usedNormalShieldPack")),
-                "used_reinforce_shield_pack": _safe_int(
-                    game.get("usedReinforceShieldPack")
-                ),
-                "item_transferred_console": _safe_list_int(
-                    game.get("itemTransferredConsole")
-                ),
-                "item_transferred_drone": _safe_list_int(
-                    game.get("itemTransferredDrone")
-                ),
-                "collect_item_for_log": _safe_list_int(game.get("collectItemForLog")),
-                "bought_infusion": _safe_str(game.get("boughtInfusion")),
-                "kiosk_exchange_credit": _safe_int(game.get("kioskExchangeCredit")),
-                "tree_of_life_spawn": _safe_int(game.get("treeOfLifeSpawn")),
-                "use_gadget": game.get("useGadget") or None,
-                "use_guide_robot": _safe_int(game.get("useGuideRobot")),
-                "guide_robot_radial": _safe_int(game.get("guideRobotRadial")),
-                "guide_robot_flag_ship": _safe_int(game.get("guideRobotFlagShip")),
-                "guide_robot_signature": _safe_int(game.get("guideRobotSignature")),
-                "use_recon_drone": _safe_int(game.get("useReconDrone")),
-                "use_emp_drone": _safe_int(game.get("useEmpDrone")),
-                "active_installation": game.get("activeInstallation") or None,
-                "get_bori_reward": game.get("getBoriReward") or None,
-                "except_pre_made_team": game.get("exceptPreMadeTeam"),
-                "squad_rumble_rank": _safe_int(game.get("squadRumbleRank")),
-                "view_contribution": _safe_int(game.get("viewContribution")),
-                "break_count": _safe_int(game.get("breakCount")),
-                "escape_state": _safe_int(game.get("escapeState")),
-            }
+        columns["is_leaving_before_credit_revival_terminate"].append(leave_value)
+        self._buffered_participants += 1 - self._flush_if_full(
+            self._buf_participants,
+            key,
+            self.participants_root,
+            PARTICIPANT_SCHEMA,
+            "participants",
         )
+        if self._buffered_participants > self._max_buffered_rows:
+            self._flush_largest_participants()
 
-        # Nested maps (equipFirstItem log normalised to map[str, list[int]])
-        row["mastery_level"] = game.get("masteryLevel") or None
-        row["equipment_map"] = game.get("equipment") or None
-        row["equipment_grade_map"] = game.get("equipmentGrade") or None
-        row["equip_first_item_for_log"] = _safe_map_list_int(
-            game.get("equipFirstItemForLog")
-        )
-        row["skill_level_info"] = game.get("skillLevelInfo") or None
-        row["skill_order_info"] = game.get("skillOrderInfo") or None
-        row["kill_monsters"] = game.get("killMonsters") or None
-        row["credit_source"] = game.get("creditSource") or None
-        row["event_mission_result"] = game.get("eventMissionResult") or None
-        row["equipment_raw"] = game.get("equipment") or None
-        row["cr_use_remote_drone"] = _safe_int(game.get("crUseRemoteDrone"))
-        row["cr_use_upgrade_tactical_skill"] = _safe_int(
-            game.get("crUseUpgradeTacticalSkill")
-        )
-        row["cr_use_tree_of_life"] = _safe_int(game.get("crUseTreeOfLife"))
-        row["cr_use_meteorite"] = _safe_int(game.get("crUseMeteorite"))
-        row["cr_use_mythril"] = _safe_int(game.get("crUseMythril"))
-        row["cr_use_force_core"] = _safe_int(game.get("crUseForceCore"))
-        row["cr_use_vf_blood_sample"] = _safe_int(game.get("crUseVFBloodSample"))
-        row["cr_use_activation_module"] = _safe_int(game.get("crUseActivationModule"))
-        row["cr_use_rootkit"] = _safe_int(game.get("crUseRootkit"))
-        row["cr_get_animal"] = _safe_int(game.get("crGetAnimal"))
-        row["cr_get_mutant"] = _safe_int(game.get("crGetMutant"))
-        row["cr_get_phase_start"] = _safe_int(game.get("crGetPhaseStart"))
-        row["cr_get_kill"] = _safe_int(game.get("crGetKill"))
-        row["cr_get_assist"] = _safe_int(game.get("crGetAssist"))
-        row["cr_get_time_elapsed"] = _safe_int(game.get("crGetTimeElapsed"))
-        row["cr_get_credit_bonus"] = _safe_int(game.get("crGetCreditBonus"))
-        row["cr_get_by_guide_robot"] = _safe_int(game.get("crGetByGuideRobot"))
-        row["team_elimination"] = _safe_int(game.get("teamElimination"))
-        row["team_down"] = _safe_int(game.get("teamDown"))
-        row["team_battle_zone_down"] = _safe_int(game.get("teamBattleZoneDown"))
-        row["team_repeat_down"] = _safe_int(game.get("teamRepeatDown"))
-        row["team_down_can_not_eliminate"] = _safe_int(
-            game.get("teamDownCanNotEliminate")
-        )
-        row["team_down_can_eliminate"] = _safe_int(game.get("teamDownCanEliminate"))
-        row["team_repeat_down_can_not_eliminate"] = _safe_int(
-            game.get("teamRepeatDownCanNotEliminate")
-        )
-        row["team_repeat_down_can_eliminate"] = _safe_int(
-            game.get("teamRepeatDownCanEliminate")
-        )
-        row["terminate_count"] = _safe_int(game.get("terminateCount"))
-        row["terminate_count_can_not_eliminate"] = _safe_int(
-            game.get("terminateCountCanNotEliminate")
-        )
-        row["clutch_count"] = _safe_int(game.get("clutchCount"))
-        row["total_tk_per_min"] = _safe_list_int(game.get("totalTKPerMin"))
-        row["enter_dimension_rift"] = _safe_int(game.get("enterDimensionRift"))
-        row["enter_dimension_empowered_rift"] = _safe_int(
-            game.get("enterDimensionEmpoweredRift")
-        )
-        row["enter_turbulent_rift"] = _safe_int(game.get("enterTurbulentRift"))
-        row["win_from_dimension_rift"] = _safe_int(game.get("winFromDimensionRift"))
-        row["win_from_dimension_empowered_rift"] = _safe_int(
-            game.get("winFromDimensionEmpoweredRift")
-        )
-        row["remote_drone_use_vf_credit_my_self"] = _safe_int(
-            game.get("remoteDroneUseVFCreditMySelf")
-        )
-        row["remote_drone_use_vf_credit_ally"] = _safe_int(
-            game.get("remoteDroneUseVFCreditAlly")
-        )
-        row["kiosk_from_material_use_vf_credit"] = _safe_int(
-            game.get("kioskFromMaterialUseVFCredit")
-        )
-        row["kiosk_from_escape_key_use_vf_credit"] = _safe_int(
-            game.get("kioskFromEscapeKeyUseVFCredit")
-        )
-        row["kiosk_from_revival_use_vf_credit"] = _safe_int(
-            game.get("kioskFromRevivalUseVFCredit")
-        )
-        row["tactical_skill_upgrade_use_vf_credit"] = _safe_int(
-            game.get("tacticalSkillUpgradeUseVFCredit")
-        )
-        row["infusion_re_roll_use_vf_credit"] = _safe_int(
-            game.get("infusionReRollUseVFCredit")
-        )
-        row["infusion_trait_use_vf_credit"] = _safe_int(
-            game.get("infusionTraitUseVFCredit")
-        )
-        row["infusion_relic_use_vf_credit"] = _safe_int(
-            game.get("infusionRelicUseVFCredit")
-        )
-        row["infusion_store_use_vf_credit"] = _safe_int(
-            game.get("infusionStoreUseVFCredit")
-        )
-        row["get_buff_cube_red"] = _safe_int(game.get("getBuffCubeRed"))
-        row["get_buff_cube_purple"] = _safe_int(game.get("getBuffCubePurple"))
-        row["get_buff_cube_green"] = _safe_int(game.get("getBuffCubeGreen"))
-        row["get_buff_cube_gold"] = _safe_int(game.get("getBuffCubeGold"))
-        row["get_buff_cube_sky_blue"] = _safe_int(game.get("getBuffCubeSkyBlue"))
-        row["sum_get_buff_cube"] = _safe_int(game.get("sumGetBuffCube"))
-        row["using_default_game_option"] = (
-            bool(game.get("usingDefaultGameOption"))
-            if game.get("usingDefaultGameOption") is not None
-            else None
-        )
-        row["reunited_count"] = _safe_int(game.get("reunitedCount"))
-        row["time_spent_in_briefing_room"] = _safe_int(
-            game.get("timeSpentInBriefingRoom")
+    def _flush_largest_participants(self) -> None:
+        buffers = self._buf_participants
+        key = max(buffers, key=lambda k: len(buffers[k]["game_id"]))
+        self._buffered_participants -= self._flush_partition(
+            self.participants_root,
+            key,
+            buffers[key],
+            PARTICIPANT_SCHEMA,
+            prefix="participants",
         )
-        row["item_shredder_gain_vf_credit"] = _safe_int(
-            game.get("itemShredderGainVFCredit")
-        )
-        row["main_weather"] = _safe_int(game.get("mainWeather"))
-        row["sub_weather"] = _safe_int(game.get("subWeather"))
-        row["total_turbine_take_over"] = _safe_int(game.get("totalTurbineTakeOver"))
+        del buffers[key]
 
-        self._buf_participants[self._partition_key(game)].append(row)
-        if len(self._buf_participants[self._partition_key(game)]) >= self._flush_rows:
-            self._flush_partition(
-                self.participants_root,
-                self._partition_key(game),
-                self._buf_participants[self._partition_key(game)],
-                PARTICIPANT_SCHEMA,
-                prefix="participants",
-            )
-            self._buf_participants[self._partition_key(game)].clear()
+    def _columns_for(
+        self,
+        buffers: Dict[PartitionKey, ColumnBuffer],
+        key: PartitionKey,
+        schema: pa.Schema,
+    ) -> ColumnBuffer:
+        columns = buffers.get(key)
+        if columns is None:
+            columns = buffers[key] = _new_column_buffer(schema)
+        return columns
+
+    def _flush_if_full(
+        self,
+        buffers: Dict[PartitionKey, ColumnBuffer],
+        key: PartitionKey,
+        root: Path,
+        schema: pa.Schema,
+        prefix: str,
+    ) -> int:
+        """Flush the partition once it reaches ``flush_rows``; return rows written."""
+
+        columns = buffers[key]
+        if len(columns[schema.names[0]]) < self._flush_rows:
+            return 0
+        written = self._flush_partition(root, key, columns, schema, prefix=prefix)
+        buffers[key] = _new_column_buffer(schema)
+        return written
 
     def _flush_partition(
         self,
         root: Path,
-        key: Tuple[Optional[int], str, Optional[int], Optional[str]],
-        rows: List[Dict[str, Any]],
+        key: PartitionKey,
+        columns: ColumnBuffer,
         schema: pa.Schema,
         *,
         prefix: str,
-    ) -> None:
+    ) -> int:
+        rows = len(columns[schema.names[0]])
         if not rows:
+            return 0
+        batch = pa.RecordBatch.from_arrays(
+            [_column_to_arrow(columns[field.name], field.type) for field in schema],
+            schema=schema,
+        )
+        writer_key = (prefix, key)
+        writer = self._writers.get(writer_key)
+        if writer is not None:
+            self._writers.move_to_end(writer_key)
+        else:
+            while len(self._writers) >= self._max_open_writers:
+                self._close_writer(*self._writers.popitem(last=False))
+            dirpath = self._dir_from_key(root, key)
+            # Unique filename per writer
+            self._file_counters[key] += 1
+            filename = dirpath / f"{prefix}-part-{self._file_counters[key]:05d}.parquet"
+            writer = pq.ParquetWriter(
+                filename,
+                schema,
+                compression=self._compression,
+                compression_level=self._compression_level,
+                use_dictionary=self._use_dictionary,
+                data_page_size=self._data_page_size,
+            )
+            self._writers[writer_key] = writer
+        self._submit_write(writer_key, writer, batch)
+        return rows
+
+    def _close_writer(
+        self, writer_key: Tuple[str, PartitionKey], writer: pq.ParquetWriter
+    ) -> None:
+        pending = self._pending_writes.pop(writer_key, None)
+        if pending is not None:
+            pending.result()
+        writer.close()
+
+    def _submit_write(
+        self,
+        writer_key: Tuple[str, PartitionKey],
+        writer: pq.ParquetWriter,
+        batch: pa.RecordBatch,
+    ) -> None:
+        if self._flush_pool is None:
+            writer.write_batch(batch)
             return
-        dirpath = self._dir_from_key(root, key)
-        # Unique filename per flush
-        self._file_counters[key] += 1
-        filename = dirpath / f"{prefix}-part-{self._file_counters[key]:05d}.parquet"
-        columns = {name: [r.get(name) for r in rows] for name in schema.names}
-        table = pa.table(columns, schema=schema)
-        pq.write_table(
-            table,
-            filename,
-            compression=self._compression,
-            use_dictionary=["server_name"],
+        # Row groups of one file must be written in order, one at a time.
+        previous = self._pending_writes.pop(writer_key, None)
+        if previous is not None:
+            previous.result()
+        self._pending_writes[writer_key] = self._flush_pool.submit(
+            writer.write_batch, batch
         )
+        if len(self._pending_writes) > 2 * self._flush_workers:
+            self._drain_writes()
+
+    def _drain_writes(self) -> None:
+        pending = list(self._pending_writes.values())
+        self._pending_writes.clear()
+        for future in pending:
+            future.result()
 
     def close(self) -> None:
         # Flush remaining buffers
-        for key, rows in list(self._buf_matches.items()):
-            if rows:
-                self._flush_partition(
-                    self.matches_root, key, rows, MATCH_SCHEMA, prefix="matches"
-                )
-                rows.clear()
-        for key, rows in list(self._buf_participants.items()):
-            if rows:
-                self._flush_partition(
-                    self.participants_root,
-                    key,
-                    rows,
-                    PARTICIPANT_SCHEMA,
-                    prefix="participants",
-                )
-                rows.clear()
+        for key, columns in self._buf_matches.items():
+            self._flush_partition(
+                self.matches_root, key, columns, MATCH_SCHEMA, prefix="matches"
+            )
+        self._buf_matches.clear()
+        for key, columns in self._buf_participants.items():
+            self._flush_partition(
+                self.participants_root,
+                key,
+                columns,
+                PARTICIPANT_SCHEMA,
+                prefix="participants",
+            )
+        self._buf_participants.clear()
+        self._buffered_participants = 0
+        self._drain_writes()
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+        if self._flush_pool is not None:
+            self._flush_pool.shutdown(wait=True)
+            self._flush_pool = None
 
 
 __all__ = ["ParquetExporter"]
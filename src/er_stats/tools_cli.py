@@ -10,9 +10,11 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
-import math
+import os
 import sys
+from array import array
 from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterable, Optional, Tuple
@@ -20,32 +22,122 @@ from typing import Any, Dict, Iterable, Optional, Tuple
 from .config import ConfigError, load_ingest_config
 from .db import SQLiteStore, parse_start_time
 
+# Same data page size as ParquetExporter output.
+REBUILD_DATA_PAGE_SIZE = 1 << 20
 
-@dataclass
-class _MatchChoice:
-    row: Dict[str, Any]
-    score: Tuple[int, int]
-    partition_date: Optional[str]
 
+# Participant columns that may be overridden from the chosen match row.
+_CONTEXT_FIELDS = ("season_id", "server_name", "matching_mode", "matching_team_mode")
 
-def _value_present(value: Any) -> bool:
-    if value is None:
-        return False
-    if isinstance(value, str):
-        return value != ""
-    if isinstance(value, float) and math.isnan(value):
-        return False
-    return True
 
+@dataclass(slots=True)
+class _MatchContext:
+    """Chosen match row per game_id, kept as parallel column lists."""
 
-def _match_score(
-    row: Dict[str, Any],
+    # game_id -> position in the lists below
+    index: Dict[int, int]
+    # _CONTEXT_FIELDS -> per-match values (server_name nulls become "")
+    fields: Dict[str, list[Any]]
+    # Output partition date: start_dtm's date, else the source partition's.
+    dates: list[Optional[str]]
+
+    @classmethod
+    def from_rows(cls, rows: Any, pa: Any, pc: Any) -> _MatchContext:
+        fields = {field: _column_values(rows, field) for field in _CONTEXT_FIELDS}
+        # Servers and dates repeat across matches; interning keeps one string
+        # object per distinct value instead of one per match.
+        fields["server_name"] = [
+            "" if value is None else _intern_optional(value)
+            for value in fields["server_name"]
+        ]
+        if "start_dtm" in rows.column_names:
+            start_dates = _start_dates(rows["start_dtm"], pa, pc)
+        else:
+            start_dates = [None] * rows.num_rows
+        dates = [
+            _intern_optional(start_date or partition_date)
+            for start_date, partition_date in zip(
+                start_dates, _column_values(rows, "date")
+            )
+        ]
+        index = {
+            game_id: i for i, game_id in enumerate(_column_values(rows, "game_id"))
+        }
+        return cls(index=index, fields=fields, dates=dates)
+
+    def partition_keys(self) -> Iterable[Tuple[Any, str, Any, Any]]:
+        return map(
+            _partition_key,
+            self.fields["season_id"],
+            self.fields["server_name"],
+            self.fields["matching_mode"],
+            self.dates,
+        )
+
+
+def _intern_optional(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+def _present_mask(column: Any, pa: Any, pc: Any) -> Any:
+    """Vectorized presence test: non-null, non-empty strings, non-NaN floats."""
+
+    mask = pc.is_valid(column)
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        mask = pc.and_kleene(mask, pc.not_equal(column, ""))
+    elif pa.types.is_floating(column.type):
+        mask = pc.and_kleene(mask, pc.invert(pc.is_nan(column)))
+    return pc.cast(pc.fill_null(mask, fill_value=False), pa.int32())
+
+
+def _count_present(table: Any, columns: Iterable[str], pa: Any, pc: Any) -> Any:
+    total = pa.nulls(table.num_rows, pa.int32()).fill_null(0)
+    for col in columns:
+        if col in table.column_names:
+            total = pc.add(total, _present_mask(table[col], pa, pc))
+    return total
+
+
+def _best_match_rows(
+    table: Any,
     rep_cols: Iterable[str],
     all_cols: Iterable[str],
-) -> Tuple[int, int]:
-    rep_score = sum(_value_present(row.get(col)) for col in rep_cols)
-    non_null = sum(_value_present(row.get(col)) for col in all_cols)
-    return rep_score, non_null
+    pa: Any,
+    pc: Any,
+) -> Any:
+    """Keep the most complete row per game_id, ordered by game_id.
+
+    Rows are ranked by how many representative columns are present, then by
+    how many columns are present at all; ties keep the earliest scanned row
+    because Arrow's sort is stable.
+    """
+
+    table = table.filter(pc.is_valid(table["game_id"]))
+    if not pa.types.is_integer(table.schema.field("game_id").type):
+        game_ids = pc.cast(table["game_id"], pa.int64())
+        table = table.set_column(
+            table.schema.get_field_index("game_id"), "game_id", game_ids
+        )
+    table = table.append_column("_rep", _count_present(table, rep_cols, pa, pc))
+    table = table.append_column("_non_null", _count_present(table, all_cols, pa, pc))
+    if table.num_rows == 0:
+        return table
+    order = pc.sort_indices(
+        table,
+        sort_keys=[
+            ("game_id", "ascending"),
+            ("_rep", "descending"),
+            ("_non_null", "descending"),
+        ],
+    )
+    game_ids = pc.take(table["game_id"], order).combine_chunks()
+    first_of_game = pa.concat_arrays(
+        [
+            pa.array([True]),
+            pc.not_equal(game_ids.slice(1), game_ids.slice(0, len(game_ids) - 1)),
+        ]
+    )
+    return table.take(pc.filter(order, first_of_game))
 
 
 def _date_part(value: Optional[str]) -> Optional[str]:
@@ -55,6 +147,29 @@ def _date_part(value: Optional[str]) -> Optional[str]:
     return str(iso)[:10]
 
 
+def _start_dates(column: Any, pa: Any, pc: Any) -> list[Optional[str]]:
+    """Vectorized ``_date_part`` over a start_dtm column.
+
+    Values already shaped like YYYY-MM-DD... keep their own offset's date, so
+    they are sliced in Arrow; only other strings go through parse_start_time.
+    """
+
+    if not (pa.types.is_string(column.type) or pa.types.is_large_string(column.type)):
+        return [_date_part(value) for value in column.to_pylist()]
+    iso = pc.fill_null(
+        pc.match_substring_regex(column, r"^.{4}-.{2}-.{2}"), fill_value=False
+    )
+    dates = pc.if_else(
+        iso,
+        pc.utf8_slice_codeunits(column, 0, 10),
+        pa.scalar(None, type=column.type),
+    ).to_pylist()
+    other = pc.indices_nonzero(pc.and_(pc.invert(iso), pc.is_valid(column)))
+    for i, value in zip(other.to_pylist(), column.take(other).to_pylist()):
+        dates[i] = _date_part(value)
+    return dates
+
+
 def _parse_datetime_or_date(value: str) -> dt.datetime:
     try:
         parsed = dt.datetime.fromisoformat(value)
@@ -105,13 +220,6 @@ def _resolve_prune_paths(
     return db_path, parquet_dir, None
 
 
-def _iter_rows(dataset: Any, columns: list[str]) -> Iterable[Dict[str, Any]]:
-    scanner = dataset.scanner(columns=columns)
-    for batch in scanner.to_batches():
-        for row in batch.to_pylist():
-            yield row
-
-
 def _strip_date(schema: Any) -> Any:
     if "date" not in schema.names:
         return schema
@@ -120,29 +228,157 @@ def _strip_date(schema: Any) -> Any:
 
 
 def _partition_key(
-    row: Dict[str, Any],
+    season_id: Any,
+    server_name: Any,
+    matching_mode: Any,
     date_value: Optional[str],
 ) -> Tuple[Any, str, Any, Any]:
-    server_name = row.get("server_name")
     if server_name is None:
         server_name = ""
-    return (
-        row.get("season_id"),
-        str(server_name),
-        row.get("matching_mode"),
-        date_value,
-    )
+    return (season_id, str(server_name), matching_mode, date_value)
 
 
-def _apply_match_context(row: Dict[str, Any], match_row: Dict[str, Any]) -> None:
+def _apply_match_context(
+    row: Dict[str, Any], match_fields: Dict[str, list[Any]], index: int
+) -> None:
     for field in ("season_id", "matching_mode", "matching_team_mode"):
-        if match_row.get(field) is not None:
-            row[field] = match_row[field]
-    server_name = match_row.get("server_name")
+        value = match_fields[field][index]
+        if value is not None:
+            row[field] = value
+    server_name = match_fields["server_name"][index]
     if isinstance(server_name, str) and server_name != "":
         row["server_name"] = server_name
 
 
+def _column_values(batch: Any, name: str) -> list[Any]:
+    """Return one batch/table column as Python values, or Nones if absent."""
+
+    names = batch.schema.names
+    if name not in names:
+        return [None] * batch.num_rows
+    return batch.column(names.index(name)).to_pylist()
+
+
+def _participant_dedupe_key(
+    game_id: Any, uid: Any, nickname: Any
+) -> Optional[Tuple[int, str]]:
+    if game_id is None:
+        return None
+    try:
+        game_id_int = int(game_id)
+    except (TypeError, ValueError):
+        return None
+    if uid:
+        return game_id_int, str(uid)
+    if nickname:
+        return game_id_int, f"nickname:{nickname}"
+    return None
+
+
+def _colliding_participant_hashes(dataset: Any, pa: Any, pc: Any) -> set[int]:
+    """Return hashes of participant dedupe keys that occur more than once.
+
+    A key whose hash is unique across the dataset cannot be a duplicate, so the
+    exact ``seen`` set only has to hold keys whose hash shows up here. The scan
+    keeps 8 bytes per row instead of a tuple per distinct participant.
+    """
+
+    names = dataset.schema.names
+    columns = [name for name in ("game_id", "uid", "nickname") if name in names]
+    hashes = array("q")
+    append = hashes.append
+    dedupe_key = _participant_dedupe_key
+    for batch in dataset.scanner(columns=columns, use_threads=True).to_batches():
+        for game_id, uid, nickname in zip(
+            _column_values(batch, "game_id"),
+            _column_values(batch, "uid"),
+            _column_values(batch, "nickname"),
+        ):
+            key = dedupe_key(game_id, uid, nickname)
+            if key is not None:
+                append(hash(key))
+    if not hashes:
+        return set()
+    counts = pc.value_counts(
+        pa.Array.from_buffers(pa.int64(), len(hashes), [None, pa.py_buffer(hashes)])
+    )
+    repeated = pc.greater(counts.field("counts"), 1)
+    return set(counts.field("values").filter(repeated).to_pylist())
+
+
+def _route_participant_batch(
+    batch: Any,
+    schema: Any,
+    matches: _MatchContext,
+    seen: set[Tuple[int, str]],
+    collisions: set[int],
+    pa: Any,
+) -> Dict[Tuple[Any, str, Any, Any], Any]:
+    """Dedupe one scanned participants batch and split it by output partition.
+
+    Only the columns that drive dedupe, match context and partitioning are
+    converted to Python; every other column is carried over with ``take``.
+    """
+
+    names = batch.schema.names
+    game_ids = _column_values(batch, "game_id")
+    uids = _column_values(batch, "uid")
+    nicknames = _column_values(batch, "nickname")
+    dates = _column_values(batch, "date")
+    context = {field: _column_values(batch, field) for field in _CONTEXT_FIELDS}
+
+    routed: Dict[Tuple[Any, str, Any, Any], list[int]] = {}
+    # Globals and bound methods used per row are resolved once up front.
+    make_dedupe_key = _participant_dedupe_key
+    apply_match_context = _apply_match_context
+    partition_key = _partition_key
+    match_index = matches.index.get
+    match_fields = matches.fields
+    match_dates = matches.dates
+    route = routed.setdefault
+    context_items = tuple(context.items())
+    # One scratch dict is refilled per row; every context field is assigned
+    # each time, so nothing leaks from the previous row.
+    row: Dict[str, Any] = {}
+    for i, game_id in enumerate(game_ids):
+        dedupe_key = make_dedupe_key(game_id, uids[i], nicknames[i])
+        if dedupe_key is None:
+            continue
+        if hash(dedupe_key) in collisions:
+            if dedupe_key in seen:
+                continue
+            seen.add(dedupe_key)
+
+        for field, values in context_items:
+            row[field] = values[i]
+        if row["server_name"] is None:
+            row["server_name"] = ""
+        date_value = dates[i]
+        j = match_index(dedupe_key[0])
+        if j is not None:
+            apply_match_context(row, match_fields, j)
+            date_value = match_dates[j]
+        for field, values in context_items:
+            values[i] = row[field]
+        key = partition_key(
+            row["season_id"], row["server_name"], row["matching_mode"], date_value
+        )
+        route(key, []).append(i)
+
+    batches = {}
+    for key, indices in routed.items():
+        take = pa.array(indices, pa.int64())
+        arrays = []
+        for field in schema:
+            if field.name in context:
+                values = context[field.name]
+                arrays.append(pa.array([values[i] for i in indices], field.type))
+            else:
+                arrays.append(batch.column(names.index(field.name)).take(take))
+        batches[key] = pa.RecordBatch.from_arrays(arrays, schema=schema)
+    return batches
+
+
 class _PartitionedWriter:
     def __init__(
         self,
@@ -153,6 +389,7 @@ class _PartitionedWriter:
         compression: Optional[str],
         pa_module: Any,
         pq_module: Any,
+        workers: Optional[int] = None,
     ) -> None:
         self.base_dir = Path(base_dir)
         self.schema = schema
@@ -160,12 +397,30 @@ class _PartitionedWriter:
         self.compression = compression
         self._pa = pa_module
         self._pq = pq_module
-        self._buffers: dict[Tuple[Any, str, Any, Any], list[Dict[str, Any]]] = (
-            defaultdict(list)
-        )
+        # Arrow batches per partition; a file is written once they reach
+        # max_rows_per_file.
+        self._batches: dict[Tuple[Any, str, Any, Any], list[Any]] = defaultdict(list)
+        self._sealed_rows: dict[Tuple[Any, str, Any, Any], int] = defaultdict(int)
         self._file_counters: dict[Tuple[Any, str, Any, Any], int] = defaultdict(int)
+        self._dirs: dict[Tuple[Any, str, Any, Any], Path] = {}
+        # Every flush writes its own file, so files are encoded and compressed
+        # on a thread pool (Arrow releases the GIL) while routing continues.
+        if workers is None:
+            workers = os.cpu_count() or 1
+        self._workers = max(1, int(workers))
+        self._pool: Optional[ThreadPoolExecutor] = None
+        if self._workers > 1:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self._workers,
+                thread_name_prefix="er-stats-parquet-rebuild",
+            )
+        self._pending: list[Future[None]] = []
 
     def _partition_dir(self, key: Tuple[Any, str, Any, Any]) -> Path:
+        path = self._dirs.get(key)
+        if path is not None:
+            return path
+
         def as_str(value: Any) -> str:
             return "null" if value is None else str(value)
 
@@ -180,35 +435,66 @@ class _PartitionedWriter:
         for part in parts:
             path = path / part
         path.mkdir(parents=True, exist_ok=True)
+        self._dirs[key] = path
         return path
 
     def _flush(self, key: Tuple[Any, str, Any, Any]) -> None:
-        rows = self._buffers.get(key)
-        if not rows:
+        batches = self._batches.pop(key, None)
+        self._sealed_rows.pop(key, None)
+        if not batches:
             return
         self._file_counters[key] += 1
         filename = (
             self._partition_dir(key) / f"part-{self._file_counters[key]:05d}.parquet"
         )
-        columns = {name: [row.get(name) for row in rows] for name in self.schema.names}
-        table = self._pa.table(columns, schema=self.schema)
+        table = self._pa.Table.from_batches(batches, schema=self.schema)
+        if self._pool is None:
+            self._write_file(table, filename)
+            return
+        self._pending.append(self._pool.submit(self._write_file, table, filename))
+        # Bound the tables held by queued writes.
+        if len(self._pending) > 2 * self._workers:
+            self._drain_writes()
+
+    def _write_file(self, table: Any, filename: Path) -> None:
+        # A file never exceeds max_rows_per_file, so it is written as a single
+        # row group with one footer entry per column.
         self._pq.write_table(
             table,
             filename,
+            row_group_size=self.max_rows_per_file,
             compression=self.compression,
-            use_dictionary=["server_name"],
+            use_dictionary=True,
+            data_page_size=REBUILD_DATA_PAGE_SIZE,
         )
-        rows.clear()
 
-    def write_row(self, row: Dict[str, Any], key: Tuple[Any, str, Any, Any]) -> None:
-        buf = self._buffers[key]
-        buf.append(row)
-        if len(buf) >= self.max_rows_per_file:
-            self._flush(key)
+    def _drain_writes(self) -> None:
+        pending = self._pending
+        self._pending = []
+        for future in pending:
+            future.result()
+
+    def write_batch(self, batch: Any, key: Tuple[Any, str, Any, Any]) -> None:
+        """Append an Arrow batch matching ``schema``, splitting it at file limits."""
+
+        offset = 0
+        while offset < batch.num_rows:
+            room = self.max_rows_per_file - self._sealed_rows[key]
+            part = batch.slice(offset, room)
+            self._batches[key].append(part)
+            self._sealed_rows[key] += part.num_rows
+            offset += part.num_rows
+            if self._sealed_rows[key] >= self.max_rows_per_file:
+                self._flush(key)
 
     def close(self) -> None:
-        for key in list(self._buffers.keys()):
-            self._flush(key)
+        try:
+            for key in list(self._batches):
+                self._flush(key)
+            self._drain_writes()
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
 
 
 def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
@@ -341,6 +627,7 @@ def run(argv: Optional[Iterable[str]] = None) -> int:
     if args.command == "parquet-rebuild":
         try:
             import pyarrow as pa
+            import pyarrow.compute as pc
             import pyarrow.dataset as ds
             import pyarrow.parquet as pq
         except Exception as e:
@@ -363,8 +650,13 @@ def run(argv: Optional[Iterable[str]] = None) -> int:
         participants_dst.mkdir(parents=True, exist_ok=True)
 
         no_partitions = ds.partitioning(pa.schema([]))
+        # Coalesce each file's column-chunk reads into few large requests
+        # (the default on recent pyarrow, stated for older releases).
+        parquet_format = ds.ParquetFileFormat(
+            default_fragment_scan_options=ds.ParquetFragmentScanOptions(pre_buffer=True)
+        )
         matches_dataset = ds.dataset(
-            str(matches_src), format="parquet", partitioning=no_partitions
+            str(matches_src), format=parquet_format, partitioning=no_partitions
         )
         matches_schema = _strip_date(matches_dataset.schema)
         matches_columns = matches_schema.names
@@ -380,26 +672,30 @@ def run(argv: Optional[Iterable[str]] = None) -> int:
             "matching_team_mode",
             "start_dtm",
         ]
-        match_choices: dict[int, _MatchChoice] = {}
-        for row in _iter_rows(matches_dataset, matches_columns_with_date):
-            game_id = row.get("game_id")
-            if game_id is None:
-                continue
-            try:
-                game_id_int = int(game_id)
-            except (TypeError, ValueError):
-                continue
-            row_data = {col: row.get(col) for col in matches_columns}
-            if row_data.get("server_name") is None:
-                row_data["server_name"] = ""
-            score = _match_score(row_data, rep_cols, matches_columns)
-            existing = match_choices.get(game_id_int)
-            if existing is None or score > existing.score:
-                match_choices[game_id_int] = _MatchChoice(
-                    row=row_data,
-                    score=score,
-                    partition_date=row.get("date"),
-                )
+        # Scoring runs as Arrow kernels. Each scanned batch is reduced to its
+        # best row per game_id first, so the raw duplicates are never held all
+        # at once; the reduced batches are then reduced again. Both steps keep
+        # the earliest scanned row on ties, like a single pass would.
+        scanner = matches_dataset.scanner(
+            columns=matches_columns_with_date, use_threads=True
+        )
+        reduced = [
+            _best_match_rows(
+                pa.Table.from_batches([batch]), rep_cols, matches_columns, pa, pc
+            ).select(matches_columns_with_date)
+            for batch in scanner.to_batches()
+        ]
+        best_rows = _best_match_rows(
+            pa.concat_tables(reduced)
+            if reduced
+            else scanner.projected_schema.empty_table(),
+            rep_cols,
+            matches_columns,
+            pa,
+            pc,
+        )
+        del reduced
+        matches = _MatchContext.from_rows(best_rows, pa, pc)
 
         match_writer = _PartitionedWriter(
             matches_dst,
@@ -409,15 +705,31 @@ def run(argv: Optional[Iterable[str]] = None) -> int:
             pa_module=pa,
             pq_module=pq,
         )
-        for game_id in sorted(match_choices):
-            choice = match_choices[game_id]
-            row = choice.row
-            date_value = _date_part(row.get("start_dtm")) or choice.partition_date
-            match_writer.write_row(row, _partition_key(row, date_value))
+        # Chosen rows stay in Arrow: they are grouped by output partition and
+        # moved with take(). _best_match_rows orders them by game_id, so each
+        # partition is written in game_id order.
+        match_columns = {name: best_rows[name] for name in matches_columns}
+        if "server_name" in match_columns:
+            match_columns["server_name"] = pc.fill_null(
+                match_columns["server_name"], ""
+            )
+        match_batch = pa.RecordBatch.from_arrays(
+            [match_columns[field.name].combine_chunks() for field in matches_schema],
+            schema=matches_schema,
+        )
+        routed_matches: Dict[Tuple[Any, str, Any, Any], list[int]] = {}
+        for i, key in enumerate(matches.partition_keys()):
+            routed_matches.setdefault(key, []).append(i)
+        for key, indices in routed_matches.items():
+            match_writer.write_batch(
+                match_batch.take(pa.array(indices, pa.int64())), key
+            )
         match_writer.close()
+        # Only the compact match context is needed from here on.
+        del best_rows, match_columns, match_batch, routed_matches
 
         participants_dataset = ds.dataset(
-            str(participants_src), format="parquet", partitioning=no_partitions
+            str(participants_src), format=parquet_format, partitioning=no_partitions
         )
         participants_schema = _strip_date(participants_dataset.schema)
         participants_columns = participants_schema.names
@@ -426,6 +738,7 @@ def run(argv: Optional[Iterable[str]] = None) -> int:
         else:
             participants_columns_with_date = participants_columns
 
+        collisions = _colliding_participant_hashes(participants_dataset, pa, pc)
         seen: set[Tuple[int, str]] = set()
         participants_writer = _PartitionedWriter(
             participants_dst,
@@ -435,42 +748,17 @@ def run(argv: Optional[Iterable[str]] = None) -> int:
             pa_module=pa,
             pq_module=pq,
         )
-        for row in _iter_rows(participants_dataset, participants_columns_with_date):
-            row_date = row.get("date")
-            row_data = {col: row.get(col) for col in participants_columns}
-            game_id = row_data.get("game_id")
-            if game_id is None:
-                continue
-            try:
-                game_id_int = int(game_id)
-            except (TypeError, ValueError):
-                continue
-            row_data["game_id"] = game_id_int
-            if row_data.get("server_name") is None:
-                row_data["server_name"] = ""
-            match_choice = match_choices.get(game_id_int)
-            date_value = row_date
-            if match_choice is not None:
-                _apply_match_context(row_data, match_choice.row)
-                date_value = (
-                    _date_part(match_choice.row.get("start_dtm"))
-                    or match_choice.partition_date
-                )
-
-            uid = row_data.get("uid")
-            nickname = row_data.get("nickname")
-            if uid:
-                dedupe_key = (game_id_int, str(uid))
-            elif nickname:
-                dedupe_key = (game_id_int, f"nickname:{nickname}")
-            else:
-                continue
-            if dedupe_key in seen:
-                continue
-            seen.add(dedupe_key)
-            participants_writer.write_row(
-                row_data, _partition_key(row_data, date_value)
+        # Only decision columns become Python objects; the rest of each
+        # surviving row stays in Arrow and is moved with take().
+        scanner = participants_dataset.scanner(
+            columns=participants_columns_with_date, use_threads=True
+        )
+        for batch in scanner.to_batches():
+            routed = _route_participant_batch(
+                batch, participants_schema, matches, seen, collisions, pa
             )
+            for key, part in routed.items():
+                participants_writer.write_batch(part, key)
         participants_writer.close()
         return 0
     if args.command == "sqlite-prune":
@@ -0,0 +1,18 @@
+from er_stats.api_cache import GameResultCache
+
+
+def test_game_result_cache_round_trips_payloads(tmp_path):
+    cache = GameResultCache(str(tmp_path / "cache.sqlite"))
+    try:
+        assert cache.get(1) is None
+        cache.put(1, {"code": 200, "userGames": [{"nickname": "a"}]})
+        cache.put(2, {"code": 200, "userGames": []})
+
+        first = cache.get(1)
+        assert first == {"code": 200, "userGames": [{"nickname": "a"}]}
+        first["userGames"].clear()
+        assert cache.get(1)["userGames"] == [{"nickname": "a"}]
+        # Empty responses are not cached so they are retried later.
+        assert cache.get(2) is None
+    finally:
+        cache.close()
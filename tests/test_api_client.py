@@ -1,3 +1,5 @@
+import threading
+import time
 from typing import Any, Dict
 
 import pytest
@@ -173,3 +175,36 @@ def test_endpoint_specific_error_classification_for_nickname():
     assert is_nickname_not_found_error(nickname_missing)
     assert not is_user_games_uid_missing_error(nickname_missing)
     assert not is_user_games_no_games_error(nickname_missing)
+
+
+def test_wait_for_slot_spaces_concurrent_callers():
+    client = EternalReturnAPIClient(
+        base_url="https://example.invalid",
+        session=_Session(),
+        min_interval=0.05,
+    )
+    starts: list[float] = []
+
+    def _reserve() -> None:
+        client._wait_for_slot()
+        starts.append(time.monotonic())
+
+    threads = [threading.Thread(target=_reserve) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    starts.sort()
+    gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+    assert all(gap >= 0.04 for gap in gaps)
+
+
+def test_owned_session_pools_connections_and_carries_api_key():
+    with EternalReturnAPIClient(
+        base_url="https://example.invalid", api_key="key"
+    ) as client:
+        adapter = client.session.get_adapter("https://example.invalid/v1/games/1")
+        assert adapter._pool_maxsize == 32
+        assert client.session.headers["x-api-key"] == "key"
+        assert "x-api-key" not in client._headers()
@@ -0,0 +1,69 @@
+import pytest
+
+from er_stats.bloom import BloomFilter, RecentKeyBloomFilter, ScalableBloomFilter
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, error_rate=0.01)
+    for key in range(0, 2000, 2):
+        bloom.add(key)
+
+    assert all(key in bloom for key in range(0, 2000, 2))
+    assert len(bloom) == 1000
+    assert 1.5 not in bloom
+
+
+def test_bloom_filter_accepts_string_keys():
+    bloom = BloomFilter(1000, error_rate=0.01)
+    keys = [f"{game_id}:{game_id * 7}" for game_id in range(500)]
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"{n}:missing" in bloom for n in range(10_000))
+    assert false_positives / 10_000 < 0.03
+
+
+def test_bloom_filter_false_positive_rate_is_bounded():
+    bloom = BloomFilter(10_000, error_rate=0.01)
+    for key in range(10_000):
+        bloom.add(key)
+
+    false_positives = sum(key in bloom for key in range(10_000, 30_000))
+    assert false_positives / 20_000 < 0.03
+
+
+def test_bloom_filter_rejects_invalid_parameters():
+    with pytest.raises(ValueError, match="capacity"):
+        BloomFilter(0)
+    with pytest.raises(ValueError, match="error_rate"):
+        BloomFilter(10, error_rate=1.0)
+
+
+def test_scalable_bloom_filter_grows_without_false_negatives():
+    bloom = ScalableBloomFilter(initial_capacity=100, error_rate=0.001)
+    initial_bits = bloom.num_bits
+    for key in range(1000):
+        bloom.add(key)
+
+    assert all(key in bloom for key in range(1000))
+    assert len(bloom) == 1000
+    assert bloom.num_bits > initial_bits
+    false_positives = sum(key in bloom for key in range(1000, 11_000))
+    assert false_positives / 10_000 < 0.01
+
+
+def test_recent_key_bloom_filter_remembers_keys_beyond_window():
+    seen = RecentKeyBloomFilter(initial_capacity=100, recent_keys=2)
+    for key in ("1:a", "1:b", "2:a", "1:b"):
+        seen.add(key)
+
+    assert "2:a" in seen
+    assert "1:b" in seen
+    # Evicted from the exact window, still answered by the Bloom filter.
+    assert "1:a" not in seen._recent_set
+    assert "1:a" in seen
+    assert "3:a" not in seen
+    assert len(seen) == 3
+    with pytest.raises(ValueError, match="recent_keys"):
+        RecentKeyBloomFilter(recent_keys=0)
@@ -1,9 +1,10 @@
 import json
+import logging
 from typing import Any, Dict, Optional
 
 import pytest
 
-from er_stats.cli import run
+from er_stats.cli import BufferedLogHandler, run
 
 
 class _DummyClient:
@@ -953,6 +954,9 @@ def test_cli_ingest_only_newer_games_enabled_by_default(monkeypatch, store):
         def __init__(self, client, db_store, **kwargs):
             recorded_kwargs.update(kwargs)
 
+        def close(self):
+            return None
+
         def ingest_from_seeds(self, seeds, depth=1):  # pragma: no cover - trivial
             recorded_kwargs["seeds"] = list(seeds)
             recorded_kwargs["depth"] = depth
@@ -996,6 +1000,9 @@ def test_cli_ingest_can_include_older_games(monkeypatch, store):
         def __init__(self, client, db_store, **kwargs):
             recorded_kwargs.update(kwargs)
 
+        def close(self):
+            return None
+
         def ingest_from_seeds(self, seeds, depth=1):  # pragma: no cover - trivial
             recorded_kwargs["seeds"] = list(seeds)
             recorded_kwargs["depth"] = depth
@@ -1033,6 +1040,9 @@ def test_cli_ingest_require_metadata_refresh_success(monkeypatch, store):
         def __init__(self, client, db_store, **kwargs):
             recorded_kwargs.update(kwargs)
 
+        def close(self):
+            return None
+
         def ingest_from_seeds(self, seeds, depth=1):  # pragma: no cover - trivial
             recorded_kwargs["seeds"] = list(seeds)
             recorded_kwargs["depth"] = depth
@@ -1065,6 +1075,9 @@ def test_cli_ingest_require_metadata_refresh_fails_on_error(monkeypatch, store):
         def __init__(self, client, db_store, **kwargs):
             recorded_kwargs.update(kwargs)
 
+        def close(self):
+            return None
+
         def ingest_from_seeds(self, seeds, depth=1):  # pragma: no cover - trivial
             recorded_kwargs["seeds"] = list(seeds)
             recorded_kwargs["depth"] = depth
@@ -1103,6 +1116,9 @@ def test_cli_ingest_require_metadata_refresh_fails_on_character_error(
         def __init__(self, client, db_store, **kwargs):
             recorded_kwargs.update(kwargs)
 
+        def close(self):
+            return None
+
         def ingest_from_seeds(self, seeds, depth=1):  # pragma: no cover - trivial
             recorded_kwargs["seeds"] = list(seeds)
             recorded_kwargs["depth"] = depth
@@ -1128,3 +1144,29 @@ def test_cli_ingest_require_metadata_refresh_fails_on_character_error(
     )
 
     assert code == 2
+
+
+def test_buffered_log_handler_batches_until_threshold():
+    class _Collect(logging.Handler):
+        def __init__(self) -> None:
+            super().__init__()
+            self.messages: list[str] = []
+
+        def emit(self, record: logging.LogRecord) -> None:
+            self.messages.append(record.getMessage())
+
+    target = _Collect()
+    handler = BufferedLogHandler(3, flush_interval=3600.0, target=target)
+
+    def _record(level: int, msg: str) -> logging.LogRecord:
+        return logging.LogRecord("t", level, __file__, 0, msg, None, None)
+
+    handler.handle(_record(logging.INFO, "a"))
+    handler.handle(_record(logging.INFO, "b"))
+    assert target.messages == []
+    handler.handle(_record(logging.WARNING, "c"))
+    assert target.messages == ["a", "b", "c"]
+
+    handler.flush_interval = 0.0
+    handler.handle(_record(logging.INFO, "d"))
+    assert target.messages == ["a", "b", "c", "d"]
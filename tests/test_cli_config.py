@@ -69,6 +69,9 @@ api_key_env = "ER_API_KEY"
             recorded_kwargs["client"] = client
             recorded_kwargs["db_store"] = db_store
 
+        def close(self):
+            return None
+
         def ingest_from_seeds(self, seeds, depth=1):
             recorded_kwargs["seeds"] = list(seeds)
             recorded_kwargs["depth"] = depth
@@ -122,6 +125,9 @@ nicknames = ["FromConfig"]
         def __init__(self, client, db_store, **kwargs):
             recorded_kwargs.update(kwargs)
 
+        def close(self):
+            return None
+
         def ingest_from_seeds(self, seeds, depth=1):
             recorded_kwargs["seeds"] = list(seeds)
             recorded_kwargs["depth"] = depth
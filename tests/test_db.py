@@ -1,4 +1,8 @@
-from er_stats.db import parse_start_time
+import datetime as dt
+
+import pytest
+
+from er_stats.db import _fast_start_time_epoch, parse_start_time, start_time_epoch
 
 
 def test_parse_start_time_variants():
@@ -168,3 +172,144 @@ def test_refresh_items(store, tmp_path):
         "SELECT item_code, name, mode_type, item_type, item_grade, is_completed_item FROM items"
     ).fetchone()
     assert tuple(row) == (101102, "Upgraded Sword", 1, "Weapon", "Uncommon", 1)
+
+
+def test_start_time_epoch_matches_datetime_timestamp():
+    value = "2025-10-27T23:24:03.003+0900"
+    expected = dt.datetime.fromisoformat("2025-10-27T23:24:03.003+09:00").timestamp()
+    assert start_time_epoch(value) == expected
+    assert start_time_epoch("2025-10-27T14:24:03.003Z") == expected
+    assert start_time_epoch(None) is None
+    assert start_time_epoch("not-a-timestamp") is None
+
+
+def test_start_time_epoch_fast_path_honors_offset():
+    for value in ("2025-10-27T23:24:03.003+0900", "2025-10-27T01:24:03.999-0530"):
+        general = dt.datetime.fromisoformat(parse_start_time(value)).timestamp()
+        assert _fast_start_time_epoch(value) == general
+    assert _fast_start_time_epoch("2025-10-27T23:24:03+09:00") is None
+    assert _fast_start_time_epoch("2025-13-27T23:24:03.003+0900") is None
+
+
+def test_participants_lookup_uses_covering_primary_key(store):
+    plan = store.connection.execute(
+        "EXPLAIN QUERY PLAN SELECT uid FROM user_match_stats WHERE game_id=?",
+        (1,),
+    ).fetchall()
+    detail = " ".join(row[3] for row in plan)
+    assert "COVERING INDEX" in detail
+    assert "SCAN" not in detail
+
+
+def test_refresh_catalogs_stream_valid_entries(store):
+    characters = iter(
+        [
+            {"characterCode": 1, "character": "Jackie"},
+            {"characterCode": "2", "character": "Aya"},
+            {"characterCode": 3, "character": "Fiora"},
+        ]
+    )
+    assert store.refresh_characters(characters) == 2
+
+    items = iter(
+        [
+            {"code": 101101, "name": "Knife", "modeType": 0, "isCompletedItem": True},
+            {"code": 101102, "name": None},
+        ]
+    )
+    assert store.refresh_items(items) == 1
+
+    row = store.connection.execute(
+        "SELECT name, is_completed_item FROM items WHERE item_code=?", (101101,)
+    ).fetchone()
+    assert tuple(row) == ("Knife", 1)
+    assert (
+        store.connection.execute("SELECT COUNT(*) FROM characters").fetchone()[0] == 2
+    )
+
+
+def test_upsert_games_bulk_matches_sequential_upserts(store, make_game):
+    games = [
+        make_game(game_id=98, nickname="a", uid="UID-a"),
+        make_game(game_id=99, nickname="a", uid="UID-a"),
+        make_game(game_id=99, nickname="b", uid="UID-b"),
+    ]
+
+    store.upsert_games_bulk(games)
+
+    counts = {
+        table: store.connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        for table in ("users", "matches", "user_match_stats", "equipment")
+    }
+    assert counts == {"users": 2, "matches": 2, "user_match_stats": 3, "equipment": 6}
+    with pytest.raises(ValueError, match="No uid"):
+        store.upsert_games_bulk([make_game(game_id=100, nickname="unknown")])
+
+
+def test_classify_game_ids_prefers_deleted_marker(store, make_game):
+    store.upsert_from_game_payload(make_game(game_id=1, nickname="a", uid="UID-a"))
+    store.upsert_from_game_payload(make_game(game_id=2, nickname="a", uid="UID-a"))
+    store.connection.execute(
+        "INSERT INTO deleted_matches (game_id, deleted_at) VALUES (?, ?)",
+        (2, "2025-02-01T00:00:00+00:00"),
+    )
+
+    assert store.classify_game_ids([1, 2, 3, None]) == {
+        1: "known",
+        2: "deleted",
+        3: "new",
+    }
+    assert store.classify_game_ids([]) == {}
+
+
+def test_store_uses_wal_and_toggles_bulk_mode(store):
+    conn = store.connection
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2  # FULL
+
+    store.set_bulk_mode(enabled=True)
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    store.set_bulk_mode(enabled=False)
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2
+
+
+def test_get_latest_nicknames_for_uids_batches_lookup(store, make_game):
+    store.upsert_from_game_payload(make_game(game_id=1, nickname="a", uid="UID-a"))
+    store.upsert_from_game_payload(make_game(game_id=1, nickname="b", uid="UID-b"))
+
+    assert store.get_latest_nicknames_for_uids(["UID-a", "UID-b", "UID-x"]) == {
+        "UID-a": "a",
+        "UID-b": "b",
+    }
+    assert store.get_latest_nicknames_for_uids([]) == {}
+
+
+def test_update_users_last_checked_batches_pairs(store, make_game):
+    store.upsert_from_game_payload(make_game(game_id=1, nickname="a", uid="UID-a"))
+    store.upsert_from_game_payload(make_game(game_id=1, nickname="b", uid="UID-b"))
+
+    store.update_users_last_checked(
+        [("UID-a", "2025-03-01T00:00:00+00:00"), ("UID-b", "2025-03-02T00:00:00+00:00")]
+    )
+
+    assert store.get_user_last_checked("UID-a") == "2025-03-01T00:00:00+00:00"
+    assert store.get_user_last_checked("UID-b") == "2025-03-02T00:00:00+00:00"
+
+
+def test_get_game_participant_counts_groups_in_one_query(store, make_game):
+    for nickname in ("a", "b", "c"):
+        store.upsert_from_game_payload(
+            make_game(game_id=1, nickname=nickname, uid=f"UID-{nickname}")
+        )
+    store.upsert_from_game_payload(make_game(game_id=2, nickname="a", uid="UID-a"))
+
+    assert store.get_game_participant_counts([1, 2, 3, None]) == {1: 3, 2: 1, 3: 0}
+    assert store.get_game_participant_counts([]) == {}
+
+
+def test_pending_users_queue_is_fifo_and_deduplicated(store):
+    store.push_pending_users([("a", 1), ("b", 1), ("a", 2), ("c", 2)])
+
+    assert store.pop_pending_users(2) == [("a", 1), ("b", 1)]
+    assert store.pop_pending_users(10) == [("c", 2)]
+    assert store.pop_pending_users(10) == []
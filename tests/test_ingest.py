@@ -1,10 +1,14 @@
 import datetime as dt
+import threading
+import time
 from typing import Any, Dict, Optional
 
 import pytest
 import requests
 
+from er_stats.api_cache import GameResultCache
 from er_stats.api_client import ApiResponseError
+from er_stats.db import SQLiteStore
 from er_stats.ingest import IngestionManager
 
 
@@ -129,6 +133,165 @@ def test_ingest_skips_known_game_details(store, make_game):
     assert client.fetch_game_result_calls == []
 
 
+def test_ingest_known_game_skips_nickname_lookup_when_not_collecting(
+    monkeypatch, store, make_game
+):
+    users = _generate_uids(["100", "200", "201"])
+    for nickname in ("100", "200", "201"):
+        store.upsert_from_game_payload(
+            make_game(game_id=11, nickname=nickname, uid=users[nickname])
+        )
+    existing = make_game(game_id=11, nickname="100", uid=users["100"])
+
+    def _unexpected(*_args, **_kwargs):
+        raise AssertionError("participant nicknames should not be loaded")
+
+    monkeypatch.setattr(store, "get_latest_nicknames_for_uids", _unexpected)
+    client = FakeClient(pages=[{"userGames": [existing]}], participants={}, users=users)
+    manager = IngestionManager(client, store, fetch_game_details=True)
+
+    discovered = manager.ingest_user(users["100"], collect_nicknames=False)
+
+    assert discovered == set()
+    assert client.fetch_game_result_calls == []
+    assert store.get_game_participant_count(11) == 3
+
+
+def test_manager_holds_bulk_mode_until_close(store):
+    def _synchronous() -> int:
+        return store.connection.execute("PRAGMA synchronous").fetchone()[0]
+
+    manager = IngestionManager(FakeClient(pages=[], participants={}, users={}), store)
+    assert _synchronous() == 1  # NORMAL
+    manager.ingest_from_seeds([])
+    assert _synchronous() == 1
+
+    manager.close()
+    assert _synchronous() == 2  # FULL
+
+
+def test_game_result_cache_replays_responses_across_runs(tmp_path, store, make_game):
+    users = _generate_uids(["100", "200"])
+    pages = [{"userGames": [make_game(game_id=12, nickname="100", uid=users["100"])]}]
+    participants = {12: {"userGames": [make_game(game_id=12, nickname="200")]}}
+    cache = GameResultCache(str(tmp_path / "cache.sqlite"))
+    try:
+        first = FakeClient(pages, participants, users)
+        IngestionManager(first, store, game_result_cache=cache).ingest_user(
+            users["100"]
+        )
+        # A fresh database forces the game to be ingested again.
+        replay_store = SQLiteStore(str(tmp_path / "replay.sqlite"))
+        replay_store.setup_schema()
+        second = FakeClient(pages, {}, users)
+        IngestionManager(second, replay_store, game_result_cache=cache).ingest_user(
+            users["100"]
+        )
+        assert replay_store.get_game_participant_count(12) == 2
+        replay_store.close()
+    finally:
+        cache.close()
+
+    assert first.fetch_game_result_calls == [12]
+    assert second.fetch_game_result_calls == []
+
+
+def test_uid_checks_are_flushed_after_each_page(store, make_game):
+    users = _generate_uids(["100"])
+    store.upsert_from_game_payload(
+        make_game(game_id=13, nickname="100", uid=users["100"])
+    )
+    store.update_user_last_checked(users["100"], "2000-01-01T00:00:00+00:00")
+    pages = [{"userGames": []}]
+    client = FakeClient(pages, {}, users)
+    manager = IngestionManager(client, store, fetch_game_details=False)
+
+    manager.ingest_user(users["100"])
+
+    assert manager._pending_last_checked == {}
+    checked = dt.datetime.fromisoformat(store.get_user_last_checked(users["100"]))
+    assert checked.year > 2000
+
+
+def test_ingest_user_prefetches_results_and_nicknames_on_pool(store, make_game):
+    users = _generate_uids(["100", "200", "201", "300"])
+    pages = [
+        {
+            "userGames": [
+                make_game(game_id=14, nickname="100", uid=users["100"]),
+                make_game(game_id=15, nickname="100", uid=users["100"]),
+            ]
+        }
+    ]
+    participants = {
+        14: {
+            "userGames": [
+                make_game(game_id=14, nickname="200"),
+                make_game(game_id=14, nickname="201"),
+            ]
+        },
+        15: {"userGames": [make_game(game_id=15, nickname="300")]},
+    }
+    client = FakeClient(pages, participants, users)
+    manager = IngestionManager(client, store, fetch_workers=4)
+    try:
+        discovered = manager.ingest_user(users["100"])
+    finally:
+        manager.close()
+
+    assert discovered == {"200", "201", "300"}
+    assert sorted(client.fetch_game_result_calls) == [14, 15]
+    assert sorted(client.fetch_user_by_nickname_calls) == ["200", "201", "300"]
+    assert store.get_game_participant_count(14) == 3
+    assert store.get_game_participant_count(15) == 2
+
+
+def test_ingest_user_prefetches_next_page_only_when_paging_continues(store, make_game):
+    users = _generate_uids(["100"])
+    g1 = make_game(game_id=16, nickname="100", uid=users["100"])
+    g2 = make_game(game_id=17, nickname="100", uid=users["100"])
+    pages = [{"userGames": [g1], "next": "tok"}, {"userGames": [g2], "next": "end"}]
+    client = FakeClient(pages, {}, users)
+    manager = IngestionManager(
+        client, store, fetch_game_details=False, max_games_per_user=2, fetch_workers=2
+    )
+    try:
+        manager.ingest_user(users["100"])
+    finally:
+        manager.close()
+
+    # The second page reaches max_games_per_user, so no third request is made.
+    assert client.fetch_user_games_calls == [None, "tok"]
+    assert store.has_game(16)
+    assert store.has_game(17)
+
+
+def test_ingest_user_reports_game_progress_every_n_games(store, make_game):
+    users = _generate_uids(["100"])
+    games = [
+        make_game(game_id=game_id, nickname="100", uid=users["100"])
+        for game_id in range(1, 8)
+    ]
+    client = FakeClient([{"userGames": games}], {}, users)
+    logs: list[str] = []
+    manager = IngestionManager(
+        client,
+        store,
+        fetch_game_details=False,
+        progress_callback=logs.append,
+        report_every=3,
+    )
+
+    manager.ingest_user(users["100"])
+
+    progress = [line for line in logs if line.startswith("Processed game")]
+    assert progress == [
+        f"Processed game 1(1) for uid {users['100']}",
+        f"Processed game 3(3) for uid {users['100']}",
+        f"Processed game 6(6) for uid {users['100']}",
+    ]
+
+
 def test_ingest_only_newer_games_breaks_at_cutoff(store, make_game):
     users = _generate_uids(["100", "200"])
 
@@ -285,6 +448,24 @@ def test_ingest_skips_unresolved_nickname_after_retries(store, make_game):
     assert count == 0
 
 
+def test_nickname_retries_back_off_exponentially(monkeypatch, store):
+    sleeps: list[float] = []
+    monkeypatch.setattr("er_stats.ingest.time.sleep", sleeps.append)
+    monkeypatch.setattr("er_stats.ingest.random.uniform", lambda low, high: high)
+    client = FakeClient([], {}, {}, nickname_failures={"ghost": 4})
+    manager = IngestionManager(
+        client,
+        store,
+        max_nickname_attempts=4,
+        retry_backoff_base=1.0,
+        retry_backoff_cap=3.0,
+        retry_backoff_jitter=0.5,
+    )
+
+    assert manager._fetch_uid_with_retries("ghost") is None
+    assert sleeps == [1.5, 2.5, 3.5]
+
+
 def test_ingest_treats_payload_404_nickname_as_missing_in_current_run(store, make_game):
     class Nickname404Client(FakeClient):
         def fetch_user_by_nickname(self, nickname: str) -> Dict[str, Any]:
@@ -355,6 +536,23 @@ def test_ingest_reuses_missing_nickname_cache_across_participants(store, make_ga
     assert client.fetch_user_by_nickname_calls == [missing_nickname]
 
 
+def test_participant_payload_uid_skips_nickname_resolution(store, make_game):
+    seed_uid = "UID-seed"
+    seed_game = make_game(game_id=23, nickname="seed", uid=seed_uid)
+    pages = [{"userGames": [seed_game]}]
+    participant = make_game(game_id=23, nickname="direct", uid="UID-direct")
+    participants = {23: {"userGames": [participant]}}
+
+    client = FakeClient(pages, participants, {})
+    manager = IngestionManager(client, store, participant_retry_attempts=1)
+
+    manager.ingest_user(seed_uid)
+
+    assert client.fetch_user_by_nickname_calls == []
+    assert store.get_uid_from_nickname("direct") == "UID-direct"
+    assert manager._cached_nickname_uid("direct") == "UID-direct"
+
+
 def test_ingest_keeps_cached_uid_when_start_missing(store, make_game):
     nickname = "dup"
     old_uid = "UID-old"
@@ -462,6 +660,31 @@ def test_ingest_marks_incomplete_on_participant_fail(store, make_game):
     assert row[0] == 1
 
 
+def test_participant_without_nickname_is_incomplete_without_retry(
+    monkeypatch, store, make_game
+):
+    seed_uid = "UID-seed"
+    seed_game = make_game(game_id=41, nickname="seed", uid=seed_uid)
+    participant = make_game(game_id=41, nickname="ghost")
+    participant["nickname"] = None
+    client = FakeClient(
+        [{"userGames": [seed_game]}], {41: {"userGames": [participant]}}, {}
+    )
+    manager = IngestionManager(client, store, participant_retry_attempts=3)
+
+    def _no_sleep(_seconds):
+        raise AssertionError("no retry expected for a missing nickname")
+
+    monkeypatch.setattr(time, "sleep", _no_sleep)
+    manager.ingest_user(seed_uid)
+
+    row = store.connection.execute(
+        "SELECT incomplete FROM matches WHERE game_id=?", (41,)
+    ).fetchone()
+    assert row[0] == 1
+    assert client.fetch_user_by_nickname_calls == []
+
+
 def test_ingest_rolls_back_on_interrupt(monkeypatch, store, make_game):
     seed_uid = "UID-seed"
     seed_game = make_game(game_id=60, nickname="seed", uid=seed_uid)
@@ -474,16 +697,17 @@ def test_ingest_rolls_back_on_interrupt(monkeypatch, store, make_game):
     client = FakeClient(pages, participants, users)
     manager = IngestionManager(client, store, fetch_game_details=True)
 
-    original_upsert = store.upsert_from_game_payload
+    original_upsert = store.upsert_games_bulk
     call_count = {"count": 0}
 
-    def interrupting_upsert(game, *, mark_ingested=True):
+    def interrupting_upsert(games, *, mark_ingested=True):
+        # The first bulk call writes the seed games, the second the participants.
         call_count["count"] += 1
-        original_upsert(game, mark_ingested=mark_ingested)
+        original_upsert(games, mark_ingested=mark_ingested)
         if call_count["count"] == 2:
             raise KeyboardInterrupt()
 
-    monkeypatch.setattr(store, "upsert_from_game_payload", interrupting_upsert)
+    monkeypatch.setattr(store, "upsert_games_bulk", interrupting_upsert)
 
     with pytest.raises(KeyboardInterrupt):
         manager.ingest_user(seed_uid)
@@ -495,6 +719,48 @@ def test_ingest_rolls_back_on_interrupt(monkeypatch, store, make_game):
     assert count == 0
 
 
+def test_participant_bulk_failure_falls_back_to_per_row(monkeypatch, store, make_game):
+    seed_uid = "UID-seed"
+    pages = [{"userGames": [make_game(game_id=61, nickname="seed", uid=seed_uid)]}]
+    participants = {
+        61: {
+            "userGames": [
+                make_game(game_id=61, nickname="good"),
+                make_game(game_id=61, nickname="bad"),
+            ]
+        }
+    }
+    users = {"seed": seed_uid, "good": "UID-good", "bad": "UID-bad"}
+    client = FakeClient(pages, participants, users)
+    manager = IngestionManager(client, store, fetch_game_details=True)
+
+    original_bulk = store.upsert_games_bulk
+    original_row = store.upsert_from_game_payload
+
+    def rejecting_bulk(games, *, mark_ingested=True):
+        if any(game.get("nickname") == "bad" for game in games):
+            raise ValueError("rejected batch")
+        original_bulk(games, mark_ingested=mark_ingested)
+
+    def rejecting_row(game, *, mark_ingested=True):
+        if game.get("nickname") == "bad":
+            raise ValueError("rejected row")
+        original_row(game, mark_ingested=mark_ingested)
+
+    monkeypatch.setattr(store, "upsert_games_bulk", rejecting_bulk)
+    monkeypatch.setattr(store, "upsert_from_game_payload", rejecting_row)
+
+    discovered = manager.ingest_user(seed_uid)
+
+    assert "good" in discovered
+    assert "bad" not in discovered
+    assert store.get_participants_for_game(61) == {seed_uid, "UID-good"}
+    row = store.connection.execute(
+        "SELECT incomplete FROM matches WHERE game_id=?", (61,)
+    ).fetchone()
+    assert row[0] == 1
+
+
 def test_ingest_retries_uid_on_payload_401_using_nickname(store, make_game):
     class Payload401Client(FakeClient):
         def __init__(
@@ -977,3 +1243,176 @@ def test_ingest_stops_at_prune_cutoff(store, make_game):
     assert store.has_game(91)
     assert not store.has_game(92)
     assert client.fetch_user_games_calls == [None]
+
+
+def test_ingest_from_seeds_dedupes_queue_on_enqueue(store, make_game):
+    users = _generate_uids(["100"])
+    pages = [{"userGames": [make_game(game_id=95, nickname="100", uid=users["100"])]}]
+    client = FakeClient(pages, participants={}, users=users)
+    logs: list[str] = []
+    manager = IngestionManager(
+        client, store, fetch_game_details=False, progress_callback=logs.append
+    )
+
+    manager.ingest_from_seeds(["100", "100", "100"], depth=0)
+
+    assert client.fetch_user_by_nickname_calls == ["100"]
+    assert "Ingest queue left: 1 users" in logs
+
+
+def test_ingest_from_seeds_spills_frontier_beyond_max_queue_size(store, make_game):
+    users = _generate_uids(["A", "B", "C", "D"])
+    pages = [{"userGames": [make_game(game_id=96, nickname="A", uid=users["A"])]}]
+    participants = {
+        96: {
+            "userGames": [
+                make_game(game_id=96, nickname=nickname, uid=users[nickname])
+                for nickname in ("A", "B", "C", "D")
+            ]
+        }
+    }
+    client = FakeClient(pages, participants, users)
+    logs: list[str] = []
+    manager = IngestionManager(
+        client, store, progress_callback=logs.append, max_queue_size=1
+    )
+
+    manager.ingest_from_seeds(["A"], depth=1)
+
+    assert set(client.fetch_user_games_uids) == set(users.values())
+    assert "Spilled users waiting in store: 2" in logs
+    assert store.pop_pending_users(10) == []
+
+
+def test_ingest_user_commits_page_in_single_transaction(store, make_game):
+    users = _generate_uids(["100", "200"])
+    pages = [
+        {
+            "userGames": [
+                make_game(game_id=96, nickname="100", uid=users["100"]),
+                make_game(game_id=97, nickname="100", uid=users["100"]),
+            ]
+        }
+    ]
+    participants = {
+        96: {"userGames": [make_game(game_id=96, nickname="200")]},
+        97: {"userGames": [make_game(game_id=97, nickname="200")]},
+    }
+    client = FakeClient(pages, participants, users)
+    manager = IngestionManager(client, store, fetch_game_details=True)
+    statements: list[str] = []
+    store.connection.set_trace_callback(statements.append)
+
+    manager.ingest_user(users["100"])
+
+    store.connection.set_trace_callback(None)
+    assert statements.count("BEGIN") == 1
+    assert store.has_game(96)
+    assert store.has_game(97)
+
+
+def test_background_parquet_writes_drain_on_close(store, make_game):
+    users = _generate_uids(["100", "200"])
+    pages = [{"userGames": [make_game(game_id=98, nickname="100", uid=users["100"])]}]
+    participants = {98: {"userGames": [make_game(game_id=98, nickname="200")]}}
+
+    class _RecordingExporter:
+        def __init__(self):
+            self.payloads = []
+            self.threads = set()
+
+        def write_from_game_payloads(self, payloads):
+            self.threads.add(threading.current_thread().name)
+            self.payloads.extend(payload["nickname"] for payload in payloads)
+
+    exporter = _RecordingExporter()
+    client = FakeClient(pages, participants, users)
+    manager = IngestionManager(
+        client, store, parquet_exporter=exporter, parquet_background=True
+    )
+
+    manager.ingest_user(users["100"])
+    manager.close()
+
+    assert sorted(exporter.payloads) == ["100", "200"]
+    assert exporter.threads == {"er-parquet"}
+
+
+def test_resolve_uid_reuses_in_process_nickname_cache(monkeypatch, store, make_game):
+    users = _generate_uids(["100", "200"])
+    pages = [
+        {
+            "userGames": [
+                make_game(game_id=101, nickname="100", uid=users["100"]),
+                make_game(game_id=102, nickname="100", uid=users["100"]),
+            ]
+        }
+    ]
+    participants = {
+        101: {"userGames": [make_game(game_id=101, nickname="200")]},
+        102: {"userGames": [make_game(game_id=102, nickname="200")]},
+    }
+    client = FakeClient(pages, participants, users)
+    manager = IngestionManager(client, store, fetch_game_details=True)
+    lookups: list[str] = []
+    original_lookup = store.get_uid_info_for_nickname
+
+    def counting_lookup(nickname):
+        lookups.append(nickname)
+        return original_lookup(nickname)
+
+    monkeypatch.setattr(store, "get_uid_info_for_nickname", counting_lookup)
+
+    manager.ingest_user(users["100"])
+
+    assert lookups == ["200"]
+    assert client.fetch_user_by_nickname_calls == ["200"]
+
+
+def test_nickname_cache_is_bounded_lru_with_absolute_ttl(monkeypatch, store):
+    monkeypatch.setattr("er_stats.ingest.NICKNAME_CACHE_MAX_ENTRIES", 2)
+    manager = IngestionManager(
+        FakeClient([], {}, {}),
+        store,
+        nickname_recheck_interval=dt.timedelta(hours=1),
+    )
+    manager._remember_nickname_uid("a", "UID-a")
+    manager._remember_nickname_uid("b", "UID-b")
+    assert manager._cached_nickname_uid("a") == "UID-a"
+    manager._remember_nickname_uid("c", "UID-c")
+
+    # "b" was least recently used when "c" pushed the cache over its bound.
+    assert manager._cached_nickname_uid("b") is None
+    assert manager._cached_nickname_uid("a") == "UID-a"
+
+    uid, _, last_access = manager._nickname_uid_cache["c"]
+    manager._nickname_uid_cache["c"] = (uid, time.monotonic() - 7200, last_access)
+    assert manager._cached_nickname_uid("c") is None
+
+
+def test_missing_nickname_mark_expires_after_recheck_interval(store):
+    client = FakeClient([], {}, {"ghost": "UID-ghost"})
+    manager = IngestionManager(
+        client, store, nickname_recheck_interval=dt.timedelta(hours=1)
+    )
+    manager._not_found_nicknames["ghost"] = time.monotonic()
+    assert manager._fetch_uid_with_retries("ghost") is None
+
+    manager._not_found_nicknames["ghost"] = time.monotonic() - 7200
+    assert manager._fetch_uid_with_retries("ghost") == "UID-ghost"
+
+
+def test_missing_participant_start_uses_overridden_ingest_start(store, make_game):
+    seed_uid = "UID-seed"
+    pages = [{"userGames": [make_game(game_id=103, nickname="seed", uid=seed_uid)]}]
+    participant = make_game(game_id=103, nickname="other")
+    participant.pop("startDtm", None)
+    client = FakeClient(
+        pages, {103: {"userGames": [participant]}}, {"other": "UID-other"}
+    )
+    manager = IngestionManager(client, store, participant_retry_attempts=1)
+    manager.ingest_started_at = dt.datetime(2025, 1, 5, tzinfo=dt.timezone.utc)
+
+    manager.ingest_user(seed_uid)
+
+    assert participant["startDtm"] == "2025-01-05T00:00:00+00:00"
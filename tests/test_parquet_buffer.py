@@ -15,7 +15,7 @@ def _make_participant(make_game, *, game_id: int, uid: int) -> Dict[str, Any]:
 
 
 def test_exporter_buffers_and_flushes(tmp_path, make_game):
-    # Use small flush size to force multiple files within a single partition
+    # Use small flush size to force multiple row groups within a single partition
     out = tmp_path / "parquet"
     exp = ParquetExporter(out, flush_rows=2)
 
@@ -25,13 +25,14 @@ def test_exporter_buffers_and_flushes(tmp_path, make_game):
         exp.write_from_game_payload(r)
     exp.close()
 
-    # Expect ceil(5/2)=3 files in the participants partition
+    import pyarrow.parquet as pq
+
+    # One file per partition, with ceil(5/2)=3 row groups
     participants_files = list((out / "participants").rglob("*.parquet"))
-    assert len(participants_files) == 3
+    assert len(participants_files) == 1
+    assert pq.ParquetFile(participants_files[0]).num_row_groups == 3
 
     # Validate total rows read back
-    import pyarrow.parquet as pq
-
     # infer schema
     schema = pq.read_schema(participants_files[0])
 
@@ -92,9 +93,11 @@ def test_cli_parquet_compact_merges_small_files(
     manager.ingest_user(mapping["Alice"])
     exp.close()
 
-    # Sanity: many small files exist at src
+    # Sanity: many small row groups exist at src
+    import pyarrow.parquet as pq
+
     small_files = list((src / "participants").rglob("*.parquet"))
-    assert len(small_files) >= 3
+    assert sum(pq.ParquetFile(p).num_row_groups for p in small_files) >= 3
 
     # Run compaction CLI
     from er_stats.tools_cli import run as tools_run
@@ -125,3 +128,162 @@ def test_cli_parquet_compact_merges_small_files(
     total_rows = sum(fragment.count_rows() for fragment in dset.get_fragments())
     # Original had at least 3 participant rows
     assert total_rows >= 3
+
+
+def test_exporter_dictionary_encodes_repeated_strings(tmp_path, make_game):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    out = tmp_path / "parquet"
+    exp = ParquetExporter(out)
+    for i in range(3):
+        exp.write_from_game_payload(_make_participant(make_game, game_id=1, uid=i))
+    exp.close()
+
+    (path,) = list((out / "participants").rglob("*.parquet"))
+    parquet_file = pq.ParquetFile(path)
+    columns = parquet_file.metadata.row_group(0)
+    encodings = {
+        columns.column(i).path_in_schema: columns.column(i).encodings
+        for i in range(columns.num_columns)
+    }
+    assert "RLE_DICTIONARY" in encodings["uid"]
+    assert "RLE_DICTIONARY" in encodings["language"]
+    # Dictionary encoding is a storage detail; readers still see strings.
+    assert parquet_file.schema_arrow.field("uid").type == pa.string()
+
+
+def test_exporter_flushes_largest_partition_over_buffer_cap(tmp_path, make_game):
+    import pyarrow.parquet as pq
+
+    out = tmp_path / "parquet"
+    exp = ParquetExporter(out, flush_rows=100, max_buffered_rows=3)
+    for i in range(3):
+        exp.write_from_game_payload(_make_participant(make_game, game_id=1, uid=i))
+    assert list((out / "participants").rglob("*.parquet")) == []
+
+    other = _make_participant(make_game, game_id=2, uid=9)
+    other["serverName"] = "EU"
+    exp.write_from_game_payload(other)
+
+    # The cap was exceeded, so the three-row NA partition is written early.
+    files = list((out / "participants").rglob("*.parquet"))
+    assert [f.parent.parent.parent.name for f in files] == ["server_name=NA"]
+
+    exp.close()
+    files = list((out / "participants").rglob("*.parquet"))
+    assert sum(pq.read_metadata(p).num_rows for p in files) == 4
+
+
+def test_exporter_parallel_flush_keeps_row_group_order(tmp_path, make_game):
+    import pyarrow.parquet as pq
+
+    out = tmp_path / "parquet"
+    exp = ParquetExporter(out, flush_rows=2, flush_workers=4)
+    servers = ["NA", "EU", "Asia"]
+    for i in range(18):
+        game = _make_participant(make_game, game_id=i, uid=i)
+        game["serverName"] = servers[i % 3]
+        exp.write_from_game_payload(game)
+    exp.close()
+
+    files = list((out / "participants").rglob("*.parquet"))
+    assert len(files) == 3
+    for path in files:
+        game_ids = pq.read_table(path, columns=["game_id"])["game_id"].to_pylist()
+        assert len(game_ids) == 6
+        assert game_ids == sorted(game_ids)
+
+
+def test_exporter_skips_repeated_match_and_participant(tmp_path, make_game):
+    import pyarrow.parquet as pq
+
+    out = tmp_path / "parquet"
+    exp = ParquetExporter(out)
+    first = _make_participant(make_game, game_id=7, uid=1)
+    second = _make_participant(make_game, game_id=7, uid=2)
+    exp.write_from_game_payloads([first, second, dict(first)])
+    exp.write_from_game_payload(dict(second))
+    exp.close()
+
+    def _rows(dataset: str) -> int:
+        files = list((out / dataset).rglob("*.parquet"))
+        return sum(pq.read_metadata(p).num_rows for p in files)
+
+    assert _rows("participants") == 2
+    assert _rows("matches") == 1
+
+
+def test_exporter_skips_repeat_older_than_recent_window(
+    tmp_path, monkeypatch, make_game
+):
+    import pyarrow.parquet as pq
+
+    from er_stats import parquet_export
+
+    monkeypatch.setattr(parquet_export, "SEEN_ROWS_RECENT_KEYS", 2)
+    out = tmp_path / "parquet"
+    exp = ParquetExporter(out)
+    first = _make_participant(make_game, game_id=8, uid=1)
+    # Five newer games push game 8 out of the exact window; the Bloom filter
+    # still remembers it.
+    later = [_make_participant(make_game, game_id=9 + i, uid=1) for i in range(5)]
+    exp.write_from_game_payloads([first, *later, dict(first)])
+    exp.close()
+
+    def _rows(dataset: str) -> int:
+        files = list((out / dataset).rglob("*.parquet"))
+        return sum(pq.read_metadata(p).num_rows for p in files)
+
+    assert _rows("participants") == 6
+    assert _rows("matches") == 6
+
+
+@pytest.mark.parametrize("compression", [None, "snappy", "zstd"])
+def test_exporter_compression_options(tmp_path, make_game, compression):
+    import pyarrow.parquet as pq
+
+    out = tmp_path / "parquet"
+    exp = ParquetExporter(out, compression=compression)
+    exp.write_from_game_payload(_make_participant(make_game, game_id=1, uid=1))
+    exp.close()
+
+    (path,) = list((out / "participants").rglob("*.parquet"))
+    column = pq.read_metadata(path).row_group(0).column(0)
+    assert column.compression == (compression or "uncompressed").upper()
+
+
+def test_exporter_closes_least_recent_writer_over_open_cap(tmp_path, make_game):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    out = tmp_path / "parquet"
+    exp = ParquetExporter(out, flush_rows=1, flush_workers=1, max_open_writers=2)
+    # One season per game -> one matches and one participants partition each.
+    for season_id in (21, 22, 23):
+        exp.write_from_game_payload(
+            make_game(game_id=season_id, nickname="a", uid="1", season_id=season_id)
+        )
+
+    files = sorted(out.rglob("*.parquet"))
+    assert len(files) == 6
+    readable = []
+    for path in files:
+        try:
+            readable.append(pq.ParquetFile(path).metadata.num_rows)
+        except pa.ArrowInvalid:
+            pass
+    # Only the two most recently used writers are still open.
+    assert readable == [1, 1, 1, 1]
+
+    # A later row for a closed partition starts a new part file.
+    exp.write_from_game_payload(
+        make_game(game_id=24, nickname="b", uid="2", season_id=21)
+    )
+    exp.close()
+    season_dir = out / "participants" / "season_id=21"
+    assert len(list(season_dir.rglob("*.parquet"))) == 2
+    total = sum(
+        pq.read_metadata(p).num_rows for p in (out / "participants").rglob("*.parquet")
+    )
+    assert total == 4
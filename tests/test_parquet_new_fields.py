@@ -76,3 +76,29 @@ def test_equipment_raw_and_maps_are_emitted(tmp_path, make_game):
     assert dict(row["equipment_grade_map"][0]) == equipment_grade
     assert row["pre_made"][0] == 1
     assert row["premade_matching_type"][0] == 2
+
+
+def test_int_columns_keep_nulls_and_drop_out_of_range(tmp_path, make_game):
+    game = make_game(game_id=4, nickname="dave", uid="uid-4")
+    game["characterNum"] = None
+    game["skinCode"] = 2**70
+    game["gameRank"] = "5"
+
+    row = _write_and_fetch_row(tmp_path, game)
+    assert row["character_num"][0] is None
+    assert row["skin_code"][0] is None
+    assert row["game_rank"][0] == 5
+    assert row["game_id"][0] == 4
+
+
+def test_int_list_columns_convert_loose_elements(tmp_path, make_game):
+    game = make_game(game_id=5, nickname="erin", uid="uid-5")
+    game["traitFirstSub"] = [7000101, "7000102", None, "bad"]
+    game["traitSecondSub"] = (1, 2)
+    game["scoredPoint"] = []
+
+    row = _write_and_fetch_row(tmp_path, game)
+    assert row["trait_first_sub"][0] == [7000101, 7000102, None, None]
+    assert row["trait_second_sub"][0] == [1, 2]
+    assert row["scored_point"][0] == []
+    assert row["food_craft_count"][0] is None
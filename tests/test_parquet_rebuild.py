@@ -111,3 +111,104 @@ def test_cli_parquet_rebuild_dedupes_and_aligns(tmp_path, make_game):
     assert participant_row["server_name"] == "NA"
     assert participant_row["matching_mode"] == 3
     assert participant_row["matching_team_mode"] == 1
+
+
+def test_best_match_rows_prefers_complete_rows_then_scan_order():
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    from er_stats.tools_cli import _best_match_rows
+
+    table = pa.table(
+        {
+            "game_id": pa.array([2, 1, 2, 1, None, 2], pa.int64()),
+            "server_name": ["", "NA", "KR", "NA", "EU", "JP"],
+            "score": pa.array([1.0, float("nan"), None, 3.0, 1.0, None]),
+            "tag": ["a", "b", "c", "d", "e", "f"],
+        }
+    )
+
+    best = _best_match_rows(
+        table, ["server_name"], ["game_id", "server_name", "score"], pa, pc
+    )
+
+    rows = best.to_pylist()
+    assert [row["game_id"] for row in rows] == [1, 2]
+    # game 1: the NaN row loses to the row with a real float
+    assert rows[0]["tag"] == "d"
+    assert (rows[0]["_rep"], rows[0]["_non_null"]) == (1, 3)
+    # game 2: empty server_name is not present; "c" and "f" tie, "c" came first
+    assert rows[1]["tag"] == "c"
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_partitioned_writer_splits_batches_at_file_limit(tmp_path, workers):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    from er_stats.tools_cli import _PartitionedWriter
+
+    schema = pa.schema([pa.field("game_id", pa.int64()), pa.field("uid", pa.string())])
+    writer = _PartitionedWriter(
+        tmp_path,
+        schema,
+        max_rows_per_file=4,
+        compression=None,
+        pa_module=pa,
+        pq_module=pq,
+        workers=workers,
+    )
+    key = (1, "NA", 3, "2025-01-01")
+    batch = pa.RecordBatch.from_pydict(
+        {"game_id": list(range(10)), "uid": [f"u{i}" for i in range(10)]},
+        schema=schema,
+    )
+    writer.write_batch(batch.slice(0, 1), key)
+    writer.write_batch(batch.slice(1), key)
+    writer.close()
+
+    files = sorted(tmp_path.rglob("*.parquet"))
+    assert [pq.read_metadata(f).num_rows for f in files] == [4, 4, 2]
+    rows = [row for f in files for row in pq.read_table(f).to_pylist()]
+    assert [row["game_id"] for row in rows] == list(range(10))
+
+
+def test_colliding_participant_hashes_only_tracks_repeated_keys():
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+
+    from er_stats.tools_cli import _colliding_participant_hashes
+
+    table = pa.table(
+        {
+            "game_id": pa.array([1, 1, 1, 2, None, 3], pa.int64()),
+            "uid": ["a", "a", "b", None, "c", None],
+            "nickname": ["A", "A", "B", "Nick", "C", None],
+        }
+    )
+
+    collisions = _colliding_participant_hashes(ds.dataset(table), pa, pc)
+
+    assert collisions == {hash((1, "a"))}
+
+
+def test_start_dates_match_scalar_date_part():
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    from er_stats.tools_cli import _date_part, _start_dates
+
+    values = [
+        "2025-10-27T23:24:03.003+0900",
+        "2025-10-27T00:10:00+09:00",
+        "",
+        None,
+        "not-a-date",
+        "2025-1-1",
+    ]
+
+    dates = _start_dates(pa.chunked_array([values[:3], values[3:]]), pa, pc)
+
+    assert dates == [_date_part(value) for value in values]
+    assert dates[:2] == ["2025-10-27", "2025-10-27"]
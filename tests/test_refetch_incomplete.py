@@ -185,3 +185,41 @@ def test_list_refetch_candidates_include_missing(store, make_game):
 
     included = store.list_refetch_candidates(include_missing=True, now=now)
     assert included == [12]
+
+
+def test_refetch_prefetches_with_fetch_workers(store, make_game):
+    game_ids = [21, 22, 23]
+    participants = {}
+    for game_id in game_ids:
+        store.upsert_from_game_payload(
+            make_game(game_id=game_id, nickname="seed", uid="UID-seed")
+        )
+        store.mark_game_incomplete(game_id)
+        participants[game_id] = {
+            "userGames": [make_game(game_id=game_id, nickname="p1")]
+        }
+    missing_id = 24
+    store.upsert_from_game_payload(
+        make_game(game_id=missing_id, nickname="seed", uid="UID-seed")
+    )
+    store.mark_game_incomplete(missing_id)
+
+    client = FakeClient(
+        participants, {"p1": "UID-p1"}, missing_payload_game_ids={missing_id}
+    )
+    manager = IngestionManager(
+        client,
+        store,
+        uid_recheck_interval=dt.timedelta(days=3650),
+        max_nickname_attempts=1,
+        participant_retry_attempts=1,
+        fetch_workers=3,
+    )
+    try:
+        stats = manager.refetch_incomplete_games([*game_ids, missing_id])
+    finally:
+        manager.close()
+
+    assert sorted(client.fetch_game_result_calls) == [21, 22, 23, 24]
+    assert stats["cleared"] == 3
+    assert stats["not_found"] == 1